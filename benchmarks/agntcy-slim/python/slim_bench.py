@@ -0,0 +1,493 @@
+# Copyright AGNTCY Contributors (https://github.com/agntcy)
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Throughput and latency of SLIM sessions, measured with slim_bindings.
+
+Echo agents stand in for the LLM agents of the agentic apps: they publish
+every message back to its sender, so the numbers are those of SLIM and of
+the Python client alone. The suites measure:
+
+- throughput: messages/s of FireAndForget and RequestResponse sessions,
+  several sessions at once,
+- latency: round-trip time percentiles across payload sizes, one message
+  in flight,
+- fanout: one message delivered to N receivers, until every reply is back.
+
+By default the gateway runs in this process and the echo agents in a child
+process. Pass --slim to use a gateway started separately, e.g. with the
+gateway command, and --external-echo when the echo agents are started
+separately with the echo command.
+
+    python slim_bench.py run -o results.json
+    python slim_bench.py gateway --endpoint 127.0.0.1:46357
+    python slim_bench.py echo --slim http://127.0.0.1:46357 --fanout-receivers 8
+    python slim_bench.py run --slim http://127.0.0.1:46357 --external-echo --suites latency
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import platform
+import struct
+import sys
+import time
+
+import slim_bindings
+
+ORGANIZATION = "cisco"
+NAMESPACE = "default"
+CLIENT_AGENT = "bench-client"
+ECHO_AGENT = "bench-echo"
+FANOUT_AGENT = "bench-fanout"
+
+# Every message starts with an id that the echo agents send back with the reply.
+# Kept in sync with the throughput mode of the langchain agent, see
+# integrations/agntcy-slim/agentic-apps/langchain_agent/throughput.py.
+CORRELATION_ID = struct.Struct("!Q")
+
+SESSION_TYPES = ("fire_and_forget", "request_response")
+
+
+# Same nearest-rank percentile as langchain_agent/throughput.py, so that both
+# report comparable numbers
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(q / 100 * len(sorted_values)))
+    return sorted_values[index]
+
+
+def rtt_summary(rtts):
+    rtts = sorted(rtts)
+    return {
+        "p50": percentile(rtts, 50) * 1000,
+        "p90": percentile(rtts, 90) * 1000,
+        "p99": percentile(rtts, 99) * 1000,
+        "max": rtts[-1] * 1000 if rtts else 0.0,
+        "mean": sum(rtts) / len(rtts) * 1000 if rtts else 0.0,
+    }
+
+
+async def connect(address, agent, timeout=10.0):
+    participant = await slim_bindings.Slim.new(ORGANIZATION, NAMESPACE, agent)
+    try:
+        # connect() waits forever while the gateway is down
+        await asyncio.wait_for(
+            participant.connect({"endpoint": address, "tls": {"insecure": True}}), timeout
+        )
+    except asyncio.TimeoutError:
+        raise TimeoutError(f"no SLIM gateway at {address}") from None
+    return participant
+
+
+async def echo(participant):
+    """Publish every message back to its sender, in every session opened with the agent."""
+
+    async def serve(session_info):
+        while True:
+            info, msg = await participant.receive(session=session_info.id)
+            await participant.publish_to(info, msg)
+
+    tasks = set()
+    async with participant:
+        while True:
+            session_info, _ = await participant.receive()
+            task = asyncio.create_task(serve(session_info))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+
+
+async def fanout_publish(participant, session, msg, agent, receivers):
+    # Slim.publish always delivers to a single receiver
+    await slim_bindings.publish(
+        participant.svc,
+        session,
+        receivers,
+        msg,
+        slim_bindings.PyAgentType(ORGANIZATION, NAMESPACE, agent),
+        None,
+    )
+
+
+class Client:
+    """
+    Drive the echo agents from a single participant and time the replies.
+
+    Args:
+        participant: The connected participant of the client.
+        reply_timeout (float): Seconds after which a message counts as lost.
+    """
+
+    def __init__(self, participant, reply_timeout=10.0):
+        self.participant = participant
+        self.reply_timeout = reply_timeout
+        self.ids = itertools.count()
+
+    def message(self, payload):
+        message_id = next(self.ids)
+        return message_id, CORRELATION_ID.pack(message_id) + payload
+
+    async def wait_for_agent(self, agent, receivers=1, timeout=30.0):
+        """Ping the agent until `receivers` instances of it reply."""
+        session = await self.participant.create_session(
+            slim_bindings.PySessionConfiguration.FireAndForget()
+        )
+        deadline = time.perf_counter() + timeout
+        try:
+            while time.perf_counter() < deadline:
+                message_id, msg = self.message(b"")
+                await fanout_publish(self.participant, session, msg, agent, receivers)
+                replies = 0
+                try:
+                    while replies < receivers:
+                        _, reply = await asyncio.wait_for(
+                            self.participant.receive(session=session.id), 1.0
+                        )
+                        if CORRELATION_ID.unpack_from(reply)[0] == message_id:
+                            replies += 1
+                    return
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            await self.participant.delete_session(session.id)
+        raise TimeoutError(f"{receivers} instance(s) of {agent} did not reply in {timeout}s")
+
+    async def _fire_and_forget(self, payload, count, window, rtts):
+        session = await self.participant.create_session(
+            slim_bindings.PySessionConfiguration.FireAndForget()
+        )
+        in_flight = asyncio.Semaphore(window)
+        outstanding = {}
+        lost = 0
+
+        async def receive_replies():
+            while True:
+                _, reply = await self.participant.receive(session=session.id)
+                sent_at = outstanding.pop(CORRELATION_ID.unpack_from(reply)[0], None)
+                if sent_at is not None:
+                    rtts.append(time.perf_counter() - sent_at)
+                    in_flight.release()
+
+        def expire():
+            nonlocal lost
+            deadline = time.perf_counter() - self.reply_timeout
+            for message_id, sent_at in list(outstanding.items()):
+                if sent_at < deadline:
+                    del outstanding[message_id]
+                    lost += 1
+                    in_flight.release()
+
+        receiver = asyncio.create_task(receive_replies())
+        try:
+            for _ in range(count):
+                while True:
+                    try:
+                        await asyncio.wait_for(in_flight.acquire(), self.reply_timeout)
+                        break
+                    except asyncio.TimeoutError:
+                        expire()
+                message_id, msg = self.message(payload)
+                outstanding[message_id] = time.perf_counter()
+                await self.participant.publish(session, msg, ORGANIZATION, NAMESPACE, ECHO_AGENT)
+
+            deadline = time.perf_counter() + self.reply_timeout
+            while outstanding and time.perf_counter() < deadline:
+                await asyncio.sleep(0.001)
+            return lost + len(outstanding)
+        finally:
+            receiver.cancel()
+            await self.participant.delete_session(session.id)
+
+    async def _request_response(self, payload, count, rtts):
+        session = await self.participant.create_session(
+            slim_bindings.PySessionConfiguration.RequestResponse()
+        )
+        queue = self.participant.sessions[session.id][1]
+        lost = 0
+        try:
+            for _ in range(count):
+                # Drop the late replies of the requests given up on
+                while not queue.empty():
+                    queue.get_nowait()
+                _, msg = self.message(payload)
+                sent_at = time.perf_counter()
+                try:
+                    await asyncio.wait_for(
+                        self.participant.request_reply(
+                            session, msg, ORGANIZATION, NAMESPACE, ECHO_AGENT
+                        ),
+                        self.reply_timeout,
+                    )
+                except TimeoutError:
+                    # SLIMTimeoutError and asyncio.TimeoutError alike
+                    lost += 1
+                    continue
+                rtts.append(time.perf_counter() - sent_at)
+            return lost
+        finally:
+            await self.participant.delete_session(session.id)
+
+    async def sessions(self, session_type, payload, sessions, count, window=1):
+        """
+        Send `count` messages to the echo agent on each of `sessions` sessions
+        and return the throughput and round-trip times.
+
+        A FireAndForget session keeps up to `window` messages in flight. A
+        RequestResponse session waits for each reply before the next request,
+        as request_reply() does.
+        """
+        rtts = []
+        start = time.perf_counter()
+        if session_type == "fire_and_forget":
+            runs = (self._fire_and_forget(payload, count, window, rtts) for _ in range(sessions))
+        else:
+            window = 1
+            runs = (self._request_response(payload, count, rtts) for _ in range(sessions))
+        lost = sum(await asyncio.gather(*runs))
+        elapsed = time.perf_counter() - start
+
+        return {
+            "session_type": session_type,
+            "payload_bytes": len(payload),
+            "sessions": sessions,
+            "window": window,
+            "sent": sessions * count,
+            "received": len(rtts),
+            "lost": lost,
+            "elapsed_s": elapsed,
+            "msgs_per_s": len(rtts) / elapsed,
+            "rtt_ms": rtt_summary(rtts),
+        }
+
+    async def fanout(self, payload, receivers, count):
+        """
+        Publish `count` messages, one at a time, to `receivers` instances of
+        the fan-out agent and time the first and the last of their replies.
+        """
+        session = await self.participant.create_session(
+            slim_bindings.PySessionConfiguration.FireAndForget()
+        )
+        first, last = [], []
+        lost = 0
+        start = time.perf_counter()
+        try:
+            for _ in range(count):
+                message_id, msg = self.message(payload)
+                sent_at = time.perf_counter()
+                await fanout_publish(self.participant, session, msg, FANOUT_AGENT, receivers)
+                replies = 0
+                deadline = sent_at + self.reply_timeout
+                try:
+                    while replies < receivers:
+                        _, reply = await asyncio.wait_for(
+                            self.participant.receive(session=session.id),
+                            deadline - time.perf_counter(),
+                        )
+                        if CORRELATION_ID.unpack_from(reply)[0] != message_id:
+                            # Late reply to a message given up on
+                            continue
+                        replies += 1
+                        if replies == 1:
+                            first.append(time.perf_counter() - sent_at)
+                    last.append(time.perf_counter() - sent_at)
+                except asyncio.TimeoutError:
+                    lost += receivers - replies
+            elapsed = time.perf_counter() - start
+        finally:
+            await self.participant.delete_session(session.id)
+
+        delivered = count * receivers - lost
+        return {
+            "receivers": receivers,
+            "payload_bytes": len(payload),
+            "messages": count,
+            "delivered": delivered,
+            "lost": lost,
+            "elapsed_s": elapsed,
+            "deliveries_per_s": delivered / elapsed,
+            "first_reply_ms": rtt_summary(first),
+            "all_replies_ms": rtt_summary(last),
+        }
+
+
+def print_sessions(result):
+    rtt = result["rtt_ms"]
+    print(
+        f"{result['session_type']:>16} {result['payload_bytes']:>7} {result['sessions']:>8} "
+        f"{result['window']:>6} {result['lost']:>5} {result['msgs_per_s']:>9.0f} "
+        f"{rtt['p50']:>7.2f} {rtt['p90']:>7.2f} {rtt['p99']:>7.2f} {rtt['max']:>7.2f}"
+    )
+
+
+SESSIONS_HEADER = (
+    f"{'session':>16} {'bytes':>7} {'sessions':>8} {'window':>6} {'lost':>5} {'msgs/s':>9} "
+    f"{'p50 ms':>7} {'p90 ms':>7} {'p99 ms':>7} {'max ms':>7}"
+)
+
+
+async def run_throughput(client, args):
+    print("\nthroughput")
+    print(SESSIONS_HEADER)
+    payload = b"x" * args.payload
+    cases = [("fire_and_forget", 1), ("fire_and_forget", args.window), ("request_response", 1)]
+    results = []
+    for session_type, window in dict.fromkeys(cases):
+        result = await client.sessions(
+            session_type, payload, args.sessions, args.messages, window
+        )
+        print_sessions(result)
+        results.append(result)
+    return results
+
+
+async def run_latency(client, args):
+    print("\nlatency")
+    print(SESSIONS_HEADER)
+    results = []
+    for size in args.sizes:
+        for session_type in SESSION_TYPES:
+            result = await client.sessions(
+                session_type, b"x" * size, 1, args.latency_messages
+            )
+            print_sessions(result)
+            results.append(result)
+    return results
+
+
+async def run_fanout(client, args):
+    print("\nfanout")
+    print(
+        f"{'receivers':>9} {'bytes':>7} {'lost':>5} {'deliveries/s':>12} "
+        f"{'first p50':>9} {'all p50':>8} {'all p99':>8} {'all max':>8}"
+    )
+    payload = b"x" * args.payload
+    results = []
+    for receivers in args.receivers:
+        result = await client.fanout(payload, receivers, args.fanout_messages)
+        first, last = result["first_reply_ms"], result["all_replies_ms"]
+        print(
+            f"{receivers:>9} {len(payload):>7} {result['lost']:>5} "
+            f"{result['deliveries_per_s']:>12.0f} {first['p50']:>9.2f} "
+            f"{last['p50']:>8.2f} {last['p99']:>8.2f} {last['max']:>8.2f}"
+        )
+        results.append(result)
+    return results
+
+
+SUITES = {
+    "throughput": run_throughput,
+    "latency": run_latency,
+    "fanout": run_fanout,
+}
+
+
+async def run(args):
+    address = args.slim
+    gateway = None
+    if address is None:
+        gateway = await slim_bindings.Slim.new(ORGANIZATION, NAMESPACE, "bench-gateway")
+        await gateway.run_server({"endpoint": args.gateway_endpoint, "tls": {"insecure": True}})
+        address = f"http://{args.gateway_endpoint}"
+
+    fanout_receivers = max(args.receivers) if "fanout" in args.suites else 0
+    echo_process = None
+    if not args.external_echo:
+        echo_process = await asyncio.create_subprocess_exec(
+            sys.executable,
+            __file__,
+            "echo",
+            "--slim",
+            address,
+            "--fanout-receivers",
+            str(fanout_receivers),
+        )
+
+    try:
+        participant = await connect(address, CLIENT_AGENT)
+        async with participant:
+            await participant.set_route(ORGANIZATION, NAMESPACE, ECHO_AGENT)
+            await participant.set_route(ORGANIZATION, NAMESPACE, FANOUT_AGENT)
+            client = Client(participant, args.reply_timeout)
+            await client.wait_for_agent(ECHO_AGENT)
+            if fanout_receivers:
+                await client.wait_for_agent(FANOUT_AGENT, fanout_receivers)
+
+            # Warm up the connections and the sessions of the echo agent
+            for session_type in SESSION_TYPES:
+                await client.sessions(session_type, b"x" * args.payload, 1, args.warmup)
+
+            results = {
+                "slim_bindings": slim_bindings.__version__,
+                "python": platform.python_version(),
+                "gateway": "external" if gateway is None else "in-process",
+                "echo": "external" if echo_process is None else "process",
+                "started_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            }
+            for suite in args.suites:
+                results[suite] = await SUITES[suite](client, args)
+    finally:
+        if echo_process is not None:
+            echo_process.terminate()
+            await echo_process.wait()
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nresults written to {args.output}")
+
+
+async def run_echo(args):
+    participants = [await connect(args.slim, ECHO_AGENT)]
+    for _ in range(args.fanout_receivers):
+        participants.append(await connect(args.slim, FANOUT_AGENT))
+    print(f"echo agents connected to {args.slim}", flush=True)
+    await asyncio.gather(*(echo(participant) for participant in participants))
+
+
+async def run_gateway(args):
+    gateway = await slim_bindings.Slim.new(ORGANIZATION, NAMESPACE, "bench-gateway")
+    await gateway.run_server({"endpoint": args.endpoint, "tls": {"insecure": True}})
+    print(f"SLIM gateway listening on {args.endpoint}", flush=True)
+    await asyncio.Event().wait()
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="SLIM throughput and latency benchmarks.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    bench = commands.add_parser("run", help="Run the benchmark suites.")
+    bench.add_argument("-s", "--slim", type=str, help="Slim address, runs a gateway in process if unset.")
+    bench.add_argument("--gateway-endpoint", type=str, default="127.0.0.1:46357", help="Endpoint of the in-process gateway.")
+    bench.add_argument("--external-echo", action="store_true", help="Use echo agents started separately.")
+    bench.add_argument("--suites", nargs="+", choices=list(SUITES), default=list(SUITES))
+    bench.add_argument("--payload", type=int, default=1024, help="Payload bytes of the throughput and fanout suites.")
+    bench.add_argument("--sessions", type=int, default=8, help="Concurrent sessions of the throughput suite.")
+    bench.add_argument("--window", type=int, default=16, help="Messages in flight per FireAndForget session.")
+    bench.add_argument("--messages", type=int, default=2000, help="Messages per session of the throughput suite.")
+    bench.add_argument("--sizes", type=int, nargs="+", default=[64, 1024, 16 * 1024, 64 * 1024, 256 * 1024])
+    bench.add_argument("--latency-messages", type=int, default=200, help="Messages per payload size of the latency suite.")
+    bench.add_argument("--receivers", type=int, nargs="+", default=[1, 2, 4, 8], help="Receiver counts of the fanout suite.")
+    bench.add_argument("--fanout-messages", type=int, default=200, help="Messages per receiver count of the fanout suite.")
+    bench.add_argument("--warmup", type=int, default=100, help="Messages per session type before measuring.")
+    bench.add_argument("--reply-timeout", type=float, default=10.0)
+    bench.add_argument("-o", "--output", type=str, help="Write the results to this JSON file.")
+
+    echo_agents = commands.add_parser("echo", help="Run the echo agents.")
+    echo_agents.add_argument("-s", "--slim", type=str, default="http://127.0.0.1:46357", help="Slim address.")
+    echo_agents.add_argument("--fanout-receivers", type=int, default=8, help="Instances of the fanout agent.")
+
+    gateway = commands.add_parser("gateway", help="Run a SLIM gateway.")
+    gateway.add_argument("--endpoint", type=str, default="127.0.0.1:46357")
+
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    command = {"run": run, "echo": run_echo, "gateway": run_gateway}[args.command]
+    try:
+        asyncio.run(command(args))
+    except KeyboardInterrupt:
+        pass
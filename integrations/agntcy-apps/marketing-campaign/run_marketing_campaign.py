@@ -5,10 +5,11 @@ import time
 import json
 import argparse
 from urllib.parse import urlparse
-import requests
 import logging
 import subprocess
 
+from tools.http_client import get_session, wait_until_ready
+
 # Configure logging
 logging.basicConfig(
     level=logging.DEBUG,
@@ -129,7 +130,7 @@ class MarketingCampaign:
             'x-api-key': self.marketing_campaign_api_key
         }
 
-        response = requests.post(acp_runs_wait_url, headers=headers, json=payload)
+        response = get_session().post(acp_runs_wait_url, headers=headers, json=payload)
         if response.status_code != 200:
             raise Exception(f"Request to {acp_runs_wait_url} failed: {response.status_code} {response.text}")
         logger.debug(f"Request to {acp_runs_wait_url} successful: {response.status_code} - {response.text}")
@@ -282,6 +283,9 @@ def main():
         if not all([mc.marketing_campaign_id, mc.marketing_campaign_api_key, mc.marketing_campaign_host]):
                 logger.error("Missing wsfm required information. Please check the log file.")
                 sys.exit(1)
+        if not wait_until_ready(mc.marketing_campaign_host, timeout=TIMEOUT_SECONDS):
+            logger.error(f"Workflow server at {mc.marketing_campaign_host} is not answering.")
+            sys.exit(1)
         mc.run_echo_server()
         logger.info("Testing email composer")
         mc.test_composer()
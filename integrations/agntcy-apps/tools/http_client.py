@@ -0,0 +1,68 @@
+import time
+import logging
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+# Connections kept open per host, the runners talk to a handful of local servers
+POOL_MAXSIZE = 10
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """
+    Returns the HTTP session shared by the whole process, creating it on first use.
+
+    The session keeps its connections alive between requests, so repeated calls to the
+    same server skip the TCP (and TLS) handshake.
+
+    Returns:
+        requests.Session: The shared session.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=POOL_MAXSIZE, pool_maxsize=POOL_MAXSIZE)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _session = session
+        return _session
+
+
+def wait_until_ready(url: str, timeout: float = 60, initial_delay: float = 0.1, max_delay: float = 5,
+                     headers: dict | None = None) -> bool:
+    """
+    Polls the URL until it answers with a status below 500, backing off exponentially between attempts.
+
+    Args:
+        url (str): The URL to poll.
+        timeout (float): Seconds to wait for the server before giving up.
+        initial_delay (float): Seconds to wait after the first failed attempt, doubled after each attempt.
+        max_delay (float): Upper bound of the wait between two attempts.
+        headers (dict | None): Headers sent with each attempt.
+
+    Returns:
+        bool: True if the server answered in time, False otherwise.
+    """
+    deadline = time.monotonic() + timeout
+    delay = initial_delay
+    while True:
+        try:
+            response = get_session().get(url, headers=headers, timeout=max_delay)
+            if response.status_code < 500:
+                return True
+            logger.debug(f"{url} not ready yet: {response.status_code}")
+        except requests.RequestException as e:
+            logger.debug(f"{url} not ready yet: {e}")
+
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        time.sleep(min(delay, remaining))
+        delay = min(delay * 2, max_delay)
@@ -2,13 +2,26 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import asyncio
+import signal
 from simple_agentic_app.simple_agentic_app import simple_autogen_app
 
 import argparse
-import slim_bindings
 
-
-async def run_agent(message, address, iterations):
+from framing import iter_records
+from participant_manager import participant_manager
+from session_manager import SessionManager, serve_metrics
+
+
+async def run_agent(
+    message,
+    address,
+    iterations,
+    max_concurrency=32,
+    idle_timeout=300.0,
+    session_queue_size=64,
+    drain_timeout=10.0,
+    metrics_port=0,
+):
     agent = simple_autogen_app()
 
     local_organization = "cisco"
@@ -19,78 +32,71 @@ async def run_agent(message, address, iterations):
     remote_namespace = "default"
     remote_agent = "langchain"
 
-    # create new participant object
-    participant = await slim_bindings.Slim.new(local_organization, local_namespace, local_agent)
-
-    # Connect to remote slim server
+    # Connect to remote slim server, the connection is kept and reused by later runs
+    connection = participant_manager(local_organization, local_namespace, local_agent, address)
     print(f"connecting to: {address}")
-    _ = await participant.connect({"endpoint": address, "tls": {"insecure": True}})
+    participant = await connection.get()
 
     # Get the local agent instance from env
     instance = "autogen_instance"
 
-    async with participant:
-        if message:
-            # Create a route to the remote ID
-            await participant.set_route(remote_organization, remote_namespace, remote_agent)
-
-            # create a session
-            session = await participant.create_session(
-                slim_bindings.PySessionConfiguration.RequestResponse()
-            )
-
-            for i in range(0, iterations):
-                try:
-                    # Send the message
-                    await participant.publish(
-                        session,
-                        message.encode(),
-                        remote_organization,
-                        remote_namespace,
-                        remote_agent,
-                    )
-                    print(f"{instance} sent:", message)
-
-                    # Wait for a reply
-                    session_info, msg = await participant.receive(session=session.id)
-                    print(
-                        f"{instance.capitalize()} received (from session {session_info.id}):",
-                        f"{msg.decode()}",
-                    )
-                except Exception as e:
-                    print("received error: ", e)
-
-                await asyncio.sleep(1)
-        else:
-            # Wait for a message and reply in a loop
-            while True:
-                session_info, _ = await participant.receive()
+    if message:
+        for i in range(0, iterations):
+            try:
+                # Send the message and wait for a reply, the route and the session
+                # are set up once and the request is sent again if the gateway restarts
+                print(f"{instance} sent:", message)
+                msg = await connection.request(
+                    message.encode(),
+                    remote_organization,
+                    remote_namespace,
+                    remote_agent,
+                )
+                print(f"{instance.capitalize()} received:", f"{msg.decode()}")
+            except Exception as e:
+                print("received error: ", e)
+
+            await asyncio.sleep(1)
+    else:
+        async def handle_message(session, msg):
+            # A message may be a frame of several records
+            for record in iter_records(msg):
+                text = str(record, "utf-8")
                 print(
-                    f"{instance.capitalize()} received a new session:",
-                    f"{session_info.id}",
+                    f"{instance.capitalize()} received (from session {session.id}):",
+                    f"{text}",
                 )
 
-                async def background_task(session_id):
-                    while True:
-                        # Receive the message from the session
-                        session, msg = await participant.receive(session=session_id)
-                        print(
-                            f"{instance.capitalize()} received (from session {session_id}):",
-                            f"{msg.decode()}",
-                        )
-
-                        # handle received messages
-                        result = await agent.initate_chat(msg)
-                        print(result)
-
-                        # process response
-                        result.inner_messages
-                        weather_question = result.inner_messages[-1].content[-1].content.split(":")
-                        if weather_question[0] == "WEATHER":
-                            await participant.publish_to(session, weather_question[1].encode())
-                            print(f"{instance.capitalize()} replies:", weather_question[1])
-
-                asyncio.create_task(background_task(session_info.id))
+                # handle received messages, forwarding the weather questions
+                # as soon as the tool has run
+                questions = await agent.weather_questions(text)
+                if not questions:
+                    print(f"{instance.capitalize()} found no weather question in:", text)
+                for question in questions:
+                    await participant.publish_to(session, question.encode())
+                    print(f"{instance.capitalize()} replies:", question)
+
+        manager = SessionManager(
+            participant,
+            handle_message,
+            name=instance,
+            max_concurrency=max_concurrency,
+            idle_timeout=idle_timeout,
+            queue_size=session_queue_size,
+        )
+        metrics_server = await serve_metrics(metrics_port, manager) if metrics_port else None
+
+        # Drain the sessions on SIGINT or SIGTERM instead of dropping them
+        stop = asyncio.Event()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            asyncio.get_running_loop().add_signal_handler(sig, stop.set)
+
+        # Wait for new sessions and serve them until stopped
+        await manager.serve(stop)
+        print(f"{instance.capitalize()} draining {len(manager.tasks)} sessions")
+        await manager.close(drain_timeout)
+        if metrics_server is not None:
+            metrics_server.close()
 
 
 async def main():
@@ -98,8 +104,27 @@ async def main():
     parser.add_argument("-s", "--slim", type=str, help="Slim address.", default="http://127.0.0.1:12345")
     parser.add_argument("-m", "--message", type=str, help="Message to send.")
     parser.add_argument("-i", "--iterations",type=int,help="Number of messages to send, one per second.", default=1)
+    parser.add_argument("--max-concurrency", type=int, help="Messages handled at once across sessions.", default=32)
+    parser.add_argument("--idle-timeout", type=float, help="Seconds before an idle session is closed.", default=300.0)
+    parser.add_argument(
+        "--session-queue-size",
+        type=int,
+        help="Messages a session may have waiting, the oldest ones are dropped beyond.",
+        default=64,
+    )
+    parser.add_argument("--drain-timeout", type=float, help="Seconds to finish the sessions on shutdown.", default=10.0)
+    parser.add_argument("--metrics-port", type=int, help="Serve Prometheus metrics on this port, 0 disables.", default=0)
     args = parser.parse_args()
-    await run_agent(args.message, args.slim, args.iterations)
+    await run_agent(
+        args.message,
+        args.slim,
+        args.iterations,
+        max_concurrency=args.max_concurrency,
+        idle_timeout=args.idle_timeout,
+        session_queue_size=args.session_queue_size,
+        drain_timeout=args.drain_timeout,
+        metrics_port=args.metrics_port,
+    )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,97 @@
+# Copyright AGNTCY Contributors (https://github.com/agntcy)
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+import struct
+
+# Start of a frame of records. 0xff never starts UTF-8 text, so the plain
+# text messages of the agents can't be mistaken for a frame.
+FRAME_MAGIC = b"\xffSF"
+# Every record of a frame is preceded by its length
+RECORD_HEADER = struct.Struct("!I")
+
+
+def iter_records(payload):
+    """
+    Iterate over the records of a received payload, as memoryview slices of it.
+
+    A payload that is not a frame is a single record. Decode a record with
+    str(record, "utf-8"), or bytes(record) to keep it past the payload.
+
+    Raises:
+        ValueError: If the frame is truncated.
+    """
+    view = memoryview(payload)
+    if view[: len(FRAME_MAGIC)] != FRAME_MAGIC:
+        yield view
+        return
+
+    offset, end = len(FRAME_MAGIC), len(view)
+    while offset < end:
+        if offset + RECORD_HEADER.size > end:
+            raise ValueError("truncated frame")
+        (length,) = RECORD_HEADER.unpack_from(view, offset)
+        offset += RECORD_HEADER.size
+        if offset + length > end:
+            raise ValueError("truncated frame")
+        yield view[offset : offset + length]
+        offset += length
+
+
+class FrameWriter:
+    """
+    Coalesce small messages into frames of length-prefixed records.
+
+    Every publish through slim_bindings has a fixed cost, so sending many
+    small messages one by one is expensive. The writer appends the records
+    to a buffer and publishes it as one frame once it holds `max_bytes`, or
+    `max_delay` seconds after its first record, whichever comes first.
+
+    Args:
+        publish: Coroutine function publishing a frame, given as bytes.
+        max_bytes (int): Frame size that triggers a flush.
+        max_delay (float): Seconds a record may wait in the buffer.
+    """
+
+    def __init__(self, publish, max_bytes=16 * 1024, max_delay=0.002):
+        self.publish = publish
+        self.max_bytes = max_bytes
+        self.max_delay = max_delay
+        self.buffer = bytearray(FRAME_MAGIC)
+        self.records = 0
+        self.frames = 0
+        self.timer = None
+        self.pending = set()
+
+    async def write(self, *parts):
+        """Append one record made of the concatenated parts."""
+        self.buffer += RECORD_HEADER.pack(sum(len(part) for part in parts))
+        for part in parts:
+            self.buffer += part
+        self.records += 1
+
+        if len(self.buffer) >= self.max_bytes:
+            await self.flush()
+        elif self.timer is None:
+            self.timer = asyncio.get_running_loop().call_later(self.max_delay, self._flush_later)
+
+    def _flush_later(self):
+        self.timer = None
+        task = asyncio.create_task(self.flush())
+        self.pending.add(task)
+        task.add_done_callback(self.pending.discard)
+
+    async def flush(self):
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        if len(self.buffer) == len(FRAME_MAGIC):
+            return
+        frame = bytes(self.buffer)
+        del self.buffer[len(FRAME_MAGIC) :]
+        self.frames += 1
+        await self.publish(frame)
+
+    async def close(self):
+        await self.flush()
+        await asyncio.gather(*self.pending)
@@ -0,0 +1,206 @@
+# Copyright AGNTCY Contributors (https://github.com/agntcy)
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+
+import slim_bindings
+
+
+class ParticipantManager:
+    """
+    Keep a SLIM participant connected across gateway restarts.
+
+    slim_bindings reconnects the underlying channel by itself, but connect()
+    waits forever while the gateway is down, the receive loop of the
+    participant stops for good on the first forwarding error, and messages
+    published during the outage are lost without notice. The manager:
+
+    - connects with a timeout, retrying with exponential backoff,
+    - restarts the receive loop whenever it stops,
+    - sets each route once per connection, per (organization, namespace, agent),
+    - keeps the sessions it created, per name, and creates them again after
+      a reconnection,
+    - retries requests that get no reply, reconnecting from scratch once
+      several attempts in a row have failed.
+
+    Requests are delivered at least once: a request whose reply was lost is
+    sent again.
+
+    Args:
+        organization (str): The organization of the local agent.
+        namespace (str): The namespace of the local agent.
+        agent (str): The name of the local agent.
+        address (str): The SLIM gateway endpoint.
+        connect_timeout (float): Seconds a connection attempt may take.
+        initial_backoff (float): Seconds before the first retry, doubled after each one.
+        max_backoff (float): Upper bound of the wait between two retries.
+        request_timeout (float): Seconds to wait for the reply of a request.
+        retries (int): Attempts of a request before giving up.
+        reconnect_after (int): Failed requests in a row before reconnecting from scratch.
+    """
+
+    def __init__(
+        self,
+        organization,
+        namespace,
+        agent,
+        address,
+        connect_timeout=5.0,
+        initial_backoff=0.5,
+        max_backoff=30.0,
+        request_timeout=10.0,
+        retries=5,
+        reconnect_after=2,
+    ):
+        self.name = (organization, namespace, agent)
+        self.address = address
+        self.connect_timeout = connect_timeout
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+        self.request_timeout = request_timeout
+        self.retries = retries
+        self.reconnect_after = reconnect_after
+        self.participant = None
+        self.routes = set()
+        self.sessions = {}
+        self.failures = 0
+        self.reconnects = 0
+        self.supervisor = None
+        self.lock = asyncio.Lock()
+
+    async def _backoff(self, attempt):
+        await asyncio.sleep(min(self.initial_backoff * 2**attempt, self.max_backoff))
+
+    async def connect(self):
+        """Connect a new participant, retrying until the gateway answers."""
+        # Created once, a failed attempt leaves the participant ready for the next one
+        participant = await slim_bindings.Slim.new(*self.name)
+        attempt = 0
+        while True:
+            try:
+                await asyncio.wait_for(
+                    participant.connect({"endpoint": self.address, "tls": {"insecure": True}}),
+                    self.connect_timeout,
+                )
+                break
+            except Exception as e:
+                print(f"connecting to {self.address} failed (attempt {attempt + 1}):", str(e) or type(e).__name__)
+                await self._backoff(attempt)
+                attempt += 1
+
+        # Start the receive loop of the participant
+        await participant.__aenter__()
+        self.participant = participant
+        # Routes and sessions belong to the previous participant
+        for route in self.routes:
+            await participant.set_route(*route)
+        self.sessions.clear()
+        if self.supervisor is None:
+            self.supervisor = asyncio.create_task(self._supervise())
+        return participant
+
+    async def get(self):
+        """Return the connected participant, connecting on first use."""
+        async with self.lock:
+            if self.participant is None:
+                await self.connect()
+            return self.participant
+
+    async def _supervise(self):
+        while True:
+            task = self.participant.task
+            try:
+                await asyncio.shield(task)
+            except asyncio.CancelledError:
+                if not task.cancelled():
+                    raise
+            except Exception as e:
+                print("SLIM receive loop stopped, restarting it:", e)
+            if task is self.participant.task:
+                await asyncio.sleep(self.initial_backoff)
+                await self.participant.__aenter__()
+
+    @staticmethod
+    async def _stop(participant):
+        try:
+            await participant.__aexit__(None, None, None)
+        except Exception:
+            # The receive loop had already stopped on an error
+            pass
+
+    async def reconnect(self):
+        """Replace the participant with a newly connected one."""
+        async with self.lock:
+            self.reconnects += 1
+            old = self.participant
+            await self.connect()
+            if old is not None:
+                await self._stop(old)
+
+    async def route(self, organization, namespace, agent):
+        """Set the route to a remote agent, once per connection."""
+        participant = await self.get()
+        key = (organization, namespace, agent)
+        if key not in self.routes:
+            await participant.set_route(*key)
+            self.routes.add(key)
+
+    async def session(self, name, config):
+        """Return the session created under this name, creating it if needed."""
+        participant = await self.get()
+        session = self.sessions.get(name)
+        if session is None or session.id not in participant.sessions:
+            session = await participant.create_session(config)
+            self.sessions[name] = session
+        return session
+
+    async def request(self, msg, organization, namespace, agent, session_name="default"):
+        """
+        Publish a message in a RequestResponse session and return the reply,
+        trying again with exponential backoff when no reply comes.
+        """
+        for attempt in range(self.retries):
+            try:
+                await self.route(organization, namespace, agent)
+                session = await self.session(
+                    session_name, slim_bindings.PySessionConfiguration.RequestResponse()
+                )
+                if attempt > 0:
+                    # Drop the late replies of the previous attempts
+                    queue = self.participant.sessions[session.id][1]
+                    while not queue.empty():
+                        queue.get_nowait()
+                _, reply = await asyncio.wait_for(
+                    self.participant.request_reply(session, msg, organization, namespace, agent),
+                    self.request_timeout,
+                )
+                self.failures = 0
+                return reply
+            except Exception as e:
+                self.failures += 1
+                print(f"request to {agent} failed (attempt {attempt + 1}):", str(e) or type(e).__name__)
+            if self.failures >= self.reconnect_after:
+                self.failures = 0
+                await self.reconnect()
+            else:
+                await self._backoff(attempt)
+        raise TimeoutError(f"no reply from {agent} after {self.retries} attempts")
+
+    async def close(self):
+        if self.supervisor is not None:
+            self.supervisor.cancel()
+            self.supervisor = None
+        if self.participant is not None:
+            await self._stop(self.participant)
+            self.participant = None
+
+
+# Participant managers of the process, reused by every run of an agent
+_managers = {}
+
+
+def participant_manager(organization, namespace, agent, address, **options):
+    key = (organization, namespace, agent, address)
+    if key not in _managers:
+        _managers[key] = ParticipantManager(organization, namespace, agent, address, **options)
+    return _managers[key]
@@ -1,9 +1,11 @@
 # Copyright AGNTCY Contributors (https://github.com/agntcy)
 # SPDX-License-Identifier: Apache-2.0
 
-import os, asyncio
+import os
+import asyncio
+import json
 from typing_extensions import Annotated
-from autogen_agentchat.messages import TextMessage
+from autogen_agentchat.messages import TextMessage, ToolCallRequestEvent, ToolCallExecutionEvent
 from autogen_agentchat.agents import AssistantAgent
 from autogen_ext.models.openai import AzureOpenAIChatCompletionClient
 from autogen_core import CancellationToken
@@ -16,8 +18,11 @@ openai_api_version = os.environ.get("AZURE_OPENAI_API_VERSION", "2025-02-01-prev
 azure_model_version = os.environ.get("AZURE_MODEL_VERSION", "gpt-4o-mini")
 azure_deployment_name = os.environ.get("AZURE_DEPLOYMENT_NAME", "gpt-4o-mini")
 
+def forecast_question(city: str) -> str:
+    return f"What is the current weather in {city}"
+
 def weather_forecast(city: Annotated[str, "City of the weather forecast"]) -> str:
-   return f"WEATHER: What is the current weather in {city}"
+   return f"WEATHER: {forecast_question(city)}"
 
 class simple_autogen_app:
     def __init__(self):
@@ -44,16 +49,41 @@ class simple_autogen_app:
         response = await self.assistant.on_messages([TextMessage(content=msg, source="user")], cancellation_token)
         return response
 
+    async def weather_questions(self, msg: str) -> list[str]:
+        """
+        Return the questions prepared by the weather_forecast calls of the
+        assistant, empty if it did not call the tool.
+
+        The cities are read from the arguments of the tool call events and the
+        questions are returned as soon as the tools have run: the stream is
+        closed before the reflection inference of reflect_on_tool_use, which
+        saves a model call per message. Closing it only once the tools have
+        run leaves the model context with the tool results that the next
+        inference expects after a tool call.
+        """
+        cancellation_token = CancellationToken()
+        stream = self.assistant.on_messages_stream([TextMessage(content=msg, source="user")], cancellation_token)
+        cities = {}
+        try:
+            async for event in stream:
+                if isinstance(event, ToolCallRequestEvent):
+                    for call in event.content:
+                        if call.name == weather_forecast.__name__:
+                            cities[call.id] = json.loads(call.arguments)["city"]
+                elif isinstance(event, ToolCallExecutionEvent):
+                    return [
+                        forecast_question(cities[result.call_id])
+                        for result in event.content
+                        if result.call_id in cities and not result.is_error
+                    ]
+                elif isinstance(event, Response):
+                    # Answered without calling a tool
+                    return []
+        finally:
+            await stream.aclose()
+        return []
+
 
 if __name__ == "__main__":
     agent = simple_autogen_app()
-    result = asyncio.run(agent.initate_chat("What is the weather in Budapest?"))
-    if result.chat_message.content == "TERMINATE":
-        try:
-            result.inner_messages
-            weatherQ = result.inner_messages[-1].content[-1].content.split(":")
-            print(weatherQ)
-        except:
-            print(result)
-    else:
-        print(result)
+    print(asyncio.run(agent.weather_questions("What is the weather in Budapest?")))
@@ -0,0 +1,34 @@
+# Copyright AGNTCY Contributors (https://github.com/agntcy)
+# SPDX-License-Identifier: Apache-2.0
+
+import contextlib
+import socket
+
+import slim_bindings
+
+
+def free_endpoint():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return f"127.0.0.1:{s.getsockname()[1]}"
+
+
+@contextlib.asynccontextmanager
+async def slim_gateway(endpoint=None):
+    """Run a SLIM gateway in this process and yield its address."""
+    endpoint = endpoint or free_endpoint()
+    gateway = await slim_bindings.Slim.new("cisco", "default", "gateway")
+    await gateway.run_server({"endpoint": endpoint, "tls": {"insecure": True}})
+    try:
+        yield f"http://{endpoint}"
+    finally:
+        await gateway.stop_server(endpoint)
+
+
+@contextlib.asynccontextmanager
+async def slim_participant(address, agent):
+    """Connect a participant to the gateway, with its receive loop running."""
+    participant = await slim_bindings.Slim.new("cisco", "default", agent)
+    await participant.connect({"endpoint": address, "tls": {"insecure": True}})
+    async with participant:
+        yield participant
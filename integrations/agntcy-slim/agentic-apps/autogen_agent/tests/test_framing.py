@@ -0,0 +1,87 @@
+# Copyright AGNTCY Contributors (https://github.com/agntcy)
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+
+import pytest
+import slim_bindings
+from framing import FRAME_MAGIC, FrameWriter, iter_records
+
+from tests._slim import slim_gateway, slim_participant
+
+
+def test_plain_message_is_a_single_record():
+    assert [bytes(record) for record in iter_records(b"hello")] == [b"hello"]
+
+
+def test_truncated_frame_is_rejected():
+    frame = FRAME_MAGIC + b"\x00\x00\x00\x05abc"
+
+    with pytest.raises(ValueError, match="truncated frame"):
+        list(iter_records(frame))
+
+
+def test_full_buffer_is_flushed_at_once():
+    frames = []
+
+    async def publish(frame):
+        frames.append(frame)
+
+    async def main():
+        writer = FrameWriter(publish, max_bytes=48, max_delay=60)
+        await writer.write(b"first record", b" in two parts")
+        assert writer.frames == 0
+        await writer.write(b"second record")
+        assert writer.frames == 1
+        await writer.close()
+
+    asyncio.run(main())
+    assert [[bytes(record) for record in iter_records(frame)] for frame in frames] == [
+        [b"first record in two parts", b"second record"],
+    ]
+
+
+def test_records_are_flushed_after_the_delay():
+    frames = []
+
+    async def publish(frame):
+        frames.append(frame)
+
+    async def main():
+        writer = FrameWriter(publish, max_delay=0.01)
+        await writer.write(b"one")
+        await writer.write(b"two")
+        await asyncio.sleep(0.05)
+        assert writer.frames == 1
+        await writer.close()
+
+    asyncio.run(main())
+    assert [bytes(record) for record in iter_records(frames[0])] == [b"one", b"two"]
+
+
+def test_frames_cross_the_gateway():
+    async def main():
+        async with slim_gateway() as address:
+            async with slim_participant(address, "rx") as rx, slim_participant(address, "tx") as tx:
+                await tx.set_route("cisco", "default", "rx")
+                session = await tx.create_session(slim_bindings.PySessionConfiguration.FireAndForget())
+
+                async def publish(frame):
+                    await tx.publish(session, frame, "cisco", "default", "rx")
+
+                writer = FrameWriter(publish, max_bytes=64)
+                for i in range(20):
+                    await writer.write(b"record %d" % i)
+                await writer.close()
+
+                # The first message announces the session, and is received again in it
+                info, _ = await asyncio.wait_for(rx.receive(), 2)
+                records = []
+                while len(records) < 20:
+                    _, msg = await asyncio.wait_for(rx.receive(session=info.id), 2)
+                    records += [str(record, "utf-8") for record in iter_records(msg)]
+                return records, writer.frames
+
+    records, frames = asyncio.run(main())
+    assert records == [f"record {i}" for i in range(20)]
+    assert 1 < frames < 20
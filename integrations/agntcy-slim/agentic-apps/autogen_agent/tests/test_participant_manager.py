@@ -0,0 +1,87 @@
+# Copyright AGNTCY Contributors (https://github.com/agntcy)
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+
+import pytest
+import slim_bindings
+from participant_manager import ParticipantManager
+
+from tests._slim import free_endpoint, slim_gateway, slim_participant
+
+
+async def serve_echo(participant):
+    """Answer every request with the request itself."""
+
+    async def serve_session(session_id):
+        while True:
+            session, msg = await participant.receive(session=session_id)
+            await participant.publish_to(session, msg)
+
+    tasks = []
+    try:
+        while True:
+            session, _ = await participant.receive()
+            tasks.append(asyncio.create_task(serve_session(session.id)))
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+def test_connect_retries_with_the_same_participant(monkeypatch, capsys):
+    created = []
+    new = slim_bindings.Slim.new.__func__
+
+    async def counting_new(cls, *name):
+        created.append(name)
+        return await new(cls, *name)
+
+    monkeypatch.setattr(slim_bindings.Slim, "new", classmethod(counting_new))
+
+    async def main():
+        endpoint = free_endpoint()
+        manager = ParticipantManager(
+            "cisco", "default", "client", f"http://{endpoint}", connect_timeout=0.2, initial_backoff=0.05
+        )
+        connecting = asyncio.create_task(manager.get())
+        # The gateway comes up after a few failed attempts
+        await asyncio.sleep(0.5)
+        async with slim_gateway(endpoint):
+            participant = await asyncio.wait_for(connecting, 5)
+            await manager.close()
+        return participant
+
+    assert asyncio.run(main()) is not None
+    assert created.count(("cisco", "default", "client")) == 1
+    assert "failed (attempt 1): TimeoutError" in capsys.readouterr().out
+
+
+def test_request_gets_the_reply():
+    async def main():
+        async with slim_gateway() as address, slim_participant(address, "echo") as echo:
+            serving = asyncio.create_task(serve_echo(echo))
+            manager = ParticipantManager("cisco", "default", "client", address)
+            try:
+                return [await manager.request(b"ping %d" % i, "cisco", "default", "echo") for i in range(3)]
+            finally:
+                serving.cancel()
+                await manager.close()
+
+    assert asyncio.run(main()) == [b"ping 0", b"ping 1", b"ping 2"]
+
+
+def test_request_without_reply_gives_up(capsys):
+    async def main():
+        async with slim_gateway() as address:
+            manager = ParticipantManager(
+                "cisco", "default", "client", address, request_timeout=0.1, initial_backoff=0.01, retries=2
+            )
+            try:
+                with pytest.raises(TimeoutError, match="no reply from nobody after 2 attempts"):
+                    await manager.request(b"ping", "cisco", "default", "nobody")
+            finally:
+                await manager.close()
+            return manager.reconnects
+
+    assert asyncio.run(main()) == 1
+    assert "request to nobody failed (attempt 2): TimeoutError" in capsys.readouterr().out
@@ -0,0 +1,96 @@
+# Copyright AGNTCY Contributors (https://github.com/agntcy)
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+
+import slim_bindings
+from session_manager import SessionManager
+
+from tests._slim import slim_gateway, slim_participant
+
+
+async def replies(client, sessions, timeout=2.0):
+    received = []
+    for session in sessions:
+        try:
+            _, reply = await asyncio.wait_for(client.receive(session=session.id), timeout)
+        except asyncio.TimeoutError:
+            continue
+        received.append(bytes(reply))
+    return sorted(received)
+
+
+def serve_echo(test, handler_delay=0.0, **options):
+    """
+    Run `test` with a client and a SessionManager serving an echo agent,
+    both connected to an in-process gateway.
+    """
+
+    async def main():
+        async with slim_gateway() as address:
+            async with slim_participant(address, "echo") as echo, slim_participant(address, "client") as client:
+
+                async def handler(session, msg):
+                    await asyncio.sleep(handler_delay)
+                    await echo.publish_to(session, msg)
+
+                manager = SessionManager(echo, handler, name="echo", **options)
+                stop = asyncio.Event()
+                serving = asyncio.create_task(manager.serve(stop))
+                await client.set_route("cisco", "default", "echo")
+                try:
+                    await test(manager, stop, client)
+                finally:
+                    stop.set()
+                    await serving
+                    await manager.close()
+
+    asyncio.run(main())
+
+
+async def send(client, messages):
+    """Send every message in a session of its own."""
+    sessions = []
+    for msg in messages:
+        session = await client.create_session(slim_bindings.PySessionConfiguration.FireAndForget())
+        await client.publish(session, msg, "cisco", "default", "echo")
+        sessions.append(session)
+    return sessions
+
+
+def test_every_session_is_served():
+    async def test(manager, stop, client):
+        sessions = await send(client, [b"one", b"two", b"three"])
+
+        assert await replies(client, sessions) == [b"one", b"three", b"two"]
+        assert manager.handled == 3
+
+    serve_echo(test)
+
+
+def test_close_handles_the_messages_waiting_for_a_slot():
+    async def test(manager, stop, client):
+        sessions = await send(client, [b"one", b"two"])
+        # One message is being handled, the other waits for the only slot
+        while len(manager.tasks) < 2 or not manager.handling:
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0.05)
+        stop.set()
+        await manager.close(timeout=5)
+
+        assert manager.handled == 2
+        assert await replies(client, sessions) == [b"one", b"two"]
+
+    serve_echo(test, handler_delay=0.2, max_concurrency=1)
+
+
+def test_idle_sessions_are_deleted():
+    async def test(manager, stop, client):
+        sessions = await send(client, [b"one"])
+
+        assert await replies(client, sessions) == [b"one"]
+        await asyncio.sleep(0.5)
+        assert manager.reaped == 1
+        assert manager.tasks == {}
+
+    serve_echo(test, idle_timeout=0.2)
@@ -0,0 +1,87 @@
+# Copyright AGNTCY Contributors (https://github.com/agntcy)
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class AgentExecutor:
+    """
+    Run blocking agent calls in a bounded thread pool, off the event loop.
+
+    The LangGraph agent calls the LLM and its tools synchronously. Running it
+    on the event loop would stop every SLIM session from receiving and
+    publishing until it returns, so the calls run in `max_workers` threads
+    instead and wait in line when they are all busy.
+
+    Args:
+        max_workers (int): Agent calls running at once.
+        timeout (float): Seconds a call may take, waiting in line included.
+    """
+
+    def __init__(self, max_workers=4, timeout=120.0):
+        self.pool = ThreadPoolExecutor(max_workers, thread_name_prefix="agent")
+        self.timeout = timeout
+        self.lock = threading.Lock()
+        self.queued = 0
+        self.running = 0
+        self.calls = 0
+        self.timeouts = 0
+        self.queue_wait_seconds = 0.0
+        self.execute_seconds = 0.0
+
+    def _run(self, submitted, fn, args):
+        started = time.perf_counter()
+        with self.lock:
+            self.queued -= 1
+            self.running += 1
+            self.queue_wait_seconds += started - submitted
+        try:
+            return fn(*args), started - submitted, time.perf_counter() - started
+        finally:
+            with self.lock:
+                self.running -= 1
+                self.execute_seconds += time.perf_counter() - started
+
+    async def call(self, fn, *args):
+        """
+        Run fn(*args) in the pool and return its result.
+
+        Raises:
+            TimeoutError: If the call did not finish within the timeout. A call
+                that has already started keeps its thread until it returns.
+        """
+        with self.lock:
+            self.queued += 1
+            self.calls += 1
+        future = self.pool.submit(self._run, time.perf_counter(), fn, args)
+        try:
+            result, queue_wait, execute = await asyncio.wait_for(
+                asyncio.wrap_future(future), self.timeout
+            )
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            # Only takes effect if the call is still waiting for a thread
+            if future.cancel():
+                with self.lock:
+                    self.queued -= 1
+            raise TimeoutError(f"agent call did not finish in {self.timeout} seconds")
+
+        print(f"agent call waited {queue_wait:.3f}s for a thread and ran {execute:.3f}s")
+        return result
+
+    def shutdown(self):
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+    def metrics(self):
+        with self.lock:
+            return {
+                "slim_agent_calls_queued": self.queued,
+                "slim_agent_calls_running": self.running,
+                "slim_agent_calls_total": self.calls,
+                "slim_agent_call_timeouts_total": self.timeouts,
+                "slim_agent_call_queue_wait_seconds_total": self.queue_wait_seconds,
+                "slim_agent_call_execute_seconds_total": self.execute_seconds,
+            }
@@ -0,0 +1,117 @@
+# Copyright AGNTCY Contributors (https://github.com/agntcy)
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Messages/s and CPU per message of batched vs unbatched publishing.
+
+A sender publishes messages of each size to a receiver on the same SLIM
+gateway, one message per publish or coalesced into frames. By default the
+gateway runs in this process, so the CPU time includes it; pass --slim to
+use a gateway started separately.
+
+    python bench_framing.py
+    python bench_framing.py --slim http://127.0.0.1:46357
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+import slim_bindings
+
+from framing import FrameWriter, iter_records
+
+
+async def connect(address, agent):
+    participant = await slim_bindings.Slim.new("cisco", "default", agent)
+    await participant.connect({"endpoint": address, "tls": {"insecure": True}})
+    return participant
+
+
+async def run_case(sender, receiver, size, count, batch_bytes, batch_delay):
+    session = await sender.create_session(slim_bindings.PySessionConfiguration.FireAndForget())
+    payload = b"x" * size
+
+    async def publish(msg):
+        await sender.publish(session, msg, "cisco", "default", "bench-receiver")
+
+    async def receive():
+        # The first message opens the session on the receiver
+        session_info, _ = await receiver.receive()
+        received = 0
+        while received < count:
+            _, msg = await receiver.receive(session=session_info.id)
+            for _ in iter_records(msg):
+                received += 1
+        await receiver.delete_session(session_info.id)
+
+    receiving = asyncio.create_task(receive())
+    start, cpu_start = time.perf_counter(), time.process_time()
+    if batch_bytes > 0:
+        writer = FrameWriter(publish, max_bytes=batch_bytes, max_delay=batch_delay)
+        for _ in range(count):
+            await writer.write(payload)
+        await writer.close()
+        frames = writer.frames
+    else:
+        for _ in range(count):
+            await publish(payload)
+        frames = count
+    await asyncio.wait_for(receiving, timeout=120)
+    elapsed, cpu = time.perf_counter() - start, time.process_time() - cpu_start
+    await sender.delete_session(session.id)
+
+    return {
+        "payload_bytes": size,
+        "batched": batch_bytes > 0,
+        "messages": count,
+        "frames": frames,
+        "msgs_per_s": count / elapsed,
+        "cpu_us_per_msg": cpu / count * 1e6,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Batched vs unbatched SLIM publishing benchmark.")
+    parser.add_argument("-s", "--slim", type=str, help="Slim address, runs a gateway in process if unset.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[64, 1024, 16 * 1024, 64 * 1024])
+    parser.add_argument("--messages", type=int, help="Messages per case, at most.", default=20000)
+    parser.add_argument("--bytes", type=int, help="Payload bytes per case, at most.", default=64 << 20)
+    parser.add_argument("--batch-bytes", type=int, default=16 * 1024)
+    parser.add_argument("--batch-delay-ms", type=float, default=2.0)
+    parser.add_argument("-o", "--output", type=str, help="Write the results to this JSON file.")
+    args = parser.parse_args()
+
+    address = args.slim
+    if address is None:
+        gateway = await slim_bindings.Slim.new("cisco", "default", "bench-gateway")
+        await gateway.run_server({"endpoint": "127.0.0.1:46357", "tls": {"insecure": True}})
+        address = "http://127.0.0.1:46357"
+        await asyncio.sleep(0.5)
+
+    receiver = await connect(address, "bench-receiver")
+    sender = await connect(address, "bench-sender")
+    results = []
+    print(f"{'bytes':>7} {'mode':>9} {'messages':>9} {'frames':>7} {'msgs/s':>9} {'cpu us/msg':>11}")
+    async with receiver, sender:
+        await sender.set_route("cisco", "default", "bench-receiver")
+        for size in args.sizes:
+            count = min(args.messages, max(200, args.bytes // size))
+            for batch_bytes in (0, args.batch_bytes):
+                result = await run_case(
+                    sender, receiver, size, count, batch_bytes, args.batch_delay_ms / 1000
+                )
+                results.append(result)
+                print(
+                    f"{size:>7} {'batched' if batch_bytes else 'unbatched':>9} {count:>9} "
+                    f"{result['frames']:>7} {result['msgs_per_s']:>9.0f} {result['cpu_us_per_msg']:>11.1f}"
+                )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -2,6 +2,7 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import asyncio
+import signal
 
 from simple_weather_agent.simple_weather_agent import (
     SIMPLE_WEATHER_AGENT_WITH_TOOLS,
@@ -10,83 +11,149 @@ from simple_weather_agent.simple_weather_agent import (
 import argparse
 import slim_bindings
 
-
-async def run_agent(message, address, iterations):
+from agent_executor import AgentExecutor
+from framing import iter_records
+from session_manager import SessionManager, serve_metrics
+from throughput import ThroughputClient, print_report
+
+
+async def run_agent(
+    message,
+    address,
+    iterations,
+    local_agent="langchain",
+    remote_agent="autogen",
+    sessions=0,
+    window=16,
+    batch_bytes=0,
+    echo=False,
+    max_concurrency=32,
+    idle_timeout=300.0,
+    session_queue_size=64,
+    drain_timeout=10.0,
+    metrics_port=0,
+    agent_workers=4,
+    agent_timeout=120.0,
+):
     agent = SIMPLE_WEATHER_AGENT_WITH_TOOLS()
+    # The agent blocks on the LLM and its tools, keep it off the event loop
+    executor = AgentExecutor(max_workers=agent_workers, timeout=agent_timeout)
 
-    local_organization = "cisco"
-    local_namespace = "default"
-    local_agent = "langchain"
-
-    remote_organization = "cisco"
-    remote_namespace = "default"
-    remote_agent = "autogen"
-
-    # create new participant object
-    participant = await slim_bindings.Slim.new(local_organization, local_namespace, local_agent)
-
-    # Connect to remote slim server
-    print(f"connecting to: {address}")
-    _ = await participant.connect({"endpoint": address, "tls": {"insecure": True}})
-
-    # Get the local agent instance from env
-    instance = "langchain_instance"
-
-    async with participant:
-        if message:
-            # Create a route to the remote ID
-            await participant.set_route(remote_organization, remote_namespace, remote_agent)
-
-            # create a session
-            session = await participant.create_session(
-                slim_bindings.PySessionConfiguration.FireAndForget()
-            )
-
-            for i in range(0, iterations):
-                try:
-                    # Send the message
-                    await participant.publish(
-                        session,
-                        message.encode(),
-                        remote_organization,
-                        remote_namespace,
-                        remote_agent,
-                    )
-                    print(f"{instance} sent:", message)
-
-                    # Wait for a reply
-                    session_info, msg = await participant.receive(session=session.id)
-                    print(
-                        f"{instance.capitalize()} received (from session {session_info.id}):",
-                        f"{msg.decode()}",
-                    )
-                except Exception as e:
-                    print("received error: ", e)
-
-                # handle received messages
-                result = agent.call(msg)
-                print(result)
-
-                await asyncio.sleep(1)
-        else:
-            # Wait for a message and reply in a loop
-            while True:
-                session_info, _ = await participant.receive()
+    try:
+        local_organization = "cisco"
+        local_namespace = "default"
+
+        remote_organization = "cisco"
+        remote_namespace = "default"
+
+        # create new participant object
+        participant = await slim_bindings.Slim.new(local_organization, local_namespace, local_agent)
+
+        # Connect to remote slim server
+        print(f"connecting to: {address}")
+        _ = await participant.connect({"endpoint": address, "tls": {"insecure": True}})
+
+        # Get the local agent instance from env
+        instance = "langchain_instance"
+
+        async with participant:
+            if message and sessions > 0:
+                # Throughput mode, the remote agent has to echo the messages back
+                await participant.set_route(remote_organization, remote_namespace, remote_agent)
+
+                client = ThroughputClient(
+                    participant,
+                    remote_organization,
+                    remote_namespace,
+                    remote_agent,
+                    window=window,
+                    batch_bytes=batch_bytes,
+                )
                 print(
-                    f"{instance.capitalize()} received a new session:",
-                    f"{session_info.id}",
+                    f"{instance} sending {iterations} messages on each of {sessions} sessions,",
+                    f"{window} in flight per session",
                 )
+                print_report(await client.run(message.encode(), sessions, iterations))
+            elif message:
+                # Create a route to the remote ID
+                await participant.set_route(remote_organization, remote_namespace, remote_agent)
+
+                # create a session
+                session = await participant.create_session(
+                    slim_bindings.PySessionConfiguration.FireAndForget()
+                )
+
+                async def handle_reply(msg):
+                    try:
+                        result = await executor.call(agent.call, msg.decode())
+                    except Exception as e:
+                        print("agent error: ", e)
+                        return
+                    print(result)
+
+                replies = []
+                for i in range(0, iterations):
+                    try:
+                        # Send the message
+                        await participant.publish(
+                            session,
+                            message.encode(),
+                            remote_organization,
+                            remote_namespace,
+                            remote_agent,
+                        )
+                        print(f"{instance} sent:", message)
 
-                async def background_task(session_id):
-                    while True:
-                        # Receive the message from the session
-                        session, msg = await participant.receive(session=session_id)
+                        # Wait for a reply
+                        session_info, msg = await participant.receive(session=session.id)
                         print(
-                            f"{instance.capitalize()} received (from session {session_id}):",
+                            f"{instance.capitalize()} received (from session {session_info.id}):",
                             f"{msg.decode()}",
                         )
+                    except Exception as e:
+                        print("received error: ", e)
+                    else:
+                        # handle received messages, the next ones keep flowing meanwhile
+                        replies.append(asyncio.create_task(handle_reply(msg)))
+
+                    await asyncio.sleep(1)
+
+                await asyncio.gather(*replies)
+            else:
+                async def handle_message(session, msg):
+                    if echo:
+                        # Send the message back as is, for the throughput mode of the sender
+                        await participant.publish_to(session, msg)
+                        return
+                    for record in iter_records(msg):
+                        print(
+                            f"{instance.capitalize()} received (from session {session.id}):",
+                            f"{str(record, 'utf-8')}",
+                        )
+
+                manager = SessionManager(
+                    participant,
+                    handle_message,
+                    name=instance,
+                    max_concurrency=max_concurrency,
+                    idle_timeout=idle_timeout,
+                    queue_size=session_queue_size,
+                )
+                metrics_server = await serve_metrics(metrics_port, manager, executor) if metrics_port else None
+
+                # Drain the sessions on SIGINT or SIGTERM instead of dropping them
+                stop = asyncio.Event()
+                for sig in (signal.SIGINT, signal.SIGTERM):
+                    asyncio.get_running_loop().add_signal_handler(sig, stop.set)
 
-                asyncio.create_task(background_task(session_info.id))
+                # Wait for new sessions and serve them until stopped
+                await manager.serve(stop)
+                print(f"{instance.capitalize()} draining {len(manager.tasks)} sessions")
+                await manager.close(drain_timeout)
+                if metrics_server is not None:
+                    metrics_server.close()
+    finally:
+        executor.shutdown()
 
 
 async def main():
@@ -94,8 +161,53 @@ async def main():
     parser.add_argument("-m", "--message", type=str, help="Message to send.")
     parser.add_argument("-s", "--slim", type=str, help="Slim address.", default="http://127.0.0.1:12345")
     parser.add_argument("-i", "--iterations",type=int,help="Number of messages to send, one per second.", default=1)
+    parser.add_argument("--local-agent", type=str, help="Name of this agent.", default="langchain")
+    parser.add_argument("--remote-agent", type=str, help="Name of the agent to send to.", default="autogen")
+    parser.add_argument(
+        "--sessions",
+        type=int,
+        help="Throughput mode: send the iterations on each of N sessions, as fast as the replies come back.",
+        default=0,
+    )
+    parser.add_argument("--window", type=int, help="Throughput mode: messages in flight per session.", default=16)
+    parser.add_argument(
+        "--batch-bytes",
+        type=int,
+        help="Throughput mode: coalesce the messages of a session into frames of this size, 0 disables.",
+        default=0,
+    )
+    parser.add_argument("--echo", action="store_true", help="Echo received messages back, to serve the throughput mode.")
+    parser.add_argument("--max-concurrency", type=int, help="Messages handled at once across sessions.", default=32)
+    parser.add_argument("--idle-timeout", type=float, help="Seconds before an idle session is closed.", default=300.0)
+    parser.add_argument(
+        "--session-queue-size",
+        type=int,
+        help="Messages a session may have waiting, the oldest ones are dropped beyond.",
+        default=64,
+    )
+    parser.add_argument("--drain-timeout", type=float, help="Seconds to finish the sessions on shutdown.", default=10.0)
+    parser.add_argument("--metrics-port", type=int, help="Serve Prometheus metrics on this port, 0 disables.", default=0)
+    parser.add_argument("--agent-workers", type=int, help="Agent calls running at once, in threads.", default=4)
+    parser.add_argument("--agent-timeout", type=float, help="Seconds an agent call may take.", default=120.0)
     args = parser.parse_args()
-    await run_agent(args.message, args.slim, args.iterations)
+    await run_agent(
+        args.message,
+        args.slim,
+        args.iterations,
+        local_agent=args.local_agent,
+        remote_agent=args.remote_agent,
+        sessions=args.sessions,
+        window=args.window,
+        batch_bytes=args.batch_bytes,
+        echo=args.echo,
+        max_concurrency=args.max_concurrency,
+        idle_timeout=args.idle_timeout,
+        session_queue_size=args.session_queue_size,
+        drain_timeout=args.drain_timeout,
+        metrics_port=args.metrics_port,
+        agent_workers=args.agent_workers,
+        agent_timeout=args.agent_timeout,
+    )
 
 if __name__ == "__main__":
     try:
@@ -0,0 +1,160 @@
+# Copyright AGNTCY Contributors (https://github.com/agntcy)
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+import time
+
+
+class SessionManager:
+    """
+    Serve the sessions that remote agents open, with bounded resources.
+
+    Every session gets a task that hands its messages to `handler`, with at
+    most `max_concurrency` handler calls running at once across sessions.
+    A session that stays idle for `idle_timeout` seconds is deleted. SLIM
+    queues the incoming messages of a session without limit, so when more
+    than `queue_size` messages are waiting the oldest ones are dropped.
+
+    Args:
+        participant (slim_bindings.Slim): The connected participant.
+        handler: Coroutine function called with the session info and the message.
+        name (str): Name of the agent in the logs.
+        max_concurrency (int): Handler calls running at once.
+        idle_timeout (float): Seconds without messages before a session is deleted.
+        queue_size (int): Messages a session may have waiting.
+    """
+
+    def __init__(
+        self,
+        participant,
+        handler,
+        name="agent",
+        max_concurrency=32,
+        idle_timeout=300.0,
+        queue_size=64,
+    ):
+        self.participant = participant
+        self.handler = handler
+        self.name = name
+        self.idle_timeout = idle_timeout
+        self.queue_size = queue_size
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.tasks = {}
+        self.handling = set()
+        self.closing = False
+        self.dropped = 0
+        self.reaped = 0
+        self.handled = 0
+
+    def backlog(self, session_id):
+        entry = self.participant.sessions.get(session_id)
+        return entry[1].qsize() if entry is not None else 0
+
+    async def serve(self, stop):
+        """Start a task for every new session until `stop` is set."""
+        stopped = asyncio.create_task(stop.wait())
+        try:
+            while True:
+                received = asyncio.create_task(self.participant.receive())
+                await asyncio.wait({received, stopped}, return_when=asyncio.FIRST_COMPLETED)
+                if not received.done():
+                    received.cancel()
+                    return
+                session_info, _ = received.result()
+                if session_info.id not in self.tasks:
+                    print(f"{self.name.capitalize()} received a new session:", f"{session_info.id}")
+                    self.tasks[session_info.id] = asyncio.create_task(self._run_session(session_info.id))
+        finally:
+            stopped.cancel()
+
+    async def _run_session(self, session_id):
+        try:
+            while not (self.closing and self.backlog(session_id) == 0):
+                try:
+                    session, msg = await asyncio.wait_for(
+                        self.participant.receive(session=session_id), self.idle_timeout
+                    )
+                except asyncio.TimeoutError:
+                    print(f"{self.name.capitalize()} closing idle session:", f"{session_id}")
+                    self.reaped += 1
+                    await self.participant.delete_session(session_id)
+                    return
+
+                # Busy from now on, close() must not cancel a received message
+                # while it waits for a free slot
+                self.handling.add(session_id)
+                try:
+                    # Shed the oldest messages when the session falls too far behind
+                    if self.backlog(session_id) >= self.queue_size:
+                        self.dropped += 1
+                        continue
+
+                    async with self.semaphore:
+                        try:
+                            await self.handler(session, msg)
+                        except Exception as e:
+                            print(f"error handling a message of session {session_id}:", e)
+                        finally:
+                            self.handled += 1
+                finally:
+                    self.handling.discard(session_id)
+        finally:
+            self.tasks.pop(session_id, None)
+
+    async def close(self, timeout=10.0):
+        """
+        Drain the sessions: messages already received are handled for up to
+        `timeout` seconds, then the remaining sessions are cancelled.
+        """
+        self.closing = True
+        deadline = time.monotonic() + timeout
+        while self.tasks and time.monotonic() < deadline:
+            for session_id, task in list(self.tasks.items()):
+                # Waiting for a message that will never be handled
+                if session_id not in self.handling and self.backlog(session_id) == 0:
+                    task.cancel()
+            await asyncio.sleep(0.05)
+
+        tasks = list(self.tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def metrics(self):
+        return {
+            "slim_agent_active_sessions": len(self.tasks),
+            "slim_agent_queue_depth": sum(self.backlog(session_id) for session_id in self.tasks),
+            "slim_agent_handling": len(self.handling),
+            "slim_agent_messages_handled_total": self.handled,
+            "slim_agent_messages_dropped_total": self.dropped,
+            "slim_agent_sessions_reaped_total": self.reaped,
+        }
+
+
+async def serve_metrics(port, *sources):
+    """
+    Serve the metrics of the sources in the Prometheus text format on every
+    request to the port, each source has a metrics() method returning a dict.
+    """
+
+    async def handle(reader, writer):
+        try:
+            # The request itself does not matter, read up to the end of its headers
+            await reader.readuntil(b"\r\n\r\n")
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+            pass
+        lines = []
+        for source in sources:
+            for name, value in source.metrics().items():
+                kind = "counter" if name.endswith("_total") else "gauge"
+                lines.append(f"# TYPE {name} {kind}\n{name} {value}\n")
+        body = "".join(lines).encode()
+        writer.write(
+            b"HTTP/1.1 200 OK\r\nContent-Type: text/plain; version=0.0.4\r\n"
+            + f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode()
+            + body
+        )
+        await writer.drain()
+        writer.close()
+
+    return await asyncio.start_server(handle, "0.0.0.0", port)
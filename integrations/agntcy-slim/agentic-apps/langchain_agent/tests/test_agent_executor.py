@@ -0,0 +1,128 @@
+# Copyright AGNTCY Contributors (https://github.com/agntcy)
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+import threading
+import time
+
+import pytest
+import slim_bindings
+from agent_executor import AgentExecutor
+from session_manager import SessionManager
+
+from tests._slim import slim_gateway, slim_participant
+
+
+async def wait_until(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        await asyncio.sleep(0.01)
+
+
+def test_calls_beyond_max_workers_wait_for_a_thread():
+    release = threading.Event()
+
+    def agent(question):
+        release.wait()
+        return question.upper()
+
+    async def main():
+        executor = AgentExecutor(max_workers=2)
+        calls = [asyncio.create_task(executor.call(agent, q)) for q in ("a", "b", "c", "d")]
+        await wait_until(lambda: executor.running == 2)
+        await asyncio.sleep(0.05)
+
+        metrics = executor.metrics()
+        assert metrics["slim_agent_calls_running"] == 2
+        assert metrics["slim_agent_calls_queued"] == 2
+        assert metrics["slim_agent_calls_total"] == 4
+
+        release.set()
+        assert await asyncio.gather(*calls) == ["A", "B", "C", "D"]
+        assert (executor.running, executor.queued) == (0, 0)
+        executor.shutdown()
+
+    asyncio.run(main())
+
+
+def test_timeout_cancels_a_queued_call():
+    release = threading.Event()
+    ran = []
+
+    def agent(question):
+        ran.append(question)
+        release.wait()
+        return question
+
+    async def main():
+        executor = AgentExecutor(max_workers=1, timeout=0.2)
+        running = asyncio.create_task(executor.call(agent, "running"))
+        await wait_until(lambda: executor.running == 1)
+        queued = asyncio.create_task(executor.call(agent, "queued"))
+
+        # The running call keeps its thread, the queued one never starts
+        for call in (running, queued):
+            with pytest.raises(TimeoutError):
+                await call
+        release.set()
+        await wait_until(lambda: executor.running == 0)
+
+        assert ran == ["running"]
+        assert (executor.timeouts, executor.queued) == (2, 0)
+        executor.shutdown()
+
+    asyncio.run(main())
+
+
+def test_queue_wait_and_execute_are_accounted_apart():
+    async def main():
+        executor = AgentExecutor(max_workers=1)
+        await asyncio.gather(*(executor.call(time.sleep, 0.1) for _ in range(3)))
+
+        # Each call runs 0.1s, the second waits 0.1s for the thread and the third 0.2s
+        assert 0.3 <= executor.execute_seconds < 0.4
+        assert 0.28 <= executor.queue_wait_seconds < 0.4
+        executor.shutdown()
+
+    asyncio.run(main())
+
+
+def test_blocking_agent_calls_leave_the_sessions_served():
+    def agent(question):
+        time.sleep(0.3)
+        return question.upper()
+
+    async def main():
+        executor = AgentExecutor(max_workers=3)
+        async with slim_gateway() as address:
+            async with slim_participant(address, "agent") as server, slim_participant(address, "client") as client:
+
+                async def handler(session, msg):
+                    await server.publish_to(session, (await executor.call(agent, bytes(msg))))
+
+                manager = SessionManager(server, handler, name="agent")
+                stop = asyncio.Event()
+                serving = asyncio.create_task(manager.serve(stop))
+                await client.set_route("cisco", "default", "agent")
+                try:
+                    start = time.perf_counter()
+                    sessions = []
+                    for question in (b"one", b"two", b"three"):
+                        session = await client.create_session(slim_bindings.PySessionConfiguration.FireAndForget())
+                        await client.publish(session, question, "cisco", "default", "agent")
+                        sessions.append(session)
+                    received = [
+                        bytes((await asyncio.wait_for(client.receive(session=s.id), 2.0))[1]) for s in sessions
+                    ]
+
+                    # The three calls ran side by side, not one after the other
+                    assert sorted(received) == [b"ONE", b"THREE", b"TWO"]
+                    assert time.perf_counter() - start < 0.8
+                finally:
+                    stop.set()
+                    await serving
+                    await manager.close()
+        executor.shutdown()
+
+    asyncio.run(main())
@@ -0,0 +1,158 @@
+# Copyright AGNTCY Contributors (https://github.com/agntcy)
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+import itertools
+import struct
+import time
+
+import slim_bindings
+
+from framing import FrameWriter, iter_records
+
+# Every message starts with an id that the echoing agent sends back with the reply
+CORRELATION_ID = struct.Struct("!Q")
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(q / 100 * len(sorted_values)))
+    return sorted_values[index]
+
+
+class ThroughputClient:
+    """
+    Stress a remote agent with several sessions and several messages in flight.
+
+    Each session keeps up to `window` messages outstanding: a new message is
+    published as soon as the reply of an earlier one comes back, instead of
+    waiting for every reply in turn. Replies are matched to their message by
+    the correlation id in front of the payload, so the remote agent must echo
+    the messages back unchanged.
+
+    With `batch_bytes` set, the messages of a session are coalesced into
+    frames of up to that size, see FrameWriter.
+    """
+
+    def __init__(
+        self,
+        participant,
+        remote_organization,
+        remote_namespace,
+        remote_agent,
+        window=16,
+        reply_timeout=10.0,
+        batch_bytes=0,
+        batch_delay=0.002,
+    ):
+        self.participant = participant
+        self.remote = (remote_organization, remote_namespace, remote_agent)
+        self.window = window
+        self.reply_timeout = reply_timeout
+        self.batch_bytes = batch_bytes
+        self.batch_delay = batch_delay
+        self.ids = itertools.count()
+        self.rtts = []
+        self.sent = 0
+        self.lost = 0
+
+    async def run_session(self, payload, count):
+        session = await self.participant.create_session(
+            slim_bindings.PySessionConfiguration.FireAndForget()
+        )
+        window = asyncio.Semaphore(self.window)
+        outstanding = {}
+
+        async def publish(msg):
+            await self.participant.publish(session, msg, *self.remote)
+
+        writer = None
+        if self.batch_bytes > 0:
+            writer = FrameWriter(publish, max_bytes=self.batch_bytes, max_delay=self.batch_delay)
+
+        async def receive_replies():
+            while True:
+                _, msg = await self.participant.receive(session=session.id)
+                for record in iter_records(msg):
+                    (message_id,) = CORRELATION_ID.unpack_from(record)
+                    sent_at = outstanding.pop(message_id, None)
+                    if sent_at is None:
+                        # Already given up on, or not ours
+                        continue
+                    self.rtts.append(time.perf_counter() - sent_at)
+                    window.release()
+
+        def expire():
+            deadline = time.perf_counter() - self.reply_timeout
+            for message_id, sent_at in list(outstanding.items()):
+                if sent_at < deadline:
+                    del outstanding[message_id]
+                    self.lost += 1
+                    window.release()
+
+        receiver = asyncio.create_task(receive_replies())
+        try:
+            for _ in range(count):
+                while True:
+                    try:
+                        await asyncio.wait_for(window.acquire(), self.reply_timeout)
+                        break
+                    except asyncio.TimeoutError:
+                        expire()
+
+                message_id = next(self.ids)
+                outstanding[message_id] = time.perf_counter()
+                if writer is not None:
+                    await writer.write(CORRELATION_ID.pack(message_id), payload)
+                else:
+                    await publish(CORRELATION_ID.pack(message_id) + payload)
+                self.sent += 1
+
+            if writer is not None:
+                await writer.close()
+
+            # Wait for the last replies
+            deadline = time.perf_counter() + self.reply_timeout
+            while outstanding and time.perf_counter() < deadline:
+                await asyncio.sleep(0.01)
+            self.lost += len(outstanding)
+        finally:
+            receiver.cancel()
+            await self.participant.delete_session(session.id)
+
+    async def run(self, payload, sessions, count):
+        """Send `count` messages on each of `sessions` sessions and return a report."""
+        start = time.perf_counter()
+        await asyncio.gather(
+            *(self.run_session(payload, count) for _ in range(sessions))
+        )
+        return self.report(time.perf_counter() - start)
+
+    def report(self, elapsed):
+        rtts = sorted(self.rtts)
+        return {
+            "sent": self.sent,
+            "received": len(rtts),
+            "lost": self.lost,
+            "elapsed_s": elapsed,
+            "msgs_per_s": len(rtts) / elapsed if elapsed > 0 else 0.0,
+            "rtt_ms": {
+                "p50": percentile(rtts, 50) * 1000,
+                "p90": percentile(rtts, 90) * 1000,
+                "p99": percentile(rtts, 99) * 1000,
+                "max": rtts[-1] * 1000 if rtts else 0.0,
+            },
+        }
+
+
+def print_report(report):
+    rtt = report["rtt_ms"]
+    print(
+        f"sent {report['sent']} received {report['received']} lost {report['lost']} "
+        f"in {report['elapsed_s']:.2f}s: {report['msgs_per_s']:.1f} msgs/s"
+    )
+    print(
+        f"rtt ms p50 {rtt['p50']:.2f} p90 {rtt['p90']:.2f} "
+        f"p99 {rtt['p99']:.2f} max {rtt['max']:.2f}"
+    )
@@ -7,35 +7,35 @@ to dynamically route user messages to the most appropriate agent for a conversat
 """
 
 import asyncio
+import os
 
-from autogen_core import DefaultSubscription, try_get_known_serializers_for_type
 from autogen_ext.runtimes.grpc import GrpcWorkerAgentRuntime
-from common._agents import WorkerAgent, worker_agent_runtime
-from common._semantic_router_components import TerminationMessage, WorkerAgentMessage
+from common._agents import register_worker_agents, report_load, worker_agent_runtime
+from common._serialization import add_message_serializers
 
 
 async def run_workers():
     agent_runtime: GrpcWorkerAgentRuntime = worker_agent_runtime()
     await agent_runtime.start()
 
-    serializer_termination = try_get_known_serializers_for_type(TerminationMessage)
-    serializer_worker_agent_message = try_get_known_serializers_for_type(
-        WorkerAgentMessage
-    )
-
-    agent_runtime.add_message_serializer(
-        [serializer_termination, serializer_worker_agent_message]
-    )
-
-    # Create the hr agents
-    await WorkerAgent.register(
-        agent_runtime, "finance", lambda: WorkerAgent("finance_agent")
-    )
-    await agent_runtime.add_subscription(
-        DefaultSubscription(topic_type="finance", agent_type="finance")
+    # Create the hr agents, or the agents of one shard when WORKER_SHARD is set
+    shard = os.getenv("WORKER_SHARD")
+    served_type = await register_worker_agents(
+        agent_runtime, "finance", "finance_agent", int(shard) if shard else None
     )
+    add_message_serializers(agent_runtime)
+    if shard:
+        load_reports = asyncio.create_task(
+            report_load(
+                agent_runtime,
+                served_type,
+                float(os.getenv("WORKER_LOAD_REPORT_INTERVAL", "1")),
+            )
+        )
 
     await agent_runtime.stop_when_signal()
+    if shard:
+        load_reports.cancel()
 
 
 if __name__ == "__main__":
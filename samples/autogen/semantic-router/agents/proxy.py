@@ -2,32 +2,41 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import asyncio
+import json
 import logging
-from dataclasses import asdict
-from typing import Mapping
+import os
+import time
+import uuid
+from typing import Any, AsyncIterator
 
 import uvicorn
 from autogen_core import (
     TRACE_LOGGER_NAME,
+    AgentRuntime,
     DefaultSubscription,
     DefaultTopicId,
     MessageContext,
     RoutedAgent,
     message_handler,
-    try_get_known_serializers_for_type,
 )
 from autogen_ext.runtimes.grpc import GrpcWorkerAgentRuntime
 from common._agents import worker_agent_runtime
+from common._correlation import CorrelationTable, CorrelationTableFull
+from common._metrics import MetricsRegistry
 from common._semantic_router_components import (
-    FinalResult,
+    MetricsSnapshot,
     TerminationMessage,
     UserProxyMessage,
+    WorkerAgentChunk,
     WorkerAgentMessage,
 )
+from common._serialization import add_message_serializers
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from pydantic import BaseModel
+from starlette.types import Receive, Scope, Send
 
-logging.basicConfig(level=logging.DEBUG)
+logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO").upper())
 logger = logging.getLogger(f"{TRACE_LOGGER_NAME}.proxy")
 
 
@@ -37,16 +46,27 @@ class UserProxyAgent(RoutedAgent):
 
     Args:
         description (str): The description of the agent.
+        requests (CorrelationTable): The requests waiting for a reply.
+        metrics (MetricsRegistry): Collects the metrics pushed by the other processes.
     """
 
     def __init__(
         self,
         description: str,
-        contexts: Mapping[str, asyncio.Future],
+        requests: CorrelationTable,
+        metrics: MetricsRegistry,
     ) -> None:
-        self.contexts = contexts
+        self.requests = requests
+        self.metrics = metrics
         super().__init__(description)
 
+    def _reply(self, message: WorkerAgentMessage | TerminationMessage) -> None:
+        chunks = message.chunks if isinstance(message, WorkerAgentMessage) else 0
+        if not self.requests.resolve(message.request_id, message, chunks):
+            logger.debug(
+                "Dropping reply to request %s: not in flight", message.request_id
+            )
+
     # When a conversation ends
     @message_handler
     async def on_terminate(
@@ -54,8 +74,10 @@ class UserProxyAgent(RoutedAgent):
     ) -> None:
         assert ctx.topic_id is not None
         """Handle a publish now message. This method prompts the user for input, then publishes it."""
-        logger.debug(f"Ending conversation with {ctx.sender} because {message.reason}")
-        self.contexts[ctx.topic_id.source].set_result(message)
+        logger.debug(
+            "Ending conversation with %s because %s", ctx.sender, message.reason
+        )
+        self._reply(message)
 
     # When the agent responds back, user proxy adds it to history and then
     # sends to Closure Agent for API to respond
@@ -64,22 +86,95 @@ class UserProxyAgent(RoutedAgent):
         self, message: WorkerAgentMessage, ctx: MessageContext
     ) -> None:
         assert ctx.topic_id is not None
-        logger.debug(f"Received message from {message.source}. Content: {message}")
+        logger.debug("Received message from %s. Content: %s", message.source, message)
         logger.debug("Returning message to user")
-        self.contexts[ctx.topic_id.source].set_result(message)
+        self._reply(message)
+
+    # While a streaming worker generates its answer
+    @message_handler
+    async def on_agent_chunk(
+        self, message: WorkerAgentChunk, ctx: MessageContext
+    ) -> None:
+        if not self.requests.push(message.request_id, message.index, message):
+            logger.debug(
+                "Dropping chunk of request %s: not in flight", message.request_id
+            )
+
+    # Another process has pushed its metrics
+    @message_handler
+    async def on_metrics(self, message: MetricsSnapshot, ctx: MessageContext) -> None:
+        self.metrics.merge(message.process, message.metrics)
+
+
+def sse_event(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+# Seconds the proxy waits for the reply of a request
+REQUEST_TIMEOUT = 30
+
+
+class CorrelatedStreamingResponse(StreamingResponse):
+    """A streamed reply that forgets its request however the response ends.
+
+    The generator of a client that disconnects before the first read never
+    starts, so the cleanup of the stream itself never runs.
+    """
+
+    def __init__(
+        self,
+        content: AsyncIterator[str],
+        requests: CorrelationTable,
+        request_id: str,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(content, **kwargs)
+        self.requests = requests
+        self.request_id = request_id
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            self.requests.discard(self.request_id)
 
 
 class Message(BaseModel):
     intent: str
     message: str
     context: str
+    stream: bool = False
+    priority: int = UserProxyMessage.PRIORITY_NORMAL
 
 
 class Proxy:
     def __init__(self):
         self.app = FastAPI()
         self.setup_routes()
-        self.contexts = {}
+        self.requests = CorrelationTable(
+            max_in_flight=int(os.getenv("PROXY_MAX_IN_FLIGHT", "1024"))
+        )
+        self.metrics = MetricsRegistry(
+            remote_ttl=float(os.getenv("METRICS_REMOTE_TTL", "30"))
+        )
+        self.metrics.gauges(
+            "semantic_router_proxy_requests",
+            "Requests tracked by the proxy.",
+            self.requests.gauges,
+        )
+        self.metrics.counters(
+            "semantic_router_proxy_requests",
+            "Requests handled by the proxy.",
+            self.requests.counters,
+        )
+        self.wait_time = {
+            mode: self.metrics.histogram(
+                "semantic_router_proxy_wait_seconds",
+                "Time from publishing a request to its final reply.",
+                mode=mode,
+            )
+            for mode in ("wait", "stream")
+        }
 
         config = uvicorn.Config(
             self.app,
@@ -102,30 +197,61 @@ class Proxy:
         async def health():
             return {"status": "ok"}
 
+        @self.app.get("/stats")
+        async def stats():
+            return self.requests.stats()
+
+        @self.app.get("/metrics", response_class=PlainTextResponse)
+        async def metrics():
+            return self.metrics.render()
+
         @self.app.post("/message")
         async def receive_message(data: Message):
             logger.info(
-                f"Received message: intent: {data.intent}; message: {data.message} ctx: {data.context}"
+                "Received message: intent: %s; message: %s ctx: %s",
+                data.intent,
+                data.message,
+                data.context,
             )
 
-            # Create a future for the context
-            self.contexts[data.context] = asyncio.Future()
+            # Register the request before publishing so that no reply is missed
+            request_id = uuid.uuid4().hex
+            try:
+                self.requests.register(request_id, stream=data.stream)
+            except CorrelationTableFull:
+                raise HTTPException(status_code=429, detail="Too many requests")
 
-            await self.agent_runtime.publish_message(
-                UserProxyMessage(
-                    intent=data.intent, content=data.message, source=data.context
-                ),
-                topic_id=DefaultTopicId(type="default", source=data.context),
-            )
+            try:
+                await self.agent_runtime.publish_message(
+                    UserProxyMessage(
+                        intent=data.intent,
+                        content=data.message,
+                        source=data.context,
+                        request_id=request_id,
+                        stream=data.stream,
+                        priority=data.priority,
+                        deadline=time.time() + REQUEST_TIMEOUT,
+                    ),
+                    topic_id=DefaultTopicId(type="default", source=data.context),
+                )
+            except BaseException:
+                self.requests.discard(request_id)
+                raise
+
+            if data.stream:
+                return CorrelatedStreamingResponse(
+                    self.stream_events(request_id),
+                    self.requests,
+                    request_id,
+                    media_type="text/event-stream",
+                )
 
             # Wait for the response
             try:
-                response: (
-                    WorkerAgentMessage | TerminationMessage
-                ) = await asyncio.wait_for(
-                    self.contexts[data.context],
-                    timeout=30,
-                )
+                with self.metrics.time(self.wait_time["wait"]):
+                    response: (
+                        WorkerAgentMessage | TerminationMessage
+                    ) = await self.requests.wait(request_id, timeout=REQUEST_TIMEOUT)
             except asyncio.TimeoutError:
                 raise HTTPException(status_code=500, detail="Internal server error")
 
@@ -133,25 +259,51 @@ class Proxy:
                 if response.reason == TerminationMessage.REASON_NO_AGENT_FOUND:
                     raise HTTPException(status_code=404, detail="No agent found")
 
-            return asdict(response)
+            return response.to_dict()
+
+    async def stream_events(self, request_id: str) -> AsyncIterator[str]:
+        """Forward the chunks of a streamed answer as Server-Sent Events."""
+        with self.metrics.time(self.wait_time["stream"]):
+            try:
+                async for message in self.requests.stream(
+                    request_id, timeout=REQUEST_TIMEOUT
+                ):
+                    if isinstance(message, WorkerAgentChunk):
+                        yield sse_event("chunk", message.to_dict())
+                    elif isinstance(message, TerminationMessage):
+                        status = (
+                            404
+                            if message.reason
+                            == TerminationMessage.REASON_NO_AGENT_FOUND
+                            else 200
+                        )
+                        yield sse_event(
+                            "termination", {"status": status, **message.to_dict()}
+                        )
+                    else:
+                        yield sse_event("result", message.to_dict())
+            except asyncio.TimeoutError:
+                yield sse_event(
+                    "error", {"status": 500, "detail": "Internal server error"}
+                )
 
     async def run_workers(self):
-        self.agent_runtime: GrpcWorkerAgentRuntime = worker_agent_runtime()
-        await self.agent_runtime.start()
+        agent_runtime: GrpcWorkerAgentRuntime = worker_agent_runtime()
+        await agent_runtime.start()
+        await self.register_agents(agent_runtime)
+        add_message_serializers(agent_runtime)
 
-        serializer_proxy_message = try_get_known_serializers_for_type(UserProxyMessage)
-        serializer_final_result = try_get_known_serializers_for_type(FinalResult)
-        self.agent_runtime.add_message_serializer(
-            [serializer_proxy_message, serializer_final_result]
-        )
+    async def register_agents(self, runtime: AgentRuntime) -> None:
+        """Register the user proxy agents, requests are then published on `runtime`."""
+        self.agent_runtime = runtime
 
         # Create the User Proxy Agent
         await UserProxyAgent.register(
-            self.agent_runtime,
+            runtime,
             "user_proxy",
-            lambda: UserProxyAgent("user_proxy", self.contexts),
+            lambda: UserProxyAgent("user_proxy", self.requests, self.metrics),
         )
-        await self.agent_runtime.add_subscription(
+        await runtime.add_subscription(
             DefaultSubscription(topic_type="user_proxy", agent_type="user_proxy")
         )
 
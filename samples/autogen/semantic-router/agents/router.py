@@ -3,51 +3,82 @@
 
 import asyncio
 import logging
+import os
+import time
+from functools import partial
+from typing import Callable
 
 from autogen_core import (
     TRACE_LOGGER_NAME,
+    AgentRuntime,
     DefaultTopicId,
     MessageContext,
     RoutedAgent,
     default_subscription,
     message_handler,
-    try_get_known_serializers_for_type,
 )
 from autogen_ext.runtimes.grpc import GrpcWorkerAgentRuntime
-from common._agents import worker_agent_runtime
+from common._agents import push_metrics, worker_agent_runtime
+from common._batching import MicroBatcher
+from common._cached_registry import CachingAgentRegistry
+from common._embedding_classifier import EmbeddingIntentClassifier
+from common._intent_memo import MemoizingIntentClassifier
+from common._metrics import MetricsRegistry
+from common._routing_table import (
+    ReloadableAgentRegistry,
+    ReloadableIntentClassifier,
+    RoutingTable,
+    RoutingTableWatcher,
+    keyword_classifier,
+    load_routing_table,
+)
+from common._scheduling import DeadlineExceeded, PriorityScheduler
 from common._semantic_router_components import (
     AgentRegistryBase,
     IntentClassifierBase,
     TerminationMessage,
     UserProxyMessage,
+    WorkerLoadReport,
 )
+from common._serialization import add_message_serializers
+from common._sharding import DISPATCH_HASH, ShardDispatcher, parse_shards
 
-logging.basicConfig(level=logging.DEBUG)
+logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO").upper())
 logger = logging.getLogger(f"{TRACE_LOGGER_NAME}.semantic_router")
 
 
-class MockIntentClassifier(IntentClassifierBase):
-    def __init__(self):
-        self.intents = {
-            "finance_intent": ["finance", "money", "budget"],
-            "hr_intent": ["hr", "human resources", "employee"],
-        }
-
-    async def classify_intent(self, message: str) -> str:
-        for intent, keywords in self.intents.items():
-            for keyword in keywords:
-                if keyword in message:
-                    return intent
-        return "general"
+MOCK_ROUTING_TABLE = RoutingTable(
+    intents={
+        "finance_intent": ["finance", "money", "budget"],
+        "hr_intent": ["hr", "human resources", "employee"],
+    },
+    priorities={},
+    agents={"finance_intent": "finance", "hr_intent": "hr"},
+)
 
 
 class MockAgentRegistry(AgentRegistryBase):
     def __init__(self):
-        self.agents = {"finance_intent": "finance", "hr_intent": "hr"}
+        self.agents = dict(MOCK_ROUTING_TABLE.agents)
 
     async def get_agent(self, intent: str) -> str:
         return self.agents[intent]
 
+    async def get_agents(self, intents: list[str]) -> list[str | None]:
+        return [self.agents.get(intent) for intent in intents]
+
+
+async def resolve_agents(
+    intent_classifier: IntentClassifierBase,
+    agent_registry: AgentRegistryBase,
+    messages: list[UserProxyMessage],
+) -> list[str]:
+    """Classify and resolve a batch of messages, "termination" marks a miss."""
+    intents = await intent_classifier.classify_intents([m.intent for m in messages])
+    agents = await agent_registry.get_agents(intents)
+    logger.debug("Resolved batch of %d messages: %s", len(messages), agents)
+    return [agent or "termination" for agent in agents]
+
 
 @default_subscription
 class SemanticRouterAgent(RoutedAgent):
@@ -56,11 +87,33 @@ class SemanticRouterAgent(RoutedAgent):
         name: str,
         agent_registry: AgentRegistryBase,
         intent_classifier: IntentClassifierBase,
+        batcher: MicroBatcher[UserProxyMessage, str] | None = None,
+        dispatcher: ShardDispatcher | None = None,
+        metrics: MetricsRegistry | None = None,
+        scheduler: PriorityScheduler | None = None,
     ) -> None:
         super().__init__("Semantic Router Agent")
         self._name = name
         self._registry = agent_registry
         self._classifier = intent_classifier
+        self._batcher = batcher
+        self._dispatcher = dispatcher
+        self._metrics = metrics or MetricsRegistry()
+        self._scheduler = scheduler or PriorityScheduler()
+        self._stages = {
+            stage: self._metrics.histogram(
+                "semantic_router_stage_seconds",
+                "Time spent in each stage of routing a message.",
+                stage=stage,
+            )
+            for stage in (
+                "queue",
+                "identify_intent",
+                "find_agent",
+                "resolve_batch",
+                "contact_agent",
+            )
+        }
 
     # The User has sent a message that needs to be routed
     @message_handler
@@ -68,11 +121,38 @@ class SemanticRouterAgent(RoutedAgent):
         self, message: UserProxyMessage, ctx: MessageContext
     ) -> None:
         assert ctx.topic_id is not None
-        logger.debug(f"Received message from {message.source}: {message.content}")
+        logger.debug("Received message from %s: %s", message.source, message.content)
         session_id = ctx.topic_id.source
-        intent = await self._identify_intent(message)
-        agent = await self._find_agent(intent)
-        await self.contact_agent(agent, message, session_id)
+        queued_at = time.perf_counter()
+        try:
+            async with self._scheduler.slot(message.priority, message.deadline):
+                self._stages["queue"].record(time.perf_counter() - queued_at)
+                await self._route(message, session_id)
+        except DeadlineExceeded:
+            logger.debug("Dropping request %s: deadline exceeded", message.request_id)
+
+    async def _route(self, message: UserProxyMessage, session_id: str) -> None:
+        timer = self._metrics.time
+        if self._batcher is not None:
+            with timer(self._stages["resolve_batch"]):
+                agent = await self._batcher.submit(message)
+        else:
+            with timer(self._stages["identify_intent"]):
+                intent = await self._identify_intent(message)
+            with timer(self._stages["find_agent"]):
+                agent = await self._find_agent(intent)
+        # Classification may have taken long enough for the client to give up
+        self._scheduler.check_deadline(message.deadline)
+        with timer(self._stages["contact_agent"]):
+            await self.contact_agent(agent, message, session_id)
+
+    # A worker shard has reported how busy it is
+    @message_handler
+    async def on_load_report(
+        self, message: WorkerLoadReport, ctx: MessageContext
+    ) -> None:
+        if self._dispatcher is not None:
+            self._dispatcher.report_load(message.shard, message.queue_depth)
 
     ## Identify the intent of the user message
     async def _identify_intent(self, message: UserProxyMessage) -> str:
@@ -80,12 +160,12 @@ class SemanticRouterAgent(RoutedAgent):
 
     ## Use a lookup, search, or LLM to identify the most relevant agent for the intent
     async def _find_agent(self, intent: str) -> str:
-        logger.debug(f"Identified intent: {intent}")
+        logger.debug("Identified intent: %s", intent)
         try:
             agent = await self._registry.get_agent(intent)
             return agent
         except KeyError:
-            logger.debug("No relevant agent found for intent: " + intent)
+            logger.debug("No relevant agent found for intent: %s", intent)
             return "termination"
 
     ## Forward user message to the appropriate agent, or end the thread.
@@ -100,38 +180,163 @@ class SemanticRouterAgent(RoutedAgent):
                     intent=message.intent,
                     content=message.content,
                     source=self.type,
+                    request_id=message.request_id,
                 ),
                 DefaultTopicId(type="user_proxy", source=session_id),
             )
         else:
-            logger.debug("Routing to agent: " + agent)
+            if self._dispatcher is not None:
+                agent = self._dispatcher.topic_type(agent, session_id)
+            logger.debug("Routing to agent: %s", agent)
             await self.publish_message(
                 message,
                 DefaultTopicId(type=agent, source=session_id),
             )
 
 
-async def run_workers():
-    agent_runtime: GrpcWorkerAgentRuntime = worker_agent_runtime()
-    await agent_runtime.start()
+def intent_classifier_builder() -> Callable[[RoutingTable], IntentClassifierBase]:
+    """The classifier of a routing table selected by INTENT_CLASSIFIER.
 
-    serializer = try_get_known_serializers_for_type(TerminationMessage)
-    agent_runtime.add_message_serializer(serializer)
+    The embedding classifier uses the keywords of every intent as its exemplars.
+    """
+    kind = os.getenv("INTENT_CLASSIFIER", "keyword")
+    if kind == "keyword":
+        return keyword_classifier
+    if kind == "embedding":
+        threshold = float(os.getenv("INTENT_EMBEDDING_THRESHOLD", "0.3"))
+        return lambda table: EmbeddingIntentClassifier(
+            table.intents, threshold=threshold
+        )
+    raise ValueError(
+        f"Unknown INTENT_CLASSIFIER {kind!r}, expected 'keyword' or 'embedding'"
+    )
+
+
+async def register_router(
+    runtime: AgentRuntime, metrics: MetricsRegistry | None = None
+) -> MetricsRegistry:
+    """Register the semantic router agents, configured from the environment.
+
+    Returns the registry of the stage latencies of the router.
+    """
+    # Create the Semantic Router, from the ROUTING_TABLE file when there is one
+    build_classifier = intent_classifier_builder()
+    routing_table = os.getenv("ROUTING_TABLE")
+    if routing_table:
+        table = load_routing_table(routing_table)
+        reloadable_classifier = ReloadableIntentClassifier(build_classifier(table))
+        reloadable_registry = ReloadableAgentRegistry(table.agents)
+        agent_registry: AgentRegistryBase = reloadable_registry
+        intent_classifier: IntentClassifierBase = reloadable_classifier
+    else:
+        agent_registry = MockAgentRegistry()
+        intent_classifier = build_classifier(MOCK_ROUTING_TABLE)
+
+    memo_size = int(os.getenv("INTENT_MEMO_SIZE", "0"))
+    if memo_size > 0:
+        intent_classifier = MemoizingIntentClassifier(intent_classifier, memo_size)
+
+    cache_size = int(os.getenv("REGISTRY_CACHE_SIZE", "0"))
+    if cache_size > 0:
+        agent_registry = CachingAgentRegistry(
+            agent_registry,
+            capacity=cache_size,
+            ttl=float(os.getenv("REGISTRY_CACHE_TTL", "60")),
+            negative_ttl=float(os.getenv("REGISTRY_CACHE_NEGATIVE_TTL", "5")),
+        )
+
+    if routing_table:
+
+        def install(
+            table: RoutingTable, classifier: IntentClassifierBase
+        ) -> IntentClassifierBase:
+            previous = reloadable_classifier.swap(classifier)
+            reloadable_registry.swap(table.agents)
+            # Forget what was learned from the previous table
+            if isinstance(intent_classifier, MemoizingIntentClassifier):
+                intent_classifier.invalidate()
+            if isinstance(agent_registry, CachingAgentRegistry):
+                agent_registry.invalidate()
+            # Released by the watcher thread, away from the event loop
+            return previous
+
+        RoutingTableWatcher(
+            routing_table,
+            install,
+            interval=float(os.getenv("ROUTING_TABLE_POLL_INTERVAL", "2")),
+            build=build_classifier,
+        ).start()
+
+    # Router instances are created per session, so the batcher is shared by all of them
+    batcher = None
+    batch_size = int(os.getenv("ROUTER_BATCH_SIZE", "1"))
+    if batch_size > 1:
+        batcher = MicroBatcher(
+            partial(resolve_agents, intent_classifier, agent_registry),
+            max_batch_size=batch_size,
+            max_delay=float(os.getenv("ROUTER_BATCH_WINDOW_MS", "2")) / 1000,
+        )
+
+    # Sessions of sharded agent types are spread over the shards, e.g. AGENT_SHARDS=hr=2
+    dispatcher = None
+    shards = parse_shards(os.getenv("AGENT_SHARDS", ""))
+    if shards:
+        dispatcher = ShardDispatcher(
+            shards,
+            mode=os.getenv("ROUTER_DISPATCH", DISPATCH_HASH),
+            report_ttl=float(os.getenv("ROUTER_LOAD_REPORT_TTL", "10")),
+        )
+
+    # The stage latencies of all the router instances, exported by the proxy
+    metrics = metrics or MetricsRegistry()
+    if isinstance(agent_registry, CachingAgentRegistry):
+        metrics.gauges(
+            "semantic_router_registry_cache",
+            "Agent registry lookups cached by the router.",
+            agent_registry.gauges,
+        )
+        metrics.counters(
+            "semantic_router_registry_cache",
+            "Agent registry lookups of the router, by outcome.",
+            agent_registry.counters,
+        )
+
+    # Bounds the messages routed at once, the others wait by priority and deadline
+    scheduler = PriorityScheduler(int(os.getenv("ROUTER_MAX_CONCURRENCY", "256")))
 
-    # Create the Semantic Router
-    agent_registry = MockAgentRegistry()
-    intent_classifier = MockIntentClassifier()
     await SemanticRouterAgent.register(
-        agent_runtime,
+        runtime,
         "router",
         lambda: SemanticRouterAgent(
             name="router",
             agent_registry=agent_registry,
             intent_classifier=intent_classifier,
+            batcher=batcher,
+            dispatcher=dispatcher,
+            metrics=metrics,
+            scheduler=scheduler,
         ),
     )
+    return metrics
+
+
+async def run_workers():
+    agent_runtime: GrpcWorkerAgentRuntime = worker_agent_runtime()
+    await agent_runtime.start()
+
+    metrics = await register_router(agent_runtime)
+    add_message_serializers(agent_runtime)
+    metrics_push = asyncio.create_task(
+        push_metrics(
+            agent_runtime,
+            metrics,
+            "router",
+            float(os.getenv("METRICS_PUSH_INTERVAL", "5")),
+        )
+    )
 
     await agent_runtime.stop_when_signal()
+    metrics_push.cancel()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,72 @@
+# Copyright AGNTCY Contributors (https://github.com/agntcy)
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Latency benchmark of the nearest-centroid embedding classifier.
+
+Run from the semantic-router directory:
+
+    python -m benchmarks.bench_embedding_classifier
+"""
+
+import argparse
+import asyncio
+import random
+import string
+import time
+
+import numpy as np
+from common._embedding_classifier import EmbeddingIntentClassifier, HashingEmbedder
+
+
+def random_sentence(rng: random.Random, words: int = 6) -> str:
+    return " ".join(
+        "".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 9)))
+        for _ in range(words)
+    )
+
+
+async def measure(classifier, messages):
+    latencies = []
+    for message in messages:
+        start = time.perf_counter()
+        await classifier.classify_intent(message)
+        latencies.append(time.perf_counter() - start)
+    return np.array(latencies) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Embedding classifier benchmark.")
+    parser.add_argument(
+        "-n", "--intents", type=int, nargs="+", default=[10, 100, 1_000, 5_000]
+    )
+    parser.add_argument(
+        "--exemplars", type=int, default=5, help="Exemplars per intent."
+    )
+    parser.add_argument("--dim", type=int, default=256, help="Embedding size.")
+    parser.add_argument("--messages", type=int, default=2_000)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    embedder = HashingEmbedder(dim=args.dim)
+    messages = [random_sentence(rng) for _ in range(args.messages)]
+
+    print(f"{'intents':>8} {'build ms':>10} {'p50 us':>8} {'p99 us':>8} {'mean us':>8}")
+    for intent_count in args.intents:
+        exemplars = {
+            f"intent_{i}": [random_sentence(rng) for _ in range(args.exemplars)]
+            for i in range(intent_count)
+        }
+        start = time.perf_counter()
+        classifier = EmbeddingIntentClassifier(exemplars, embed=embedder)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        latencies = asyncio.run(measure(classifier, messages))
+        p50, p99 = np.percentile(latencies, [50, 99])
+        print(
+            f"{intent_count:>8} {build_ms:>10.1f} {p50:>8.1f} {p99:>8.1f} {latencies.mean():>8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
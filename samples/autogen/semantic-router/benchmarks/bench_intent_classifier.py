@@ -0,0 +1,125 @@
+# Copyright AGNTCY Contributors (https://github.com/agntcy)
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Microbenchmark comparing the compiled keyword matcher with the original
+per-intent, per-keyword `in` loop as the keyword table grows.
+
+Run from the semantic-router directory:
+
+    python -m benchmarks.bench_intent_classifier
+"""
+
+import argparse
+import random
+import string
+import time
+
+from common._keyword_classifier import KeywordMatcher
+
+
+def loop_classify(intents: dict[str, list[str]], message: str) -> str:
+    for intent, keywords in intents.items():
+        for keyword in keywords:
+            if keyword in message:
+                return intent
+    return "general"
+
+
+def make_intents(keyword_count: int, per_intent: int, rng: random.Random):
+    intents: dict[str, list[str]] = {}
+    for i in range(keyword_count):
+        keyword = "".join(rng.choices(string.ascii_lowercase, k=rng.randint(6, 12)))
+        intents.setdefault(f"intent_{i // per_intent}", []).append(keyword)
+    return intents
+
+
+def make_messages(intents, count: int, hit_ratio: float, rng: random.Random):
+    keywords = [k for kws in intents.values() for k in kws]
+    filler = ["please", "check", "my", "the", "for", "next", "quarter", "about"]
+    messages = []
+    for _ in range(count):
+        words = rng.choices(filler, k=8)
+        if rng.random() < hit_ratio:
+            words.insert(rng.randrange(len(words)), rng.choice(keywords))
+        messages.append(" ".join(words))
+    return messages
+
+
+def throughput(fn, messages, min_time: float) -> float:
+    done = 0
+    start = time.perf_counter()
+    elapsed = 0.0
+    while elapsed < min_time:
+        for message in messages:
+            fn(message)
+        done += len(messages)
+        elapsed = time.perf_counter() - start
+    return done / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Keyword classifier microbenchmark.")
+    parser.add_argument(
+        "-k",
+        "--keywords",
+        type=int,
+        nargs="+",
+        default=[10, 100, 1_000, 10_000, 100_000],
+        help="Keyword table sizes to benchmark.",
+    )
+    parser.add_argument(
+        "--per-intent", type=int, default=5, help="Keywords per intent."
+    )
+    parser.add_argument(
+        "--intents",
+        type=int,
+        default=2,
+        help="Intents sharing all the keywords in the second run, like routing_table.yaml.",
+    )
+    parser.add_argument("--messages", type=int, default=200, help="Distinct messages.")
+    parser.add_argument(
+        "--hit-ratio", type=float, default=0.5, help="Share of messages with a keyword."
+    )
+    parser.add_argument(
+        "--min-time", type=float, default=0.5, help="Seconds per measurement."
+    )
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    layouts = [
+        (f"{args.per_intent} keywords per intent", lambda count: args.per_intent),
+        # A few intents with many keywords each
+        (f"{args.intents} intents", lambda count: -(-count // args.intents)),
+    ]
+    for title, per_intent in layouts:
+        print(title)
+        print(
+            f"{'keywords':>10} {'build ms':>10} {'loop msg/s':>14} {'compiled msg/s':>16} {'speedup':>9}"
+        )
+        for keyword_count in args.keywords:
+            intents = make_intents(keyword_count, per_intent(keyword_count), rng)
+            messages = make_messages(intents, args.messages, args.hit_ratio, rng)
+
+            start = time.perf_counter()
+            matcher = KeywordMatcher(intents, ignore_case=False)
+            build_ms = (time.perf_counter() - start) * 1000
+
+            for message in messages:
+                assert (matcher.match(message) or "general") == loop_classify(
+                    intents, message
+                )
+
+            loop_rate = throughput(
+                lambda m: loop_classify(intents, m), messages, args.min_time
+            )
+            compiled_rate = throughput(matcher.match, messages, args.min_time)
+            print(
+                f"{keyword_count:>10} {build_ms:>10.1f} {loop_rate:>14,.0f} "
+                f"{compiled_rate:>16,.0f} {compiled_rate / loop_rate:>8.1f}x"
+            )
+        print()
+
+
+if __name__ == "__main__":
+    main()
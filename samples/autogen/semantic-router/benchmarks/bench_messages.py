@@ -0,0 +1,99 @@
+# Copyright AGNTCY Contributors (https://github.com/agntcy)
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Memory footprint, construction and conversion time of the message classes.
+
+Compares the slotted, frozen messages with the plain dataclasses they
+replaced, and `to_dict` with `dataclasses.asdict`.
+
+Run from the semantic-router directory:
+
+    python -m benchmarks.bench_messages
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+
+from common._semantic_router_components import WorkerAgentMessage
+
+
+@dataclass(kw_only=True)
+class PlainBaseMessage:
+    source: str
+
+
+@dataclass
+class PlainWorkerAgentMessage(PlainBaseMessage):
+    agent_type: str
+    agent_id: str
+    agent_instance: str
+    question: str
+    answer: str
+    request_id: str = field(default="", kw_only=True)
+    chunks: int = field(default=0, kw_only=True)
+
+
+FIELDS = {
+    "agent_type": "hr",
+    "agent_id": "session-42",
+    "agent_instance": "0x7f3a2c1b0d90",
+    "question": "How do I request vacation days?",
+    "answer": "Through the HR portal.",
+    "source": "hr",
+    "request_id": "5f0c8b1d2e3a4b6c9d7e8f0a1b2c3d4e",
+    "chunks": 3,
+}
+
+
+def footprint(cls, count: int) -> float:
+    """Bytes per message."""
+    gc.collect()
+    tracemalloc.start()
+    messages = [cls(**FIELDS) for _ in range(count)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # The list itself holds one pointer per message
+    return (size - 8 * len(messages)) / count
+
+
+def construct(cls, count: int) -> float:
+    """Microseconds per construction."""
+    start = time.perf_counter()
+    for _ in range(count):
+        cls(**FIELDS)
+    return (time.perf_counter() - start) / count * 1e6
+
+
+def convert(convert_one, message, count: int) -> float:
+    """Microseconds per conversion."""
+    start = time.perf_counter()
+    for _ in range(count):
+        convert_one(message)
+    return (time.perf_counter() - start) / count * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Message class benchmark.")
+    parser.add_argument("-n", "--messages", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    print(f"{'class':<34} {'bytes/msg':>10} {'new us':>8} {'to dict us':>11}")
+    rows = [
+        (PlainWorkerAgentMessage, asdict, "asdict"),
+        (WorkerAgentMessage, asdict, "asdict"),
+        (WorkerAgentMessage, WorkerAgentMessage.to_dict, "to_dict"),
+    ]
+    for cls, convert_one, conversion in rows:
+        size = footprint(cls, args.messages)
+        new = construct(cls, args.messages)
+        to_dict = convert(convert_one, cls(**FIELDS), args.messages)
+        name = f"{cls.__name__} ({conversion})"
+        print(f"{name:<34} {size:>10.1f} {new:>8.3f} {to_dict:>11.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+# Copyright AGNTCY Contributors (https://github.com/agntcy)
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Classification latency on the event loop while a large routing table reloads.
+
+Classifies messages in a loop, first undisturbed and then while the routing
+table watcher rebuilds a table of many keywords in its background thread,
+and compares with rebuilding the same table on the event loop itself.
+
+Run from the semantic-router directory:
+
+    python -m benchmarks.bench_routing_reload
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import string
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+from common._keyword_classifier import KeywordIntentClassifier
+from common._routing_table import (
+    ReloadableIntentClassifier,
+    RoutingTableWatcher,
+    load_routing_table,
+)
+
+
+def random_word(rng: random.Random) -> str:
+    return "".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 10)))
+
+
+def write_table(path: Path, rng: random.Random, keywords: int, intents: int) -> None:
+    table = {
+        f"intent_{i}": {
+            "agent": f"agent_{i}",
+            "keywords": [random_word(rng) for _ in range(keywords // intents)],
+        }
+        for i in range(intents)
+    }
+    path.write_text(json.dumps({"intents": table}))
+
+
+async def classify_until(classifier, messages, done: asyncio.Event) -> np.ndarray:
+    latencies = []
+    while not done.is_set():
+        for message in messages:
+            start = time.perf_counter()
+            await classifier.classify_intent(message)
+            # Let the other tasks run, as the router does between messages
+            await asyncio.sleep(0)
+            latencies.append(time.perf_counter() - start)
+    return np.array(latencies) * 1e6
+
+
+def report(name: str, latencies: np.ndarray, elapsed: float) -> None:
+    p50, p99, p999 = np.percentile(latencies, [50, 99, 99.9])
+    print(
+        f"{name:<22} {elapsed * 1000:>9.0f} {p50:>8.1f} {p99:>8.1f} "
+        f"{p999:>9.1f} {latencies.max():>9.0f}"
+    )
+
+
+async def run(path: Path, rng: random.Random, args) -> None:
+    table = load_routing_table(path)
+    classifier = ReloadableIntentClassifier(
+        KeywordIntentClassifier(table.intents, table.priorities)
+    )
+    messages = [" ".join(random_word(rng) for _ in range(8)) for _ in range(100)]
+    print(
+        f"{'scenario':<22} {'time ms':>9} {'p50 us':>8} {'p99 us':>8} {'p999 us':>9} {'max us':>9}"
+    )
+
+    done = asyncio.Event()
+    asyncio.get_running_loop().call_later(1.0, done.set)
+    report("idle", await classify_until(classifier, messages, done), 1.0)
+
+    # Rebuild in the watcher thread, the loop keeps classifying
+    released = asyncio.Event()
+    start = time.perf_counter()
+
+    def install(_, new):
+        # Measure until the watcher has released the replaced classifier too
+        asyncio.get_running_loop().call_later(0.1, released.set)
+        return classifier.swap(new)
+
+    watcher = RoutingTableWatcher(path, install, interval=0.01)
+    watcher.start()
+    write_table(path, rng, args.keywords, args.intents)
+    latencies = await classify_until(classifier, messages, released)
+    watcher.stop()
+    report("reload in thread", latencies, time.perf_counter() - start)
+
+    # Rebuild on the event loop, nothing else runs meanwhile
+    write_table(path, rng, args.keywords, args.intents)
+    done = asyncio.Event()
+
+    async def rebuild():
+        await asyncio.sleep(0.01)
+        new_table = load_routing_table(path)
+        classifier.swap(
+            KeywordIntentClassifier(new_table.intents, new_table.priorities)
+        )
+        done.set()
+
+    start = time.perf_counter()
+    task = asyncio.create_task(rebuild())
+    latencies = await classify_until(classifier, messages, done)
+    await task
+    report("reload on event loop", latencies, time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Routing table reload benchmark.")
+    parser.add_argument("-k", "--keywords", type=int, default=100_000)
+    parser.add_argument("--intents", type=int, default=1_000)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "routing_table.json"
+        write_table(path, rng, args.keywords, args.intents)
+        asyncio.run(run(path, rng, args))
+
+
+if __name__ == "__main__":
+    main()
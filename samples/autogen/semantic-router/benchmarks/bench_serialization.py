@@ -0,0 +1,99 @@
+# Copyright AGNTCY Contributors (https://github.com/agntcy)
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Bytes on the wire and encode/decode time of the message serializers.
+
+Compares the default JSON dataclass serializer with the compact msgpack
+serializer, with and without zstd compression.
+
+Run from the semantic-router directory:
+
+    python -m benchmarks.bench_serialization
+"""
+
+import argparse
+import time
+
+from autogen_core import try_get_known_serializers_for_type
+from common._semantic_router_components import (
+    TerminationMessage,
+    UserProxyMessage,
+    WorkerAgentMessage,
+)
+from common._serialization import CompactMessageSerializer
+
+ANSWER = (
+    "Vacation requests are approved by your manager in the HR portal. "
+    "Remember to submit them at least two weeks in advance. "
+)
+
+
+def messages(answer_words: int) -> dict[str, object]:
+    answer = " ".join((ANSWER * (answer_words // 20 + 1)).split()[:answer_words])
+    return {
+        "UserProxyMessage": UserProxyMessage(
+            content="How do I request vacation days?",
+            intent="hr",
+            source="user_proxy",
+            request_id="5f0c8b1d2e3a4b6c9d7e8f0a1b2c3d4e",
+        ),
+        "TerminationMessage": TerminationMessage(
+            reason=TerminationMessage.REASON_NO_AGENT_FOUND,
+            content="What is the weather like?",
+            intent="weather",
+            source="router",
+            request_id="5f0c8b1d2e3a4b6c9d7e8f0a1b2c3d4e",
+        ),
+        f"WorkerAgentMessage ({answer_words} words)": WorkerAgentMessage(
+            agent_type="hr",
+            agent_id="session-42",
+            agent_instance="0x7f3a2c1b0d90",
+            question="How do I request vacation days?",
+            answer=answer,
+            source="hr",
+            request_id="5f0c8b1d2e3a4b6c9d7e8f0a1b2c3d4e",
+        ),
+    }
+
+
+def measure(serializer, message, rounds: int) -> tuple[int, float, float]:
+    payload = serializer.serialize(message)
+    start = time.perf_counter()
+    for _ in range(rounds):
+        serializer.serialize(message)
+    encode = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(rounds):
+        serializer.deserialize(payload)
+    decode = time.perf_counter() - start
+    return len(payload), encode / rounds * 1e6, decode / rounds * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Message serializer benchmark.")
+    parser.add_argument("--answer-words", type=int, nargs="+", default=[20, 200, 2_000])
+    parser.add_argument("--rounds", type=int, default=20_000)
+    parser.add_argument("--threshold", type=int, default=1024, help="zstd threshold.")
+    args = parser.parse_args()
+
+    print(
+        f"{'message':<34} {'serializer':<12} {'bytes':>7} {'encode us':>10} {'decode us':>10}"
+    )
+    for answer_words in args.answer_words:
+        for name, message in messages(answer_words).items():
+            cls = type(message)
+            serializers = {
+                "json": try_get_known_serializers_for_type(cls)[0],
+                "msgpack": CompactMessageSerializer(cls, compress_threshold=0),
+                "msgpack+zstd": CompactMessageSerializer(cls, args.threshold),
+            }
+            for serializer_name, serializer in serializers.items():
+                size, encode, decode = measure(serializer, message, args.rounds)
+                print(
+                    f"{name:<34} {serializer_name:<12} {size:>7} {encode:>10.2f} {decode:>10.2f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+# Copyright AGNTCY Contributors (https://github.com/agntcy)
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+End-to-end latency of the single-node topology compared with the gRPC one.
+
+Starts the local stack in each mode in turn, with a fake LLM, and drives it
+with the load generator at a few concurrency levels.
+
+Run from the semantic-router directory:
+
+    python -m benchmarks.bench_topology
+"""
+
+import argparse
+import asyncio
+
+from benchmarks import load_test
+from benchmarks.local_stack import MODE_GRPC, MODE_SINGLE_NODE, LocalStack
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Topology benchmark.")
+    parser.add_argument(
+        "--modes", nargs="+", default=[MODE_GRPC, MODE_SINGLE_NODE], help="Topologies."
+    )
+    parser.add_argument("-c", "--concurrency", type=int, nargs="+", default=[1, 16, 64])
+    parser.add_argument("-d", "--duration", type=float, default=10.0)
+    parser.add_argument("--token-delay-ms", type=float, default=0.0)
+    args = parser.parse_args()
+
+    print(
+        f"{'mode':<12} {'users':>6} {'rps':>8} {'p50 ms':>8} {'p99 ms':>8} {'errors':>7}"
+    )
+    for mode in args.modes:
+        with LocalStack(token_delay_ms=args.token_delay_ms, mode=mode):
+            for concurrency in args.concurrency:
+                run_args = load_test.parser().parse_args(
+                    ["-c", str(concurrency), "-d", str(args.duration)]
+                )
+                summary = asyncio.run(load_test.run(run_args))
+                latency = summary["latency_ms"]
+                print(
+                    f"{mode:<12} {concurrency:>6} {summary['throughput_rps']:>8.1f} "
+                    f"{latency['p50']:>8.2f} {latency['p99']:>8.2f} "
+                    f"{summary['error_rate']:>7.2%}"
+                )
+
+
+if __name__ == "__main__":
+    main()
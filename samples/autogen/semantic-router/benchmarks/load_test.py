@@ -0,0 +1,240 @@
+# Copyright AGNTCY Contributors (https://github.com/agntcy)
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Load generator for the semantic router proxy.
+
+Drives POST /message either at a fixed concurrency (closed loop) or at a
+target request rate (open loop), spread over many contexts and intents,
+and reports latency percentiles and error rates.
+
+Run from the semantic-router directory, against a running proxy:
+
+    python -m benchmarks.load_test --concurrency 32 --duration 30
+
+or against a local stack of processes with a fake LLM:
+
+    python -m benchmarks.load_test --local --rps 200 --duration 30
+"""
+
+import argparse
+import asyncio
+import csv
+import itertools
+import json
+import random
+import time
+from dataclasses import asdict, dataclass
+
+import httpx
+import numpy as np
+
+PERCENTILES = {"p50": 50, "p90": 90, "p99": 99, "p999": 99.9}
+
+
+@dataclass
+class Sample:
+    start: float
+    latency: float
+    status: int
+    intent: str
+    error: str = ""
+
+
+def is_error(sample: Sample) -> bool:
+    # 404 is the expected answer for intents without an agent
+    return sample.status == 0 or sample.status >= 500 or sample.status == 429
+
+
+class LoadGenerator:
+    """Send requests to the proxy and record one Sample per request.
+
+    Args:
+        url (str): The base URL of the proxy.
+        contexts (int): The number of distinct conversation contexts.
+        intents (list[str]): The intents to pick from at random.
+        timeout (float): The client-side timeout of a request in seconds.
+        max_connections (int): The size of the client connection pool.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        contexts: int,
+        intents: list[str],
+        timeout: float = 35.0,
+        max_connections: int = 256,
+    ) -> None:
+        self.url = f"{url.rstrip('/')}/message"
+        self.contexts = contexts
+        self.intents = intents
+        self.samples: list[Sample] = []
+        self._client = httpx.AsyncClient(
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+        )
+        self._sequence = itertools.count()
+        self._rng = random.Random(42)
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+    async def send(self, scheduled: float | None = None) -> None:
+        """Send one request, latency counts from `scheduled` when given."""
+        n = next(self._sequence)
+        intent = self._rng.choice(self.intents)
+        payload = {
+            "intent": intent,
+            "message": f"load test message {n}",
+            "context": f"load-{n % self.contexts}",
+        }
+        start = time.perf_counter()
+        try:
+            response = await self._client.post(self.url, json=payload)
+            status, error = response.status_code, ""
+        except httpx.HTTPError as e:
+            status, error = 0, type(e).__name__
+        end = time.perf_counter()
+
+        origin = scheduled if scheduled is not None else start
+        self.samples.append(Sample(origin, end - origin, status, intent, error))
+
+    async def closed_loop(self, concurrency: int, duration: float) -> None:
+        deadline = time.perf_counter() + duration
+
+        async def user():
+            while time.perf_counter() < deadline:
+                await self.send()
+
+        await asyncio.gather(*(user() for _ in range(concurrency)))
+
+    async def open_loop(self, rps: float, duration: float) -> None:
+        # Requests are sent on schedule even if earlier ones are still pending,
+        # and their latency includes any delay in sending them.
+        start = time.perf_counter()
+        tasks = []
+        for i in range(int(rps * duration)):
+            scheduled = start + i / rps
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.create_task(self.send(scheduled)))
+        await asyncio.gather(*tasks)
+
+
+def summarize(samples: list[Sample], elapsed: float) -> dict:
+    latencies_ms = np.array([s.latency for s in samples]) * 1000
+    errors = [s for s in samples if is_error(s)]
+    statuses: dict[str, int] = {}
+    for s in samples:
+        statuses[str(s.status)] = statuses.get(str(s.status), 0) + 1
+
+    summary = {
+        "requests": len(samples),
+        "duration_s": elapsed,
+        "throughput_rps": len(samples) / elapsed if elapsed else 0.0,
+        "error_rate": len(errors) / len(samples) if samples else 0.0,
+        "statuses": statuses,
+        "latency_ms": {},
+    }
+    if samples:
+        values = np.percentile(latencies_ms, list(PERCENTILES.values()))
+        summary["latency_ms"] = {
+            "mean": float(latencies_ms.mean()),
+            "max": float(latencies_ms.max()),
+            **{name: float(v) for name, v in zip(PERCENTILES, values)},
+        }
+    return summary
+
+
+async def run(args) -> dict:
+    generator = LoadGenerator(args.url, args.contexts, args.intents)
+    try:
+        if args.warmup:
+            await generator.closed_loop(min(args.concurrency or 8, 8), args.warmup)
+            generator.samples.clear()
+
+        start = time.perf_counter()
+        if args.rps:
+            await generator.open_loop(args.rps, args.duration)
+        else:
+            await generator.closed_loop(args.concurrency, args.duration)
+        elapsed = time.perf_counter() - start
+    finally:
+        await generator.close()
+
+    if args.csv:
+        with open(args.csv, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(Sample.__dataclass_fields__))
+            writer.writeheader()
+            writer.writerows(asdict(s) for s in generator.samples)
+
+    return summarize(generator.samples, elapsed)
+
+
+def parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Load test the semantic router proxy.")
+    parser.add_argument(
+        "--url", default="http://localhost:8000", help="Proxy base URL."
+    )
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument(
+        "-c", "--concurrency", type=int, default=16, help="Concurrent users."
+    )
+    mode.add_argument("-r", "--rps", type=float, help="Target requests per second.")
+    parser.add_argument(
+        "-d", "--duration", type=float, default=10.0, help="Seconds of load."
+    )
+    parser.add_argument("--warmup", type=float, default=2.0, help="Seconds of warmup.")
+    parser.add_argument("--contexts", type=int, default=100, help="Distinct contexts.")
+    parser.add_argument(
+        "--intents",
+        nargs="+",
+        default=["hr", "budget", "employee", "money", "unknown"],
+        help="Intents to pick from.",
+    )
+    parser.add_argument(
+        "-o", "--output", help="Write the summary as JSON to this file."
+    )
+    parser.add_argument("--csv", help="Write every request as CSV to this file.")
+    parser.add_argument(
+        "--local", action="store_true", help="Start the local stack with a fake LLM."
+    )
+    parser.add_argument(
+        "--token-delay-ms", type=float, default=0.0, help="Fake LLM token delay."
+    )
+    parser.add_argument(
+        "--mode",
+        choices=["grpc", "single_node"],
+        default="grpc",
+        help="Topology of the local stack.",
+    )
+    return parser
+
+
+def main():
+    args = parser().parse_args()
+    if args.rps:
+        args.concurrency = None
+
+    if args.local:
+        from benchmarks.local_stack import LocalStack
+
+        with LocalStack(
+            token_delay_ms=args.token_delay_ms, proxy_url=args.url, mode=args.mode
+        ):
+            summary = asyncio.run(run(args))
+    else:
+        summary = asyncio.run(run(args))
+
+    print(json.dumps(summary, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(summary, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+# Copyright AGNTCY Contributors (https://github.com/agntcy)
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Run the host, router, workers and proxy as local processes with a fake LLM.
+
+Run from the semantic-router directory:
+
+    python -m benchmarks.local_stack
+"""
+
+import argparse
+import os
+import signal
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import IO
+
+import httpx
+
+ROOT = Path(__file__).resolve().parent.parent
+
+GRPC_MODULES = ["agents.router", "agents.hr", "agents.finance", "agents.proxy"]
+
+# All the agents in one process on an in-memory runtime, or one process each
+# talking through the gRPC host
+MODE_SINGLE_NODE = "single_node"
+MODE_GRPC = "grpc"
+
+
+class LocalStack:
+    """Start the semantic router processes on entry and stop them on exit.
+
+    Args:
+        env (dict[str, str] | None): Extra environment variables of the processes.
+        log_dir (Path): Where the output of each process is written.
+        proxy_url (str): The proxy URL polled until the stack is ready.
+        token_delay_ms (float): Delay between the tokens of the fake LLM.
+        mode (str): Either "grpc" or "single_node".
+    """
+
+    def __init__(
+        self,
+        env: dict[str, str] | None = None,
+        log_dir: Path = ROOT / ".local",
+        proxy_url: str = "http://localhost:8000",
+        token_delay_ms: float = 0.0,
+        mode: str = MODE_GRPC,
+    ) -> None:
+        if mode not in (MODE_GRPC, MODE_SINGLE_NODE):
+            raise ValueError(f"Unknown mode: {mode}")
+        self.env = {
+            k: v for k, v in os.environ.items() if not k.startswith("AZURE_OPENAI")
+        }
+        self.env.update(
+            {
+                "FAKE_LLM_TOKEN_DELAY_MS": str(token_delay_ms),
+                "LOG_LEVEL": "WARNING",
+                **(env or {}),
+            }
+        )
+        self.log_dir = log_dir
+        self.proxy_url = proxy_url
+        self.mode = mode
+        self.processes: list[subprocess.Popen] = []
+        self.logs: list[IO[str]] = []
+
+    def _spawn(self, module: str) -> None:
+        log = open(self.log_dir / f"{module}.log", "w")
+        self.logs.append(log)
+        self.processes.append(
+            subprocess.Popen(
+                [sys.executable, "-m", module],
+                cwd=ROOT,
+                env=self.env,
+                stdout=log,
+                stderr=subprocess.STDOUT,
+            )
+        )
+
+    def start(self, timeout: float = 60.0) -> None:
+        self.log_dir.mkdir(exist_ok=True)
+        if self.mode == MODE_SINGLE_NODE:
+            self._spawn("runtime.single_node")
+        else:
+            self._spawn("runtime.host")
+            time.sleep(1)
+            for module in GRPC_MODULES:
+                self._spawn(module)
+        self.wait_ready(timeout)
+
+    def wait_ready(self, timeout: float) -> None:
+        deadline = time.monotonic() + timeout
+        delay = 0.1
+        while time.monotonic() < deadline:
+            if any(p.poll() is not None for p in self.processes):
+                raise RuntimeError(
+                    f"A process exited early, see the logs in {self.log_dir}"
+                )
+            try:
+                if httpx.get(f"{self.proxy_url}/healthz").status_code == 200:
+                    # The agents register with the host after the proxy starts serving
+                    time.sleep(2)
+                    return
+            except httpx.HTTPError:
+                pass
+            time.sleep(delay)
+            delay = min(delay * 2, 2.0)
+        raise TimeoutError(f"Proxy not ready after {timeout} seconds")
+
+    def stop(self) -> None:
+        for process in reversed(self.processes):
+            process.send_signal(signal.SIGINT)
+        for process in reversed(self.processes):
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        self.processes.clear()
+        for log in self.logs:
+            log.close()
+        self.logs.clear()
+
+    def __enter__(self) -> "LocalStack":
+        try:
+            self.start()
+        except BaseException:
+            self.stop()
+            raise
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the semantic router locally.")
+    parser.add_argument(
+        "--token-delay-ms", type=float, default=0.0, help="Fake LLM token delay."
+    )
+    parser.add_argument(
+        "--mode",
+        choices=[MODE_GRPC, MODE_SINGLE_NODE],
+        default=MODE_GRPC,
+        help="Topology.",
+    )
+    args = parser.parse_args()
+
+    with LocalStack(token_delay_ms=args.token_delay_ms, mode=args.mode):
+        print("Semantic router running on http://localhost:8000, press Ctrl+C to stop.")
+        try:
+            signal.pause()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
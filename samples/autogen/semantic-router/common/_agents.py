@@ -1,26 +1,39 @@
 # Copyright AGNTCY Contributors (https://github.com/agntcy)
 # SPDX-License-Identifier: Apache-2.0
 
+import asyncio
+import contextlib
+import functools
 import json
 import logging
 import os
+import socket
+import time
 
 from autogen_core import (
     TRACE_LOGGER_NAME,
+    AgentRuntime,
+    DefaultSubscription,
     DefaultTopicId,
     MessageContext,
     RoutedAgent,
     message_handler,
 )
 from autogen_ext.runtimes.grpc import GrpcWorkerAgentRuntime
+from common._llm import ChatBackend, chat_backend
+from common._metrics import MetricsRegistry
 from common._semantic_router_components import (
+    MetricsSnapshot,
     TerminationMessage,
     UserProxyMessage,
+    WorkerAgentChunk,
     WorkerAgentMessage,
+    WorkerLoadReport,
 )
-from openai import AzureOpenAI
+from common._session_history import SessionHistoryStore, excerpt_summarizer
+from common._sharding import shard_agent_type
 
-logging.basicConfig(level=logging.DEBUG)
+logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO").upper())
 logger = logging.getLogger(f"{TRACE_LOGGER_NAME}.workers")
 
 
@@ -51,38 +64,77 @@ def worker_agent_runtime() -> GrpcWorkerAgentRuntime:
     )
 
 
+@functools.cache
+def session_history(name: str) -> SessionHistoryStore:
+    """The conversations of all the sessions served by the `name` agents of this process."""
+    idle_ttl = float(os.getenv("HISTORY_IDLE_TTL", "1800"))
+    token_budget = int(os.getenv("HISTORY_TOKEN_BUDGET", "2000"))
+    summary_budget = int(os.getenv("HISTORY_SUMMARY_TOKENS", str(token_budget // 4)))
+    return SessionHistoryStore(
+        system_prompt="You are an export HR assistant!",
+        token_budget=token_budget,
+        max_sessions=int(os.getenv("HISTORY_MAX_SESSIONS", "1000")),
+        idle_ttl=idle_ttl if idle_ttl > 0 else None,
+        summarizer=excerpt_summarizer if summary_budget > 0 else None,
+        summary_budget=summary_budget,
+    )
+
+
 class WorkerAgent(RoutedAgent):
-    def __init__(self, name: str) -> None:
+    # Messages being handled by the worker agents of this process
+    in_flight = 0
+
+    def __init__(self, name: str, history: SessionHistoryStore | None = None) -> None:
         super().__init__("A Worker Agent")
         self._name = name
 
-        self.reset_conversation()
+        self.history = history if history is not None else session_history(name)
 
-        self.client: AzureOpenAI | None = None
-
-        # Initiate openai session
-        if os.getenv("AZURE_OPENAI_API_KEY"):
-            self.client = AzureOpenAI(
-                api_key=os.getenv("AZURE_OPENAI_API_KEY"),
-                api_version=os.getenv("AZURE_OPENAI_API_VERSION"),
-                azure_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT"),
-            )
-        else:
-            logger.warning("AZURE_OPENAI_API_KEY not found. Using default key.")
+        self.llm: ChatBackend = chat_backend(name)
 
-    def reset_conversation(self):
-        self.messages = [
-            {"role": "system", "content": "You are an export HR assistant!"}
-        ]
+    async def _stream_answer(
+        self,
+        message: UserProxyMessage,
+        ctx: MessageContext,
+        prompt: list[dict[str, str]],
+    ) -> list[str]:
+        assert ctx.topic_id is not None
+        topic_id = DefaultTopicId(type="user_proxy", source=ctx.topic_id.source)
+        parts = []
+        # Closed right away if the request is aborted, giving back the LLM slot
+        async with contextlib.aclosing(self.llm.stream(prompt)) as deltas:
+            async for delta in deltas:
+                await self.publish_message(
+                    WorkerAgentChunk(
+                        agent_type=self.type,
+                        index=len(parts),
+                        delta=delta,
+                        source=ctx.topic_id.type,
+                        request_id=message.request_id,
+                    ),
+                    topic_id=topic_id,
+                )
+                parts.append(delta)
+        return parts
 
     @message_handler
     async def my_message_handler(
         self, message: UserProxyMessage, ctx: MessageContext
+    ) -> None:
+        WorkerAgent.in_flight += 1
+        try:
+            await self._handle_message(message, ctx)
+        finally:
+            WorkerAgent.in_flight -= 1
+
+    async def _handle_message(
+        self, message: UserProxyMessage, ctx: MessageContext
     ) -> None:
         assert ctx.topic_id is not None
-        logger.debug(f"Received message from {message.source}: {message.content}")
+        logger.debug("Received message from %s: %s", message.source, message.content)
+        session_id = ctx.topic_id.source
         if "END" in message.content:
-            self.reset_conversation()
+            self.history.reset(session_id)
 
             await self.publish_message(
                 TerminationMessage(
@@ -90,25 +142,40 @@ class WorkerAgent(RoutedAgent):
                     content=message.content,
                     intent=message.intent,
                     source=self.type,
+                    request_id=message.request_id,
                 ),
                 topic_id=DefaultTopicId(type="user_proxy", source=ctx.topic_id.source),
             )
         else:
-            # Add message to the list
-            self.messages.append({"role": "user", "content": message.content})
-
-            answer = ""
-
-            # LLM Call
-            if self.client:
-                response = self.client.chat.completions.create(
-                    model=os.getenv("AZURE_OPENAI_DEPLOYMENT_NAME"),
-                    messages=self.messages,
+            timeout = message.deadline - time.time() if message.deadline else None
+            if timeout is not None and timeout <= 0:
+                logger.debug(
+                    "Dropping request %s: deadline exceeded", message.request_id
                 )
-
-                answer = response.choices[0].message.content
-            else:
-                answer = f"I am an expert {self._name} assistant!"
+                return
+
+            # The turn joins the session history once it has been answered, an
+            # aborted request leaves no unanswered question behind
+            prompt = [
+                *self.history.messages(session_id),
+                {"role": "user", "content": message.content},
+            ]
+
+            # LLM Call, cancelled when the client stops waiting for the answer
+            try:
+                async with asyncio.timeout(timeout):
+                    if message.stream:
+                        parts = await self._stream_answer(message, ctx, prompt)
+                        answer, chunks = "".join(parts), len(parts)
+                    else:
+                        answer, chunks = await self.llm.complete(prompt), 0
+            except TimeoutError:
+                logger.debug(
+                    "Aborted request %s: deadline exceeded", message.request_id
+                )
+                return
+            self.history.append(session_id, "user", message.content)
+            self.history.append(session_id, "assistant", answer)
 
             ret = WorkerAgentMessage(
                 agent_type=self.type,
@@ -117,9 +184,11 @@ class WorkerAgent(RoutedAgent):
                 question=message.content,
                 answer=answer,
                 source=ctx.topic_id.type,
+                request_id=message.request_id,
+                chunks=chunks,
             )
 
-            logger.debug(f"Returning message: {ret}")
+            logger.debug("Returning message: %s", ret)
             await self.publish_message(
                 ret,
                 topic_id=DefaultTopicId(
@@ -127,3 +196,51 @@ class WorkerAgent(RoutedAgent):
                     source=ctx.topic_id.source,
                 ),
             )
+
+
+async def register_worker_agents(
+    runtime: AgentRuntime, agent_type: str, name: str, shard: int | None = None
+) -> str:
+    """Register the worker agents of an agent type, or of one shard of it.
+
+    Returns the agent and topic type served by the registered agents.
+    """
+    served_type = agent_type if shard is None else shard_agent_type(agent_type, shard)
+    await WorkerAgent.register(runtime, served_type, lambda: WorkerAgent(name))
+    await runtime.add_subscription(
+        DefaultSubscription(topic_type=served_type, agent_type=served_type)
+    )
+    return served_type
+
+
+async def report_load(runtime: AgentRuntime, shard: str, interval: float) -> None:
+    """Periodically tell the router how many messages this shard is handling."""
+    while True:
+        try:
+            await runtime.publish_message(
+                WorkerLoadReport(
+                    shard=shard, queue_depth=WorkerAgent.in_flight, source=shard
+                ),
+                topic_id=DefaultTopicId(type="default", source="worker_load"),
+            )
+        except Exception:
+            logger.warning("Failed to report the load of %s", shard, exc_info=True)
+        await asyncio.sleep(interval)
+
+
+async def push_metrics(
+    runtime: AgentRuntime, metrics: MetricsRegistry, name: str, interval: float
+) -> None:
+    """Periodically send the metrics of this process to the proxy, which exports them."""
+    process = f"{name}@{socket.gethostname()}:{os.getpid()}"
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await runtime.publish_message(
+                MetricsSnapshot(
+                    process=process, metrics=metrics.snapshot(), source=process
+                ),
+                topic_id=DefaultTopicId(type="user_proxy", source="metrics"),
+            )
+        except Exception:
+            logger.warning("Failed to push the metrics of %s", process, exc_info=True)
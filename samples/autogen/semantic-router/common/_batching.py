@@ -0,0 +1,79 @@
+# Copyright AGNTCY Contributors (https://github.com/agntcy)
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+from typing import Awaitable, Callable, Generic, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class MicroBatcher(Generic[T, R]):
+    """Collect items submitted concurrently and process them as one batch.
+
+    A batch is flushed when it reaches `max_batch_size` items or when
+    `max_delay` seconds have passed since its first item, whichever comes
+    first. Each submitter receives the result at its own position.
+
+    Args:
+        process (Callable[[list[T]], Awaitable[list[R]]]): Processes a batch and
+            returns one result per item, in order.
+        max_batch_size (int): The maximum number of items in a batch.
+        max_delay (float): The maximum time in seconds an item waits for its batch.
+    """
+
+    def __init__(
+        self,
+        process: Callable[[list[T]], Awaitable[list[R]]],
+        max_batch_size: int = 64,
+        max_delay: float = 0.002,
+    ) -> None:
+        self._process = process
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+
+        self._pending: list[tuple[T, asyncio.Future[R]]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    async def submit(self, item: T) -> R:
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[R] = loop.create_future()
+        self._pending.append((item, future))
+
+        if len(self._pending) >= self.max_batch_size:
+            self.flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_delay, self.flush)
+
+        return await future
+
+    def flush(self) -> None:
+        """Start processing the pending items without waiting for the window."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+
+        batch, self._pending = self._pending, []
+        task = asyncio.create_task(self._run(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: list[tuple[T, asyncio.Future[R]]]) -> None:
+        try:
+            results = await self._process([item for item, _ in batch])
+            if len(results) != len(batch):
+                raise ValueError(
+                    f"Batch of {len(batch)} items produced {len(results)} results"
+                )
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
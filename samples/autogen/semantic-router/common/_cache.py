@@ -0,0 +1,102 @@
+# Copyright AGNTCY Contributors (https://github.com/agntcy)
+# SPDX-License-Identifier: Apache-2.0
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Generic, Hashable, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+_MISSING: Any = object()
+
+
+@dataclass
+class CacheStats:
+    """Counters of an LRUCache."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+
+class LRUCache(Generic[K, V]):
+    """A size-bounded least-recently-used cache with optional per-entry TTL.
+
+    Args:
+        capacity (int): The maximum number of entries.
+        ttl (float | None): The default time to live of an entry in seconds,
+            None to keep entries until they are evicted.
+        clock (Callable[[], float]): The time source, monotonic by default.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        ttl: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self._clock = clock
+        self._entries: OrderedDict[K, tuple[float | None, V]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: K, default: Any = None) -> V | Any:
+        entry = self._entries.get(key, _MISSING)
+        if entry is _MISSING:
+            self.stats.misses += 1
+            return default
+
+        expires_at, value = entry
+        if expires_at is not None and expires_at <= self._clock():
+            del self._entries[key]
+            self.stats.expirations += 1
+            self.stats.misses += 1
+            return default
+
+        self._entries.move_to_end(key)
+        self.stats.hits += 1
+        return value
+
+    def put(self, key: K, value: V, ttl: float | None = _MISSING) -> None:
+        """Store a value, `ttl` overrides the default time to live of the cache."""
+        ttl = self.ttl if ttl is _MISSING else ttl
+        expires_at = self._clock() + ttl if ttl is not None else None
+
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    def purge_expired(self) -> int:
+        """Drop expired entries starting from the least recently used one.
+
+        The scan stops at the first live entry, which is exact when every
+        entry uses the default TTL and is refreshed with `put` on use.
+        """
+        now = self._clock()
+        purged = 0
+        while self._entries:
+            key, (expires_at, _) = next(iter(self._entries.items()))
+            if expires_at is None or expires_at > now:
+                break
+            del self._entries[key]
+            purged += 1
+        self.stats.expirations += purged
+        return purged
+
+    def invalidate(self, key: K = _MISSING) -> None:
+        """Drop one entry, or every entry when no key is given."""
+        if key is _MISSING:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
@@ -0,0 +1,98 @@
+# Copyright AGNTCY Contributors (https://github.com/agntcy)
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+from typing import Any
+
+from common._cache import LRUCache
+from common._semantic_router_components import AgentRegistryBase
+
+_MISSING: Any = object()
+_UNKNOWN: Any = object()
+
+
+class CachingAgentRegistry(AgentRegistryBase):
+    """Cache the lookups of another, typically remote, agent registry.
+
+    Known intents are cached for `ttl` seconds and unknown intents for
+    `negative_ttl` seconds, so repeated misses do not reach the registry
+    either. Concurrent misses for the same intent share a single lookup.
+
+    Args:
+        registry (AgentRegistryBase): The registry to cache.
+        capacity (int): The maximum number of cached intents.
+        ttl (float | None): The time to live of a resolved intent in seconds.
+        negative_ttl (float | None): The time to live of an unknown intent in seconds.
+    """
+
+    def __init__(
+        self,
+        registry: AgentRegistryBase,
+        capacity: int = 1024,
+        ttl: float | None = 60.0,
+        negative_ttl: float | None = 5.0,
+    ) -> None:
+        self._registry = registry
+        self._cache: LRUCache[str, str] = LRUCache(capacity, ttl=ttl)
+        self._negative_ttl = negative_ttl
+        self._inflight: dict[str, asyncio.Future[str | None]] = {}
+
+        self.negative_hits = 0
+        self.coalesced = 0
+
+    async def get_agent(self, intent: str) -> str:
+        agent = self._cache.get(intent, _MISSING)
+        if agent is _UNKNOWN:
+            self.negative_hits += 1
+            raise KeyError(intent)
+        if agent is not _MISSING:
+            return agent
+
+        lookup = self._inflight.get(intent)
+        if lookup is None:
+            lookup = asyncio.ensure_future(self._lookup(intent))
+            self._inflight[intent] = lookup
+            lookup.add_done_callback(lambda _: self._inflight.pop(intent, None))
+        else:
+            self.coalesced += 1
+
+        # A cancelled caller must not cancel the lookup shared with the others
+        agent = await asyncio.shield(lookup)
+        if agent is None:
+            raise KeyError(intent)
+        return agent
+
+    async def _lookup(self, intent: str) -> str | None:
+        try:
+            agent = await self._registry.get_agent(intent)
+        except KeyError:
+            self._cache.put(intent, _UNKNOWN, ttl=self._negative_ttl)
+            return None
+
+        self._cache.put(intent, agent)
+        return agent
+
+    def invalidate(self, intent: str | None = None) -> None:
+        """Drop one cached intent, or all of them."""
+        if intent is None:
+            self._cache.invalidate()
+        else:
+            self._cache.invalidate(intent)
+
+    def gauges(self) -> dict[str, int]:
+        return {"size": len(self._cache)}
+
+    def counters(self) -> dict[str, int]:
+        """The lookup totals, they only ever grow."""
+        cache_stats = self._cache.stats
+        return {
+            "hits": cache_stats.hits - self.negative_hits,
+            "negative_hits": self.negative_hits,
+            "misses": cache_stats.misses,
+            "coalesced": self.coalesced,
+            "evictions": cache_stats.evictions,
+            "expirations": cache_stats.expirations,
+        }
+
+    def stats(self) -> dict[str, int]:
+        return {**self.counters(), **self.gauges()}
@@ -0,0 +1,191 @@
+# Copyright AGNTCY Contributors (https://github.com/agntcy)
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+import time
+from typing import Any, AsyncIterator, Callable
+
+
+class CorrelationTableFull(Exception):
+    """Raised when the maximum number of in-flight requests is reached."""
+
+
+class _Stream:
+    """The partial replies of a streamed request, put back in order.
+
+    Every partial reply is handled in its own task on the way from the
+    worker, so they can arrive out of order and after the final reply. They
+    are held back until the ones before them are in, and the final reply
+    until all the partial replies it counts are.
+    """
+
+    __slots__ = ("chunks", "early", "final", "next_index", "queue")
+
+    def __init__(self) -> None:
+        # (reply, is_final) pairs, in order
+        self.queue: asyncio.Queue[tuple[Any, bool]] = asyncio.Queue()
+        self.next_index = 0
+        self.early: dict[int, Any] = {}
+        self.final: Any = None
+        self.chunks: int | None = None
+
+    def accepts(self, index: int) -> bool:
+        return (
+            index >= self.next_index
+            and index not in self.early
+            and (self.chunks is None or index < self.chunks)
+        )
+
+    def release(self) -> None:
+        while self.next_index in self.early:
+            self.queue.put_nowait((self.early.pop(self.next_index), False))
+            self.next_index += 1
+        if self.chunks is not None and self.next_index == self.chunks:
+            self.queue.put_nowait((self.final, True))
+            self.final = None
+            # Nothing is accepted anymore
+            self.next_index += 1
+
+
+class CorrelationTable:
+    """Track in-flight requests and hand their replies back to the waiters.
+
+    Every request registers under its own id and is removed again when its
+    reply arrives, when it times out or when the waiter goes away, so the
+    table only ever holds the requests that are actually in flight.
+
+    Args:
+        max_in_flight (int): The maximum number of concurrent requests.
+        clock (Callable[[], float]): The time source, monotonic by default.
+    """
+
+    def __init__(
+        self, max_in_flight: int = 1024, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        self.max_in_flight = max_in_flight
+        self._clock = clock
+        self._pending: dict[str, tuple[float, asyncio.Future[Any]]] = {}
+        self._streams: dict[str, _Stream] = {}
+
+        self.peak_in_flight = 0
+        self.completed = 0
+        self.timed_out = 0
+        self.rejected = 0
+        # Replies received for requests that are no longer waited for
+        self.orphaned = 0
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def __contains__(self, request_id: str) -> bool:
+        return request_id in self._pending
+
+    def register(self, request_id: str, stream: bool = False) -> asyncio.Future[Any]:
+        """Start tracking a request, with `stream` its partial replies are kept too."""
+        if request_id in self._pending:
+            raise ValueError(f"Request {request_id} is already in flight")
+        if len(self._pending) >= self.max_in_flight:
+            self.rejected += 1
+            raise CorrelationTableFull(
+                f"{len(self._pending)} requests in flight, limit is {self.max_in_flight}"
+            )
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = (self._clock(), future)
+        if stream:
+            self._streams[request_id] = _Stream()
+        self.peak_in_flight = max(self.peak_in_flight, len(self._pending))
+        return future
+
+    def resolve(self, request_id: str, result: Any, chunks: int = 0) -> bool:
+        """Deliver the reply of a request, False if nobody waits for it anymore.
+
+        A streamed request ends once its first `chunks` partial replies are
+        delivered too.
+        """
+        entry = self._pending.get(request_id)
+        if entry is None or entry[1].done():
+            self.orphaned += 1
+            return False
+        entry[1].set_result(result)
+        stream = self._streams.get(request_id)
+        if stream is not None:
+            stream.final = result
+            stream.chunks = max(chunks, stream.next_index)
+            stream.release()
+        return True
+
+    def push(self, request_id: str, index: int, partial: Any) -> bool:
+        """Deliver the partial reply at `index` of a streamed request."""
+        stream = self._streams.get(request_id)
+        if stream is None or not stream.accepts(index):
+            self.orphaned += 1
+            return False
+        stream.early[index] = partial
+        stream.release()
+        return True
+
+    def discard(self, request_id: str) -> None:
+        self._streams.pop(request_id, None)
+        entry = self._pending.pop(request_id, None)
+        if entry is not None and not entry[1].done():
+            entry[1].cancel()
+
+    async def wait(self, request_id: str, timeout: float | None) -> Any:
+        """Wait for the reply of a registered request, then forget the request."""
+        _, future = self._pending[request_id]
+        try:
+            result = await asyncio.wait_for(future, timeout=timeout)
+        except asyncio.TimeoutError:
+            self.timed_out += 1
+            raise
+        finally:
+            self.discard(request_id)
+
+        self.completed += 1
+        return result
+
+    async def stream(
+        self, request_id: str, timeout: float | None
+    ) -> AsyncIterator[Any]:
+        """Yield the partial replies of a streamed request in order, then its final reply."""
+        queue = self._streams[request_id].queue
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout if timeout is not None else None
+        try:
+            while True:
+                remaining = deadline - loop.time() if deadline is not None else None
+                try:
+                    item, final = await asyncio.wait_for(queue.get(), timeout=remaining)
+                except asyncio.TimeoutError:
+                    self.timed_out += 1
+                    raise
+                yield item
+                if final:
+                    break
+        finally:
+            self.discard(request_id)
+
+        self.completed += 1
+
+    def gauges(self) -> dict[str, float]:
+        now = self._clock()
+        oldest = min((started for started, _ in self._pending.values()), default=now)
+        return {
+            "in_flight": len(self._pending),
+            "peak_in_flight": self.peak_in_flight,
+            "max_in_flight": self.max_in_flight,
+            "oldest_in_flight_seconds": now - oldest,
+        }
+
+    def counters(self) -> dict[str, int]:
+        """The request totals, they only ever grow."""
+        return {
+            "completed": self.completed,
+            "timed_out": self.timed_out,
+            "rejected": self.rejected,
+            "orphaned": self.orphaned,
+        }
+
+    def stats(self) -> dict[str, float]:
+        return {**self.gauges(), **self.counters()}
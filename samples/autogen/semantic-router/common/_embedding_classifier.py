@@ -0,0 +1,111 @@
+# Copyright AGNTCY Contributors (https://github.com/agntcy)
+# SPDX-License-Identifier: Apache-2.0
+
+import re
+import zlib
+from typing import Callable, Iterable, Mapping, Sequence
+
+import numpy as np
+from common._semantic_router_components import GENERAL_INTENT, IntentClassifierBase
+
+# Maps a batch of texts to a (len(texts), dim) matrix of embeddings
+EmbeddingFunction = Callable[[Sequence[str]], np.ndarray]
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    return matrix / np.where(norms == 0, 1, norms)
+
+
+class HashingEmbedder:
+    """Deterministic bag-of-features embedder based on the hashing trick.
+
+    Words and character n-grams are hashed into a fixed number of signed
+    buckets. It needs no model download, which makes it suitable for tests
+    and offline deployments.
+
+    Args:
+        dim (int): The size of the embedding.
+        ngram (int): The size of the character n-grams, 0 to disable them.
+    """
+
+    def __init__(self, dim: int = 256, ngram: int = 3) -> None:
+        self.dim = dim
+        self.ngram = ngram
+
+    def _features(self, text: str) -> Iterable[str]:
+        for token in _TOKEN_RE.findall(text.casefold()):
+            yield token
+            if self.ngram:
+                padded = f"<{token}>"
+                for i in range(len(padded) - self.ngram + 1):
+                    yield padded[i : i + self.ngram]
+
+    def __call__(self, texts: Sequence[str]) -> np.ndarray:
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature in self._features(text):
+                h = zlib.crc32(feature.encode())
+                matrix[row, h % self.dim] += 1.0 if h & 0x80000000 else -1.0
+        return _normalize(matrix)
+
+
+class EmbeddingIntentClassifier(IntentClassifierBase):
+    """Nearest-centroid intent classifier over normalized embeddings.
+
+    The exemplars of each intent are embedded once and averaged into a
+    centroid. Classifying a message is a single matrix-vector product
+    followed by an argmax over the cosine similarities.
+
+    Args:
+        exemplars (Mapping[str, Iterable[str]]): Example messages of each intent.
+        embed (EmbeddingFunction | None): The embedding function, defaults to a
+            HashingEmbedder.
+        threshold (float): The minimum similarity to accept an intent, below it
+            messages are classified as "general".
+    """
+
+    def __init__(
+        self,
+        exemplars: Mapping[str, Iterable[str]],
+        embed: EmbeddingFunction | None = None,
+        threshold: float = 0.3,
+    ) -> None:
+        self.embed = embed or HashingEmbedder()
+        self.threshold = threshold
+
+        intents: list[str] = []
+        centroids: list[np.ndarray] = []
+        for intent, texts in exemplars.items():
+            texts = list(texts)
+            if not texts:
+                continue
+            intents.append(intent)
+            centroids.append(self.embed(texts).mean(axis=0))
+
+        self.intents = intents
+        self.centroids = (
+            _normalize(np.stack(centroids)).astype(np.float32)
+            if centroids
+            else np.zeros((0, 0), dtype=np.float32)
+        )
+
+    def scores(self, messages: Sequence[str]) -> np.ndarray:
+        """Return the (len(messages), len(intents)) cosine similarity matrix."""
+        return _normalize(self.embed(messages)) @ self.centroids.T
+
+    async def classify_intent(self, message: str) -> str:
+        return (await self.classify_intents([message]))[0]
+
+    async def classify_intents(self, messages: list[str]) -> list[str]:
+        if not self.intents:
+            return [GENERAL_INTENT] * len(messages)
+        scores = self.scores(messages)
+        best = np.argmax(scores, axis=1)
+        confident = scores[np.arange(len(messages)), best] >= self.threshold
+        return [
+            self.intents[i] if ok else GENERAL_INTENT
+            for i, ok in zip(best.tolist(), confident.tolist())
+        ]
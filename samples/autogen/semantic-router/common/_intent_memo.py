@@ -0,0 +1,75 @@
+# Copyright AGNTCY Contributors (https://github.com/agntcy)
+# SPDX-License-Identifier: Apache-2.0
+
+import hashlib
+
+from common._cache import CacheStats, LRUCache
+from common._semantic_router_components import IntentClassifierBase
+
+
+def normalize_message(message: str) -> str:
+    """Lowercase the message and collapse its whitespace."""
+    return " ".join(message.casefold().split())
+
+
+def message_key(normalized: str) -> bytes:
+    return hashlib.blake2b(normalized.encode(), digest_size=16).digest()
+
+
+class MemoizingIntentClassifier(IntentClassifierBase):
+    """Remember the intents of recently seen messages in front of a classifier.
+
+    Messages that only differ by case or whitespace share one entry, so the
+    wrapped classifier only runs on novel inputs. The classifier is given the
+    normalized message the entry is keyed on, so the remembered intent holds
+    for every message sharing the entry. It therefore never sees upper case
+    letters: a case-sensitive classifier no longer matches keywords that
+    contain some, and matches lowercase keywords in messages written in
+    any case. Wrap classifiers that ignore case, such as a
+    KeywordIntentClassifier with `ignore_case=True`. Call `invalidate`
+    whenever the intent table of the wrapped classifier changes.
+
+    Args:
+        classifier (IntentClassifierBase): The classifier to memoize.
+        capacity (int): The maximum number of remembered messages.
+    """
+
+    def __init__(
+        self, classifier: IntentClassifierBase, capacity: int = 10_000
+    ) -> None:
+        self.classifier = classifier
+        self._memo: LRUCache[bytes, str] = LRUCache(capacity)
+
+    @property
+    def stats(self) -> CacheStats:
+        return self._memo.stats
+
+    def __len__(self) -> int:
+        return len(self._memo)
+
+    def invalidate(self) -> None:
+        self._memo.invalidate()
+
+    async def classify_intent(self, message: str) -> str:
+        normalized = normalize_message(message)
+        key = message_key(normalized)
+        intent = self._memo.get(key)
+        if intent is None:
+            intent = await self.classifier.classify_intent(normalized)
+            self._memo.put(key, intent)
+        return intent
+
+    async def classify_intents(self, messages: list[str]) -> list[str]:
+        normalized = [normalize_message(message) for message in messages]
+        keys = [message_key(message) for message in normalized]
+        intents = [self._memo.get(key) for key in keys]
+
+        misses = [i for i, intent in enumerate(intents) if intent is None]
+        if misses:
+            classified = await self.classifier.classify_intents(
+                [normalized[i] for i in misses]
+            )
+            for i, intent in zip(misses, classified):
+                intents[i] = intent
+                self._memo.put(keys[i], intent)
+        return intents
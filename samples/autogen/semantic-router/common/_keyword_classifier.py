@@ -0,0 +1,221 @@
+# Copyright AGNTCY Contributors (https://github.com/agntcy)
+# SPDX-License-Identifier: Apache-2.0
+
+import re
+from typing import Iterable, Mapping, NamedTuple
+
+from common._semantic_router_components import GENERAL_INTENT, IntentClassifierBase
+
+# Up to this many keywords a few C-level regex searches beat walking the
+# automaton character by character in Python. A regex alternation tries
+# every keyword at every position though, so larger tables use the
+# automaton whatever their number of intents.
+REGEX_MAX_KEYWORDS = 48
+
+
+class _Output(NamedTuple):
+    priority: int
+    order: int
+    intent: str
+    length: int
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+class KeywordMatcher:
+    """Aho-Corasick automaton over all the keywords of an intent table.
+
+    The keywords are compiled once, so a lookup costs O(len(message)) no
+    matter how many intents or keywords are registered. Tables of a few dozen
+    keywords are compiled into one alternation regex per intent instead.
+
+    Args:
+        intents (Mapping[str, Iterable[str]]): The keywords of each intent.
+        priorities (Mapping[str, int] | None): Optional intent priorities, lower
+            wins. Intents without an explicit priority rank by insertion order
+            after the prioritized ones, which matches the first-match semantics
+            of a plain loop over the table.
+        ignore_case (bool): Case-fold keywords and messages before matching,
+            matching is case-sensitive by default like a plain `in` check.
+        whole_words (bool): Only match keywords delimited by non-word characters.
+    """
+
+    def __init__(
+        self,
+        intents: Mapping[str, Iterable[str]],
+        priorities: Mapping[str, int] | None = None,
+        ignore_case: bool = False,
+        whole_words: bool = False,
+    ) -> None:
+        self.ignore_case = ignore_case
+        self.whole_words = whole_words
+
+        priorities = priorities or {}
+        fallback = max(priorities.values(), default=-1) + 1
+
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[_Output | None] = [None]
+        self._dict_link: list[int] = [0]
+
+        ranked: list[tuple[int, int, str, list[str]]] = []
+        for order, (intent, keywords) in enumerate(intents.items()):
+            priority = priorities.get(intent, fallback + order)
+            folded = [self._fold(keyword) for keyword in keywords if keyword]
+            ranked.append((priority, order, intent, folded))
+            for keyword in folded:
+                self._add(keyword, _Output(priority, order, intent, 0))
+
+        self._patterns: list[tuple[re.Pattern[str], str]] | None = None
+        if sum(len(keywords) for *_, keywords in ranked) <= REGEX_MAX_KEYWORDS:
+            self._patterns = [
+                (self._compile(keywords), intent)
+                for _, _, intent, keywords in sorted(ranked)
+                if keywords
+            ]
+
+        # Once the top ranked intent matches, nothing later can beat it
+        self._top = min((out[:2] for out in self._out if out is not None), default=None)
+        self._build_links()
+
+    def __len__(self) -> int:
+        return sum(out is not None for out in self._out)
+
+    def clear(self, chunk: int = 10_000) -> None:
+        """Drop every keyword, freeing the automaton `chunk` states at a time.
+
+        Freeing a large automaton in one go holds the GIL for tens of
+        milliseconds, freeing it in chunks lets other threads run in between.
+        The matcher is left empty and matches nothing.
+        """
+        self._patterns = None
+        self._top = None
+        for states in (self._goto, self._fail, self._out, self._dict_link):
+            while states:
+                del states[-chunk:]
+        self._goto.append({})
+        self._fail.append(0)
+        self._out.append(None)
+        self._dict_link.append(0)
+
+    def _fold(self, text: str) -> str:
+        return text.casefold() if self.ignore_case else text
+
+    def _compile(self, keywords: list[str]) -> re.Pattern[str]:
+        # Longest first so the alternation does not stop at a shorter prefix
+        alternation = "|".join(map(re.escape, sorted(keywords, key=len, reverse=True)))
+        if self.whole_words:
+            return re.compile(rf"(?<!\w)(?:{alternation})(?!\w)")
+        return re.compile(alternation)
+
+    def _add(self, keyword: str, output: _Output) -> None:
+        node = 0
+        for ch in keyword:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(None)
+                self._dict_link.append(0)
+            node = nxt
+
+        # The same keyword registered for several intents keeps the best one
+        current = self._out[node]
+        output = output._replace(length=len(keyword))
+        if current is None or output[:2] < current[:2]:
+            self._out[node] = output
+
+    def _build_links(self) -> None:
+        goto, fail, out, dict_link = self._goto, self._fail, self._out, self._dict_link
+
+        queue = list(goto[0].values())
+        for node in queue:
+            for ch, child in goto[node].items():
+                queue.append(child)
+
+                state = fail[node]
+                while state and ch not in goto[state]:
+                    state = fail[state]
+                target = goto[state].get(ch, 0)
+                fail[child] = target if target != child else 0
+
+                suffix = fail[child]
+                dict_link[child] = (
+                    suffix if out[suffix] is not None else dict_link[suffix]
+                )
+
+    def match(self, message: str) -> str | None:
+        """Return the best matching intent for the message, or None."""
+        text = self._fold(message)
+        if self._patterns is not None:
+            for pattern, intent in self._patterns:
+                if pattern.search(text):
+                    return intent
+            return None
+
+        goto, fail, out, dict_link = self._goto, self._fail, self._out, self._dict_link
+        whole_words = self.whole_words
+        size = len(text)
+
+        best: _Output | None = None
+        node = 0
+        for pos, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+
+            hit = node if out[node] is not None else dict_link[node]
+            while hit:
+                candidate = out[hit]
+                hit = dict_link[hit]
+                if best is not None and candidate[:2] >= best[:2]:
+                    continue
+                if whole_words:
+                    start = pos - candidate.length + 1
+                    if start > 0 and _is_word_char(text[start - 1]):
+                        continue
+                    if pos + 1 < size and _is_word_char(text[pos + 1]):
+                        continue
+                best = candidate
+
+            if best is not None and best[:2] == self._top:
+                break
+
+        return best.intent if best is not None else None
+
+
+class KeywordIntentClassifier(IntentClassifierBase):
+    """Classify messages by keyword with a single pass over the message.
+
+    Args:
+        intents (Mapping[str, Iterable[str]]): The keywords of each intent.
+        priorities (Mapping[str, int] | None): Optional intent priorities, lower wins.
+        ignore_case (bool): Match keywords regardless of case.
+        whole_words (bool): Only match keywords on word boundaries.
+    """
+
+    def __init__(
+        self,
+        intents: Mapping[str, Iterable[str]],
+        priorities: Mapping[str, int] | None = None,
+        ignore_case: bool = False,
+        whole_words: bool = False,
+    ) -> None:
+        self.intents = {intent: list(keywords) for intent, keywords in intents.items()}
+        self.matcher = KeywordMatcher(
+            self.intents,
+            priorities=priorities,
+            ignore_case=ignore_case,
+            whole_words=whole_words,
+        )
+
+    async def classify_intent(self, message: str) -> str:
+        return self.matcher.match(message) or GENERAL_INTENT
+
+    async def classify_intents(self, messages: list[str]) -> list[str]:
+        match = self.matcher.match
+        return [match(message) or GENERAL_INTENT for message in messages]
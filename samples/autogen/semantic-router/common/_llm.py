@@ -0,0 +1,152 @@
+# Copyright AGNTCY Contributors (https://github.com/agntcy)
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+import functools
+import logging
+import os
+from abc import ABC, abstractmethod
+from typing import AsyncIterator
+
+import httpx
+from autogen_core import TRACE_LOGGER_NAME
+from openai import AsyncAzureOpenAI, DefaultAsyncHttpxClient
+
+logger = logging.getLogger(f"{TRACE_LOGGER_NAME}.llm")
+
+
+class ChatBackend(ABC):
+    """A chat completion backend used by the worker agents."""
+
+    @abstractmethod
+    async def complete(self, messages: list[dict[str, str]]) -> str:
+        pass
+
+    @abstractmethod
+    def stream(self, messages: list[dict[str, str]]) -> AsyncIterator[str]:
+        """Yield the answer token by token as the model produces it.
+
+        Close the iterator, e.g. with contextlib.aclosing, when it is not
+        consumed to the end.
+        """
+        pass
+
+
+@functools.cache
+def shared_azure_client() -> AsyncAzureOpenAI:
+    """The process-wide Azure OpenAI client, its connections are kept alive and reused."""
+    limits = httpx.Limits(
+        max_connections=int(os.getenv("LLM_MAX_CONNECTIONS", "100")),
+        max_keepalive_connections=int(os.getenv("LLM_MAX_KEEPALIVE_CONNECTIONS", "20")),
+        keepalive_expiry=float(os.getenv("LLM_KEEPALIVE_EXPIRY", "30")),
+    )
+    return AsyncAzureOpenAI(
+        api_key=os.getenv("AZURE_OPENAI_API_KEY"),
+        api_version=os.getenv("AZURE_OPENAI_API_VERSION"),
+        azure_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT"),
+        http_client=DefaultAsyncHttpxClient(limits=limits),
+    )
+
+
+@functools.cache
+def shared_llm_slots() -> asyncio.Semaphore:
+    """Limits the LLM calls in flight across all the agents of the process."""
+    return asyncio.Semaphore(int(os.getenv("LLM_MAX_CONCURRENCY", "32")))
+
+
+class AzureChatBackend(ChatBackend):
+    """Chat completions from an Azure OpenAI deployment.
+
+    Args:
+        client (AsyncAzureOpenAI): The client, usually shared by all the agents.
+        deployment (str | None): The name of the model deployment.
+        slots (asyncio.Semaphore | None): Bounds the concurrent calls, the
+            slots shared by the process by default.
+    """
+
+    def __init__(
+        self,
+        client: AsyncAzureOpenAI,
+        deployment: str | None,
+        slots: asyncio.Semaphore | None = None,
+    ) -> None:
+        self.client = client
+        self.deployment = deployment
+        self.slots = slots if slots is not None else shared_llm_slots()
+
+    async def complete(self, messages: list[dict[str, str]]) -> str:
+        async with self.slots:
+            response = await self.client.chat.completions.create(
+                model=self.deployment,
+                messages=messages,
+            )
+        return response.choices[0].message.content
+
+    async def stream(self, messages: list[dict[str, str]]) -> AsyncIterator[str]:
+        deltas: asyncio.Queue[str | None] = asyncio.Queue()
+
+        async def read() -> None:
+            # The slot is held while the model generates, not while the
+            # answer waits to be consumed, so it is given back even if the
+            # iterator is abandoned
+            try:
+                async with self.slots:
+                    response = await self.client.chat.completions.create(
+                        model=self.deployment,
+                        messages=messages,
+                        stream=True,
+                    )
+                    async with response:
+                        async for chunk in response:
+                            if chunk.choices and chunk.choices[0].delta.content:
+                                deltas.put_nowait(chunk.choices[0].delta.content)
+            finally:
+                deltas.put_nowait(None)
+
+        reader = asyncio.create_task(read())
+        try:
+            while (delta := await deltas.get()) is not None:
+                yield delta
+            # Raise the error of the call, if any
+            await reader
+        finally:
+            reader.cancel()
+
+
+class FakeChatBackend(ChatBackend):
+    """A local stand-in for the LLM that always gives the same answer.
+
+    Args:
+        answer (str): The answer to every conversation.
+        token_delay (float): Seconds to wait before each streamed token.
+    """
+
+    def __init__(self, answer: str, token_delay: float = 0.0) -> None:
+        self.answer = answer
+        self.token_delay = token_delay
+
+    async def complete(self, messages: list[dict[str, str]]) -> str:
+        await asyncio.sleep(self.token_delay * len(self.answer.split()))
+        return self.answer
+
+    async def stream(self, messages: list[dict[str, str]]) -> AsyncIterator[str]:
+        words = self.answer.split(" ")
+        for i, word in enumerate(words):
+            await asyncio.sleep(self.token_delay)
+            yield word if i == len(words) - 1 else word + " "
+
+
+def chat_backend(name: str) -> ChatBackend:
+    """Return the Azure OpenAI backend when configured, a fake LLM otherwise."""
+    if os.getenv("AZURE_OPENAI_API_KEY"):
+        return AzureChatBackend(
+            shared_azure_client(),
+            os.getenv("AZURE_OPENAI_DEPLOYMENT_NAME"),
+            shared_llm_slots(),
+        )
+
+    logger.warning("AZURE_OPENAI_API_KEY not found. Using a fake LLM.")
+    return FakeChatBackend(
+        f"I am an expert {name} assistant!",
+        token_delay=float(os.getenv("FAKE_LLM_TOKEN_DELAY_MS", "0")) / 1000,
+    )
@@ -0,0 +1,267 @@
+# Copyright AGNTCY Contributors (https://github.com/agntcy)
+# SPDX-License-Identifier: Apache-2.0
+
+import contextlib
+import time
+from typing import Any, Callable, Iterator
+
+# Bucket boundaries in seconds of the exported Prometheus histograms
+EXPORT_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)  # fmt: skip
+
+
+class Histogram:
+    """A log-linear histogram of durations in the spirit of HdrHistogram.
+
+    Values are counted in buckets whose width doubles with every power of
+    two, each power of two split in `2 ** (sub_bucket_bits - 1)` buckets,
+    so every recorded value is known within a fixed relative error
+    (under 1.6% with the default 7 bits) whatever its magnitude. Recording
+    is a few integer operations and takes no lock, the histogram is only
+    updated from the event loop.
+
+    Args:
+        unit (float): The smallest distinguishable value, one microsecond by default.
+        highest (float): Larger values are counted as this value.
+        sub_bucket_bits (int): The precision of the buckets.
+    """
+
+    def __init__(
+        self, unit: float = 1e-6, highest: float = 60.0, sub_bucket_bits: int = 7
+    ) -> None:
+        self.unit = unit
+        self._bits = sub_bucket_bits
+        self._half = 1 << (sub_bucket_bits - 1)
+        self._highest = int(highest / unit)
+        self.counts = [0] * (self._index(self._highest) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def _index(self, v: int) -> int:
+        shift = v.bit_length() - self._bits
+        if shift <= 0:
+            return v
+        return shift * self._half + (v >> shift)
+
+    def _lower_bound(self, index: int) -> int:
+        if index < 2 * self._half:
+            return index
+        shift = index // self._half - 1
+        return (index - shift * self._half) << shift
+
+    def record(self, value: float) -> None:
+        v = min(int(value / self.unit), self._highest)
+        self.counts[self._index(v)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, q: float) -> float:
+        """The value below which `q` percent of the recorded values fall."""
+        if not self.count:
+            return 0.0
+        rank = max(1, round(q / 100 * self.count))
+        seen = 0
+        for index, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return min(self._lower_bound(index + 1) * self.unit, self.max)
+        return self.max
+
+    def cumulative_counts(self, bounds: tuple[float, ...]) -> list[int]:
+        """How many values are at most each of the ascending `bounds`."""
+        result, seen, index = [], 0, 0
+        for bound in bounds:
+            limit = bound / self.unit
+            # A bucket counts once the highest value it holds is within the bound
+            while (
+                index < len(self.counts) and self._lower_bound(index + 1) - 1 <= limit
+            ):
+                seen += self.counts[index]
+                index += 1
+            result.append(seen)
+        return result
+
+    def snapshot(self) -> dict[str, Any]:
+        """The state of the histogram, to rebuild it in another process."""
+        return {
+            "counts": [[i, n] for i, n in enumerate(self.counts) if n],
+            "count": self.count,
+            "sum": self.sum,
+            "max": self.max,
+        }
+
+    def restore(self, snapshot: dict[str, Any]) -> None:
+        self.counts = [0] * len(self.counts)
+        for index, n in snapshot["counts"]:
+            self.counts[index] = n
+        self.count = snapshot["count"]
+        self.sum = snapshot["sum"]
+        self.max = snapshot["max"]
+
+
+def _labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in sorted(labels.items())) + "}"
+
+
+def _key(name: str, labels: dict[str, str]) -> tuple[str, tuple[tuple[str, str], ...]]:
+    return name, tuple(sorted(labels.items()))
+
+
+class MetricsRegistry:
+    """Histograms, gauges and counters rendered in the Prometheus text format.
+
+    The metrics of other processes are added with `merge` and rendered as
+    series of their own, labelled with the `process` they come from, so
+    that every series of a counter only ever grows. A process whose latest
+    snapshot is older than `remote_ttl` seconds has stopped or restarted
+    under another name, its series are dropped.
+
+    Args:
+        remote_ttl (float | None): Seconds a remote snapshot is kept, None for ever.
+        clock (Callable[[], float]): The time source, monotonic by default.
+    """
+
+    def __init__(
+        self,
+        remote_ttl: float | None = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.remote_ttl = remote_ttl
+        self._clock = clock
+        self._help: dict[str, str] = {}
+        self._histograms: dict[tuple, Histogram] = {}
+        self._gauges: list[tuple[str, str, Callable[[], dict[str, float]]]] = []
+        self._counters: list[tuple[str, str, Callable[[], dict[str, float]]]] = []
+        # When the latest snapshot of every remote process was received, its
+        # histograms, and the type, help and value of its other metrics
+        self._remote: dict[
+            str, tuple[float, dict[tuple, Histogram], dict[str, tuple[str, str, float]]]
+        ] = {}
+
+    def histogram(self, name: str, help: str, **labels: str) -> Histogram:
+        self._help.setdefault(name, help)
+        key = _key(name, labels)
+        if key not in self._histograms:
+            self._histograms[key] = Histogram()
+        return self._histograms[key]
+
+    def gauges(
+        self, prefix: str, help: str, collect: Callable[[], dict[str, float]]
+    ) -> None:
+        """Expose every value returned by `collect` as a `{prefix}_{key}` gauge."""
+        self._gauges.append((prefix, help, collect))
+
+    def counters(
+        self, prefix: str, help: str, collect: Callable[[], dict[str, float]]
+    ) -> None:
+        """Expose every value returned by `collect` as a `{prefix}_{key}_total` counter.
+
+        The values must only ever grow.
+        """
+        self._counters.append((prefix, help, collect))
+
+    @contextlib.contextmanager
+    def time(self, histogram: Histogram) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            histogram.record(time.perf_counter() - start)
+
+    def _values(self) -> Iterator[tuple[str, str, str, float]]:
+        """The name, type, help and value of every gauge and counter."""
+        for kind, suffix, collectors in (
+            ("gauge", "", self._gauges),
+            ("counter", "_total", self._counters),
+        ):
+            for prefix, help, collect in collectors:
+                for key, value in collect().items():
+                    yield f"{prefix}_{key}{suffix}", kind, help, value
+
+    def snapshot(self) -> list[dict[str, Any]]:
+        histograms = [
+            {
+                "name": name,
+                "type": "histogram",
+                "labels": dict(labels),
+                "help": self._help[name],
+                **h.snapshot(),
+            }
+            for (name, labels), h in self._histograms.items()
+        ]
+        values = [
+            {"name": name, "type": kind, "help": help, "value": value}
+            for name, kind, help, value in self._values()
+        ]
+        return histograms + values
+
+    def merge(self, process: str, snapshot: list[dict[str, Any]]) -> None:
+        """Replace the metrics last received from `process`."""
+        histograms, values = {}, {}
+        for entry in snapshot:
+            if entry["type"] != "histogram":
+                values[entry["name"]] = (entry["type"], entry["help"], entry["value"])
+                continue
+            self._help.setdefault(entry["name"], entry["help"])
+            histogram = Histogram()
+            histogram.restore(entry)
+            histograms[_key(entry["name"], entry["labels"])] = histogram
+        self._remote[process] = (self._clock(), histograms, values)
+
+    def _expire_remote(self) -> None:
+        if self.remote_ttl is None:
+            return
+        oldest = self._clock() - self.remote_ttl
+        for process, (received, *_) in list(self._remote.items()):
+            if received < oldest:
+                del self._remote[process]
+
+    def render(self) -> str:
+        self._expire_remote()
+        histograms: dict[str, list[tuple[dict[str, str], Histogram]]] = {}
+        for (name, labels), histogram in sorted(self._histograms.items()):
+            histograms.setdefault(name, []).append((dict(labels), histogram))
+        for process, (_, remote, _) in sorted(self._remote.items()):
+            for (name, labels), histogram in sorted(remote.items()):
+                histograms.setdefault(name, []).append(
+                    ({**dict(labels), "process": process}, histogram)
+                )
+
+        lines = []
+        for name, series in histograms.items():
+            lines.append(f"# HELP {name} {self._help[name]}")
+            lines.append(f"# TYPE {name} histogram")
+            for labels, h in series:
+                for bound, n in zip(
+                    EXPORT_BUCKETS, h.cumulative_counts(EXPORT_BUCKETS)
+                ):
+                    lines.append(
+                        f"{name}_bucket{_labels({**labels, 'le': str(bound)})} {n}"
+                    )
+                lines.append(
+                    f"{name}_bucket{_labels({**labels, 'le': '+Inf'})} {h.count}"
+                )
+                lines.append(f"{name}_sum{_labels(labels)} {h.sum}")
+                lines.append(f"{name}_count{_labels(labels)} {h.count}")
+
+        values: dict[str, tuple[str, str, list[tuple[dict[str, str], float]]]] = {}
+        for name, kind, help, value in self._values():
+            values.setdefault(name, (kind, help, []))[2].append(({}, value))
+        for process, (_, _, remote) in sorted(self._remote.items()):
+            for name, (kind, help, value) in remote.items():
+                values.setdefault(name, (kind, help, []))[2].append(
+                    ({"process": process}, value)
+                )
+        for name, (kind, help, series) in values.items():
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in series:
+                lines.append(f"{name}{_labels(labels)} {value}")
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,240 @@
+# Copyright AGNTCY Contributors (https://github.com/agntcy)
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+import collections
+import gc
+import json
+import logging
+import os
+import sys
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+import yaml
+from autogen_core import TRACE_LOGGER_NAME
+from common._keyword_classifier import KeywordIntentClassifier
+from common._semantic_router_components import AgentRegistryBase, IntentClassifierBase
+
+logger = logging.getLogger(f"{TRACE_LOGGER_NAME}.routing_table")
+
+# Automaton states freed at once when a replaced table is released
+RELEASE_CHUNK = 10_000
+
+
+def _release(classifier: KeywordIntentClassifier) -> None:
+    """Free a replaced classifier a chunk at a time.
+
+    Freeing the automaton of a large table in one go holds the GIL for tens
+    of milliseconds, releasing its states in chunks lets the event loop run
+    in between.
+    """
+    # Still in use elsewhere if more than this frame and getrefcount refer to it
+    if sys.getrefcount(classifier) > 2:
+        return
+    classifier.matcher.clear(RELEASE_CHUNK)
+
+
+@dataclass(frozen=True)
+class RoutingTable:
+    """The keywords, priority and agent of every intent the router knows."""
+
+    intents: dict[str, list[str]]
+    priorities: dict[str, int]
+    agents: dict[str, str]
+
+
+def keyword_classifier(table: RoutingTable) -> KeywordIntentClassifier:
+    """The keyword classifier of a routing table."""
+    return KeywordIntentClassifier(table.intents, table.priorities)
+
+
+def parse_routing_table(data: dict) -> RoutingTable:
+    """Build a routing table from its YAML or JSON document.
+
+    The document maps every intent to its agent, its keywords and an
+    optional priority, lower wins:
+
+        intents:
+          hr_intent:
+            agent: hr
+            keywords: [hr, human resources, employee]
+            priority: 0
+    """
+    if not isinstance(data, dict) or not isinstance(data.get("intents"), dict):
+        raise ValueError("A routing table needs an 'intents' mapping")
+
+    intents, priorities, agents = {}, {}, {}
+    for intent, spec in data["intents"].items():
+        if not isinstance(spec, dict) or "agent" not in spec:
+            raise ValueError(f"Intent {intent} needs an agent")
+        keywords = spec.get("keywords", [])
+        if not isinstance(keywords, list) or not all(
+            isinstance(k, str) for k in keywords
+        ):
+            raise ValueError(
+                f"The keywords of intent {intent} must be a list of strings"
+            )
+        intents[intent] = keywords
+        agents[intent] = str(spec["agent"])
+        if "priority" in spec:
+            priorities[intent] = int(spec["priority"])
+    return RoutingTable(intents, priorities, agents)
+
+
+def load_routing_table(path: str | Path) -> RoutingTable:
+    """Load a routing table from a .json file, or a YAML file otherwise."""
+    path = Path(path)
+    with path.open() as f:
+        data = json.load(f) if path.suffix == ".json" else yaml.safe_load(f)
+    return parse_routing_table(data)
+
+
+class ReloadableIntentClassifier(IntentClassifierBase):
+    """Delegate to a classifier that can be replaced at any time.
+
+    Every call reads the current classifier once, so a swap never blocks
+    or disturbs the classifications in flight.
+    """
+
+    def __init__(self, classifier: IntentClassifierBase) -> None:
+        self.classifier = classifier
+
+    def swap(self, classifier: IntentClassifierBase) -> IntentClassifierBase:
+        """Install a new classifier and return the one it replaces."""
+        previous, self.classifier = self.classifier, classifier
+        return previous
+
+    async def classify_intent(self, message: str) -> str:
+        return await self.classifier.classify_intent(message)
+
+    async def classify_intents(self, messages: list[str]) -> list[str]:
+        return await self.classifier.classify_intents(messages)
+
+
+class ReloadableAgentRegistry(AgentRegistryBase):
+    """Look up the agent of an intent in a mapping that can be replaced at any time."""
+
+    def __init__(self, agents: dict[str, str]) -> None:
+        self.agents = agents
+
+    def swap(self, agents: dict[str, str]) -> None:
+        self.agents = agents
+
+    async def get_agent(self, intent: str) -> str:
+        return self.agents[intent]
+
+    async def get_agents(self, intents: list[str]) -> list[str | None]:
+        agents = self.agents
+        return [agents.get(intent) for intent in intents]
+
+
+class RoutingTableWatcher:
+    """Poll a routing table file and apply its new versions without downtime.
+
+    A background thread checks the file every `interval` seconds. When it
+    has changed, the thread parses it and compiles the new classifier, which
+    can take seconds for large tables, then hands both to `on_reload` on the
+    event loop. A file that fails to load is logged and the current table
+    is kept. When `on_reload` returns the keyword classifier it replaced, the
+    thread releases it too.
+
+    Args:
+        path (str | Path): The routing table file.
+        on_reload (Callable[[RoutingTable, IntentClassifierBase], IntentClassifierBase | None]):
+            Installs a new table, called on the event loop.
+        interval (float): Seconds between two checks of the file.
+        build (Callable[[RoutingTable], IntentClassifierBase]): Builds the
+            classifier of a table, a keyword classifier by default.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        on_reload: Callable[
+            [RoutingTable, IntentClassifierBase], IntentClassifierBase | None
+        ],
+        interval: float = 2.0,
+        build: Callable[[RoutingTable], IntentClassifierBase] = keyword_classifier,
+    ) -> None:
+        self.path = Path(path)
+        self.on_reload = on_reload
+        self.interval = interval
+        self.build = build
+        self.reloads = 0
+        self.failures = 0
+        self._retired: collections.deque[KeywordIntentClassifier] = collections.deque()
+        self._version = self._file_version()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def _file_version(self) -> tuple[int, int, int] | None:
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+    def start(self) -> None:
+        """Start watching, the new tables are applied on the running event loop."""
+        self._loop = asyncio.get_running_loop()
+        self._thread = threading.Thread(
+            target=self._run, name="routing-table-watcher", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            if self._retired:
+                self._release_retired()
+            self.check()
+
+    def _install(self, table: RoutingTable, classifier: IntentClassifierBase) -> None:
+        # Hand the replaced classifier back to the thread to be released there
+        retired = self.on_reload(table, classifier)
+        if isinstance(retired, KeywordIntentClassifier):
+            self._retired.append(retired)
+
+    def _release_retired(self) -> None:
+        while self._retired:
+            _release(self._retired.popleft())
+
+    def check(self) -> bool:
+        """Reload the file if it has changed, True if a new table was applied."""
+        version = self._file_version()
+        if version is None or version == self._version:
+            return False
+        self._version = version
+
+        # A collection during the build walks the whole new table while
+        # holding the GIL, stalling the event loop for tens of milliseconds
+        collecting = gc.isenabled()
+        gc.disable()
+        try:
+            table = load_routing_table(self.path)
+            classifier = self.build(table)
+        except Exception:
+            self.failures += 1
+            logger.exception(
+                "Keeping the current routing table, %s failed to load", self.path
+            )
+            return False
+        finally:
+            if collecting:
+                gc.enable()
+
+        self.reloads += 1
+        logger.info("Reloaded %d intents from %s", len(table.intents), self.path)
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._install, table, classifier)
+        else:
+            self._install(table, classifier)
+        return True
@@ -0,0 +1,93 @@
+# Copyright AGNTCY Contributors (https://github.com/agntcy)
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+import contextlib
+import heapq
+import itertools
+import math
+import time
+from typing import AsyncIterator, Callable
+
+
+class DeadlineExceeded(Exception):
+    """Raised when work is dropped because its deadline has passed."""
+
+
+class PriorityScheduler:
+    """Run work concurrently up to a limit, queueing the rest by priority.
+
+    Queued work is started by priority class, lowest value first, and by
+    earliest deadline within a class. Work whose deadline has passed is
+    dropped instead of started. Deadlines are absolute wall-clock times so
+    that they mean the same in every process, 0 means no deadline.
+
+    Args:
+        max_concurrency (int): The maximum number of slots held at once.
+        clock (Callable[[], float]): The time source, wall-clock time by default.
+    """
+
+    def __init__(
+        self, max_concurrency: int = 256, clock: Callable[[], float] = time.time
+    ) -> None:
+        self.max_concurrency = max_concurrency
+        self._clock = clock
+        self._running = 0
+        self._queue: list[tuple[int, float, int, asyncio.Future[None]]] = []
+        self._sequence = itertools.count()
+        self.dropped = 0
+
+    def __len__(self) -> int:
+        """The number of queued waiters, including the ones that gave up."""
+        return len(self._queue)
+
+    def expired(self, deadline: float) -> bool:
+        return 0 < deadline <= self._clock()
+
+    def check_deadline(self, deadline: float) -> None:
+        if self.expired(deadline):
+            self.dropped += 1
+            raise DeadlineExceeded()
+
+    @contextlib.asynccontextmanager
+    async def slot(self, priority: int, deadline: float = 0.0) -> AsyncIterator[None]:
+        """Hold a slot, raising DeadlineExceeded if the deadline passes first."""
+        if self._running < self.max_concurrency and not self._queue:
+            self._running += 1
+        else:
+            future = asyncio.get_running_loop().create_future()
+            entry = (priority, deadline or math.inf, next(self._sequence), future)
+            heapq.heappush(self._queue, entry)
+            try:
+                await future
+            except asyncio.CancelledError:
+                # The slot may have been handed over just before the cancellation
+                if future.done() and not future.cancelled():
+                    self._release()
+                raise
+
+        try:
+            self.check_deadline(deadline)
+            yield
+        finally:
+            self._release()
+
+    def _release(self) -> None:
+        self._running -= 1
+        while self._queue and self._running < self.max_concurrency:
+            _, deadline, _, future = heapq.heappop(self._queue)
+            if future.done():
+                continue
+            if self.expired(deadline):
+                self.dropped += 1
+                future.set_exception(DeadlineExceeded())
+                continue
+            self._running += 1
+            future.set_result(None)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "running": self._running,
+            "queued": len(self._queue),
+            "dropped": self.dropped,
+        }
@@ -1,8 +1,13 @@
 # Copyright AGNTCY Contributors (https://github.com/agntcy)
 # SPDX-License-Identifier: Apache-2.0
 
+import asyncio
+import functools
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from dataclasses import dataclass, field, fields
+from typing import Any
+
+GENERAL_INTENT = "general"
 
 
 class IntentClassifierBase(ABC):
@@ -10,21 +15,45 @@ class IntentClassifierBase(ABC):
     async def classify_intent(self, message: str) -> str:
         pass
 
+    async def classify_intents(self, messages: list[str]) -> list[str]:
+        """Classify a batch of messages. Override to vectorize the classification."""
+        return list(await asyncio.gather(*map(self.classify_intent, messages)))
+
 
 class AgentRegistryBase(ABC):
     @abstractmethod
     async def get_agent(self, intent: str) -> str:
         pass
 
+    async def get_agents(self, intents: list[str]) -> list[str | None]:
+        """Look up a batch of intents, returning None for unknown intents."""
+
+        async def get_or_none(intent: str) -> str | None:
+            try:
+                return await self.get_agent(intent)
+            except KeyError:
+                return None
+
+        return list(await asyncio.gather(*map(get_or_none, intents)))
+
+
+@functools.cache
+def _field_names(cls: type) -> tuple[str, ...]:
+    return tuple(f.name for f in fields(cls))
 
-@dataclass(kw_only=True)
+
+@dataclass(kw_only=True, frozen=True, slots=True)
 class BaseMessage:
     """A basic message that stores the source of the message."""
 
     source: str
 
+    def to_dict(self) -> dict[str, Any]:
+        """The fields of the message, a shallow and much faster dataclasses.asdict."""
+        return {name: getattr(self, name) for name in _field_names(type(self))}
+
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class TextMessage(BaseMessage):
     content: str
 
@@ -32,16 +61,26 @@ class TextMessage(BaseMessage):
         return len(self.content)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class UserProxyMessage(TextMessage):
     """A message that is sent from the user to the system, and needs to be routed to the appropriate agent."""
 
-    intent: str
+    PRIORITY_HIGH = 0
+    PRIORITY_NORMAL = 1
+    PRIORITY_LOW = 2
 
-    pass
+    intent: str
+    # Correlates the replies with the originating request
+    request_id: str = field(default="", kw_only=True)
+    # Ask the worker to publish the answer as WorkerAgentChunk messages too
+    stream: bool = field(default=False, kw_only=True)
+    # Lower values are routed first when the router is busy
+    priority: int = field(default=PRIORITY_NORMAL, kw_only=True)
+    # Wall-clock time after which nobody waits for the reply anymore, 0 for never
+    deadline: float = field(default=0.0, kw_only=True)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class TerminationMessage(UserProxyMessage):
     """A message that is sent from the system to the user, indicating that the conversation has ended."""
 
@@ -51,7 +90,7 @@ class TerminationMessage(UserProxyMessage):
     reason: str
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class WorkerAgentMessage(BaseMessage):
     """A message that is sent from a worker agent to the user."""
 
@@ -60,9 +99,38 @@ class WorkerAgentMessage(BaseMessage):
     agent_instance: str
     question: str
     answer: str
+    request_id: str = field(default="", kw_only=True)
+    # WorkerAgentChunk messages published before this one for the request
+    chunks: int = field(default=0, kw_only=True)
+
+
+@dataclass(frozen=True, slots=True)
+class WorkerAgentChunk(BaseMessage):
+    """A part of the answer of a worker agent, published while it is being generated."""
+
+    agent_type: str
+    index: int
+    delta: str
+    request_id: str = field(default="", kw_only=True)
+
+
+@dataclass(frozen=True, slots=True)
+class WorkerLoadReport(BaseMessage):
+    """A message periodically sent from a worker shard to the router with its queue depth."""
+
+    shard: str
+    queue_depth: int
+
+
+@dataclass(frozen=True, slots=True)
+class MetricsSnapshot(BaseMessage):
+    """The metrics of a process, periodically sent to the proxy that exports them."""
+
+    process: str
+    metrics: list[dict[str, Any]]
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class FinalResult(TextMessage):
     """A message sent from the agent to the user, indicating the end of a conversation"""
 
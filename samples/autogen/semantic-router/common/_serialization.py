@@ -0,0 +1,156 @@
+# Copyright AGNTCY Contributors (https://github.com/agntcy)
+# SPDX-License-Identifier: Apache-2.0
+
+import dataclasses
+import json
+import os
+from typing import Any, Generic, TypeVar
+
+import msgpack
+import zstandard
+from autogen_core import (
+    JSON_DATA_CONTENT_TYPE,
+    AgentRuntime,
+    try_get_known_serializers_for_type,
+)
+from common._semantic_router_components import (
+    FinalResult,
+    MetricsSnapshot,
+    TerminationMessage,
+    UserProxyMessage,
+    WorkerAgentChunk,
+    WorkerAgentMessage,
+    WorkerLoadReport,
+)
+
+T = TypeVar("T")
+
+# The first byte of a compact payload, JSON payloads start with "{"
+PACKED = b"\x01"
+PACKED_ZSTD = b"\x02"
+
+MESSAGE_TYPES = [
+    UserProxyMessage,
+    TerminationMessage,
+    WorkerAgentMessage,
+    WorkerAgentChunk,
+    WorkerLoadReport,
+    MetricsSnapshot,
+    FinalResult,
+]
+
+# The id of every message field on the wire. Ids are never changed or
+# reused: a new field gets the next free id, a removed field keeps its id
+# retired.
+FIELD_IDS = {
+    "source": 0,
+    "content": 1,
+    "intent": 2,
+    "request_id": 3,
+    "stream": 4,
+    "priority": 5,
+    "deadline": 6,
+    "reason": 7,
+    "agent_type": 8,
+    "agent_id": 9,
+    "agent_instance": 10,
+    "question": 11,
+    "answer": 12,
+    "chunks": 13,
+    "index": 14,
+    "delta": 15,
+    "shard": 16,
+    "queue_depth": 17,
+    "process": 18,
+    "metrics": 19,
+}
+
+
+class CompactMessageSerializer(Generic[T]):
+    """Serialize a message dataclass as a msgpack map from field ids to values.
+
+    The fields are keyed by their id in FIELD_IDS, and fields still at their
+    default value are left out. Processes built with different versions of
+    a message understand each other wherever a field is added: ids unknown
+    to the receiver are skipped and the fields missing from the payload keep
+    their defaults. Payloads of at least `compress_threshold` bytes are
+    compressed with zstd. JSON payloads from processes using the default
+    dataclass serializer are still accepted.
+
+    The gRPC runtime only carries JSON and protobuf payloads, so the
+    serializer registers under the JSON content type.
+
+    Args:
+        cls (type[T]): The message dataclass.
+        compress_threshold (int): Compress payloads of at least this size, 0 never compresses.
+        compress_level (int): The zstd compression level.
+    """
+
+    def __init__(
+        self, cls: type[T], compress_threshold: int = 1024, compress_level: int = 3
+    ) -> None:
+        self.cls = cls
+        self.compress_threshold = compress_threshold
+        missing = [f.name for f in dataclasses.fields(cls) if f.name not in FIELD_IDS]
+        if missing:
+            raise ValueError(f"No field id for {cls.__name__}.{', '.join(missing)}")
+        self._fields = [
+            (f.name, FIELD_IDS[f.name], f.default) for f in dataclasses.fields(cls)
+        ]
+        self._names = {FIELD_IDS[name]: name for name, _, _ in self._fields}
+        self._type_name = try_get_known_serializers_for_type(cls)[0].type_name
+        self._compressor = zstandard.ZstdCompressor(level=compress_level)
+        self._decompressor = zstandard.ZstdDecompressor()
+
+    @property
+    def data_content_type(self) -> str:
+        return JSON_DATA_CONTENT_TYPE
+
+    @property
+    def type_name(self) -> str:
+        return self._type_name
+
+    def serialize(self, message: T) -> bytes:
+        values = {}
+        for name, field_id, default in self._fields:
+            value = getattr(message, name)
+            if value is not default and value != default:
+                values[field_id] = value
+        packed = msgpack.packb(values, use_bin_type=True)
+        if self.compress_threshold and len(packed) >= self.compress_threshold:
+            return PACKED_ZSTD + self._compressor.compress(packed)
+        return PACKED + packed
+
+    def deserialize(self, payload: bytes) -> T:
+        header, body = payload[:1], payload[1:]
+        if header == PACKED:
+            values = msgpack.unpackb(body, strict_map_key=False)
+        elif header == PACKED_ZSTD:
+            values = msgpack.unpackb(
+                self._decompressor.decompress(body), strict_map_key=False
+            )
+        else:
+            return self.cls(**json.loads(payload))
+        names = self._names
+        return self.cls(
+            **{names[i]: value for i, value in values.items() if i in names}
+        )
+
+
+def add_message_serializers(
+    runtime: AgentRuntime, types: list[type] = MESSAGE_TYPES
+) -> None:
+    """Register the serializers of the message types with the runtime.
+
+    Registering an agent adds the default JSON serializers of the types it
+    handles, so call this after the agents of the process are registered.
+    MESSAGE_ENCODING=json keeps the default serializers.
+    """
+    if os.getenv("MESSAGE_ENCODING", "compact") == "json":
+        serializers: list[Any] = [
+            try_get_known_serializers_for_type(t)[0] for t in types
+        ]
+    else:
+        threshold = int(os.getenv("MESSAGE_COMPRESSION_THRESHOLD", "1024"))
+        serializers = [CompactMessageSerializer(t, threshold) for t in types]
+    runtime.add_message_serializer(serializers)
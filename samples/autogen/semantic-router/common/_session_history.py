@@ -0,0 +1,141 @@
+# Copyright AGNTCY Contributors (https://github.com/agntcy)
+# SPDX-License-Identifier: Apache-2.0
+
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable
+
+from common._cache import LRUCache
+
+ChatMessage = dict[str, str]
+
+# Folds the turns dropped from the window into the running summary
+Summarizer = Callable[[str, list[ChatMessage]], str]
+
+
+def estimate_tokens(text: str) -> int:
+    """A cheap token estimate, about four characters per token."""
+    return len(text) // 4 + 1
+
+
+def excerpt_summarizer(summary: str, dropped: list[ChatMessage]) -> str:
+    """Append the dropped turns to the summary as they are, without an LLM call.
+
+    The store clips the summary to its budget, so it keeps the most recent
+    part of the conversation that left the window.
+    """
+    lines = [summary] if summary else []
+    lines.extend(f"{message['role']}: {message['content']}" for message in dropped)
+    return "\n".join(lines)
+
+
+@dataclass
+class _Session:
+    turns: deque[tuple[ChatMessage, int]] = field(default_factory=deque)
+    tokens: int = 0
+    summary: str = ""
+
+
+class SessionHistoryStore:
+    """Conversation histories of many sessions, each bounded by a token budget.
+
+    When a session goes over its budget the oldest turns leave the window,
+    and are folded into a running summary if a summarizer is configured.
+    The summary counts against the budget, and is clipped to its most recent
+    `summary_budget` tokens.
+    Sessions idle for longer than `idle_ttl` are evicted, and so are the
+    least recently used ones beyond `max_sessions`.
+
+    Args:
+        system_prompt (str): The system message that starts every prompt.
+        token_budget (int): The maximum tokens of a session's prompt.
+        max_sessions (int): The maximum number of sessions kept in memory.
+        idle_ttl (float | None): Seconds after which an idle session is evicted.
+        summarizer (Summarizer | None): Summarizes the turns dropped from the window.
+        summary_budget (int | None): The maximum tokens of the summary, a
+            quarter of `token_budget` by default.
+        clock (Callable[[], float]): The time source, monotonic by default.
+    """
+
+    def __init__(
+        self,
+        system_prompt: str,
+        token_budget: int = 2000,
+        max_sessions: int = 1000,
+        idle_ttl: float | None = 1800.0,
+        summarizer: Summarizer | None = None,
+        summary_budget: int | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.system_prompt = system_prompt
+        self.token_budget = token_budget
+        self.summarizer = summarizer
+        self.summary_budget = (
+            summary_budget if summary_budget is not None else token_budget // 4
+        )
+        self._sessions: LRUCache[str, _Session] = LRUCache(
+            max_sessions, ttl=idle_ttl, clock=clock
+        )
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    @property
+    def stats(self):
+        return self._sessions.stats
+
+    def _session(self, session_id: str) -> _Session:
+        self._sessions.purge_expired()
+        session = self._sessions.get(session_id) or _Session()
+        # Storing it again marks the session as used and restarts its idle timer
+        self._sessions.put(session_id, session)
+        return session
+
+    def append(self, session_id: str, role: str, content: str) -> None:
+        session = self._session(session_id)
+        tokens = estimate_tokens(content)
+        session.turns.append(({"role": role, "content": content}, tokens))
+        session.tokens += tokens
+
+        budget = self.token_budget - estimate_tokens(self.system_prompt)
+        # The latest turn always stays, even when it is over budget on its own
+        while len(session.turns) > 1 and (
+            session.tokens + self._summary_tokens(session) > budget
+        ):
+            message, turn_tokens = session.turns.popleft()
+            session.tokens -= turn_tokens
+            if self.summarizer is not None:
+                session.summary = self._clip(
+                    self.summarizer(session.summary, [message])
+                )
+
+    def _clip(self, summary: str) -> str:
+        if estimate_tokens(summary) <= self.summary_budget:
+            return summary
+        # Keep the most recent part, within the estimate of the budget
+        return summary[len(summary) - 4 * (self.summary_budget - 1) :]
+
+    def _summary_tokens(self, session: _Session) -> int:
+        if not session.summary:
+            return 0
+        return estimate_tokens(self._summary_message(session.summary)["content"])
+
+    @staticmethod
+    def _summary_message(summary: str) -> ChatMessage:
+        return {
+            "role": "system",
+            "content": f"Summary of the earlier conversation: {summary}",
+        }
+
+    def messages(self, session_id: str) -> list[ChatMessage]:
+        """The prompt of the session: system prompt, summary and recent turns."""
+        session = self._session(session_id)
+        prompt = [{"role": "system", "content": self.system_prompt}]
+        if session.summary:
+            prompt.append(self._summary_message(session.summary))
+        prompt.extend(message for message, _ in session.turns)
+        return prompt
+
+    def reset(self, session_id: str) -> None:
+        self._sessions.invalidate(session_id)
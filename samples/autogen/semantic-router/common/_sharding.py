@@ -0,0 +1,123 @@
+# Copyright AGNTCY Contributors (https://github.com/agntcy)
+# SPDX-License-Identifier: Apache-2.0
+
+import bisect
+import hashlib
+import time
+from typing import Callable
+
+from common._cache import LRUCache
+
+DISPATCH_HASH = "hash"
+DISPATCH_LEAST_LOADED = "least_loaded"
+
+
+def _hash(key: str) -> int:
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "big")
+
+
+def shard_agent_type(agent_type: str, shard: int) -> str:
+    """The agent and topic type served by one shard of an agent type."""
+    return f"{agent_type}-{shard}"
+
+
+def parse_shards(spec: str) -> dict[str, int]:
+    """Parse a shard specification such as "hr=2,finance=3"."""
+    shards = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        agent_type, _, count = item.partition("=")
+        shards[agent_type.strip()] = int(count)
+    return shards
+
+
+class ConsistentHashRing:
+    """Map keys to nodes so that adding a node only moves a fraction of the keys.
+
+    Args:
+        nodes (list[str]): The nodes of the ring.
+        replicas (int): Virtual nodes per node, more spread the keys more evenly.
+    """
+
+    def __init__(self, nodes: list[str], replicas: int = 100) -> None:
+        if not nodes:
+            raise ValueError("A hash ring needs at least one node")
+        points = sorted(
+            (_hash(f"{node}#{i}"), node) for node in nodes for i in range(replicas)
+        )
+        self._hashes = [h for h, _ in points]
+        self._nodes = [node for _, node in points]
+
+    def node_for(self, key: str) -> str:
+        i = bisect.bisect(self._hashes, _hash(key)) % len(self._hashes)
+        return self._nodes[i]
+
+
+class ShardDispatcher:
+    """Pick the shard of an agent type that serves a session.
+
+    In "hash" mode sessions are spread with consistent hashing on the session
+    id. In "least_loaded" mode a new session goes to the shard with the
+    shortest queue, as reported by the workers, and then sticks to it.
+    Agent types without shards are served by their unsharded topic.
+
+    Args:
+        shards (dict[str, int]): The number of shards of each sharded agent type.
+        mode (str): Either "hash" or "least_loaded".
+        report_ttl (float): Seconds after which a load report is ignored.
+        max_sessions (int): Sessions remembered for affinity in "least_loaded" mode.
+        clock (Callable[[], float]): The time source, monotonic by default.
+    """
+
+    def __init__(
+        self,
+        shards: dict[str, int],
+        mode: str = DISPATCH_HASH,
+        report_ttl: float = 10.0,
+        max_sessions: int = 100_000,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if mode not in (DISPATCH_HASH, DISPATCH_LEAST_LOADED):
+            raise ValueError(f"Unknown dispatch mode: {mode}")
+        self.mode = mode
+        self.report_ttl = report_ttl
+        self._clock = clock
+        self._shards = {
+            agent_type: [shard_agent_type(agent_type, i) for i in range(count)]
+            for agent_type, count in shards.items()
+            if count > 0
+        }
+        self._rings = {
+            agent_type: ConsistentHashRing(topics)
+            for agent_type, topics in self._shards.items()
+        }
+        # Reported queue depth and report time of each shard
+        self._load: dict[str, tuple[int, float]] = {}
+        # Messages sent to each shard since its last report
+        self._dispatched: dict[str, int] = {}
+        self._affinity: LRUCache[str, str] = LRUCache(max_sessions)
+
+    def topic_type(self, agent_type: str, session_id: str) -> str:
+        shards = self._shards.get(agent_type)
+        if shards is None:
+            return agent_type
+        if self.mode == DISPATCH_HASH:
+            return self._rings[agent_type].node_for(session_id)
+
+        key = f"{agent_type}/{session_id}"
+        shard = self._affinity.get(key)
+        if shard is None:
+            shard = min(shards, key=self.queue_depth)
+            self._affinity.put(key, shard)
+        self._dispatched[shard] = self._dispatched.get(shard, 0) + 1
+        return shard
+
+    def queue_depth(self, shard: str) -> int:
+        """The last reported queue depth of the shard plus the messages sent to it since."""
+        depth, reported_at = self._load.get(shard, (0, float("-inf")))
+        if self._clock() - reported_at > self.report_ttl:
+            depth = 0
+        return depth + self._dispatched.get(shard, 0)
+
+    def report_load(self, shard: str, queue_depth: int) -> None:
+        self._load[shard] = (queue_depth, self._clock())
+        self._dispatched[shard] = 0
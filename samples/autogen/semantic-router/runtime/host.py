@@ -3,6 +3,7 @@
 
 import asyncio
 import logging
+import os
 
 from autogen_core import TRACE_LOGGER_NAME
 from autogen_ext.runtimes.grpc import GrpcWorkerAgentRuntimeHost
@@ -15,6 +16,6 @@ async def run_host():
 
 
 if __name__ == "__main__":
-    logging.basicConfig(level=logging.DEBUG)
+    logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO").upper())
     logger = logging.getLogger(f"{TRACE_LOGGER_NAME}.host")
     asyncio.run(run_host())
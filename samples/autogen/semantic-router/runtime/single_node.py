@@ -0,0 +1,42 @@
+# Copyright AGNTCY Contributors (https://github.com/agntcy)
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Run the proxy, the router and the worker agents in a single process.
+
+The agents share a SingleThreadedAgentRuntime instead of talking through the
+gRPC host, so messages are handed over in memory without being serialized.
+"""
+
+import asyncio
+import logging
+import os
+
+from agents.proxy import Proxy
+from agents.router import register_router
+from autogen_core import TRACE_LOGGER_NAME, SingleThreadedAgentRuntime
+from common._agents import register_worker_agents
+
+logger = logging.getLogger(f"{TRACE_LOGGER_NAME}.single_node")
+
+
+async def run_single_node():
+    runtime = SingleThreadedAgentRuntime()
+
+    proxy = Proxy()
+    await proxy.register_agents(runtime)
+    # The router records its stage latencies straight into the proxy metrics
+    await register_router(runtime, metrics=proxy.metrics)
+    await register_worker_agents(runtime, "hr", "hr_agent")
+    await register_worker_agents(runtime, "finance", "finance_agent")
+
+    runtime.start()
+    try:
+        await proxy.server.serve()
+    finally:
+        await runtime.stop()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO").upper())
+    asyncio.run(run_single_node())
@@ -0,0 +1,69 @@
+# Copyright AGNTCY Contributors (https://github.com/agntcy)
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+HTTP client shared by the tests that talk to a running proxy.
+
+All the requests of the test process go through one keep-alive connection
+pool, so that the tests measure the service rather than the connection setup.
+Set TEST_HTTP2=1 to negotiate HTTP/2 on https URLs, which needs the h2 package.
+"""
+
+import json
+import os
+import time
+
+import urllib3
+
+# Requests wait for the answer of an LLM, the proxy gives up after 30 seconds
+TIMEOUT = urllib3.Timeout(connect=2.0, read=35.0)
+
+_http: urllib3.PoolManager | None = None
+
+
+def http() -> urllib3.PoolManager:
+    """Return the connection pool of the process, creating it on first use."""
+    global _http
+    if _http is None:
+        if os.getenv("TEST_HTTP2", "0") == "1":
+            from urllib3.http2 import inject_into_urllib3
+
+            inject_into_urllib3()
+        _http = urllib3.PoolManager(
+            num_pools=4, maxsize=16, block=False, timeout=TIMEOUT
+        )
+    return _http
+
+
+def wait_for_service(url, timeout=30.0, initial_delay=0.05, max_delay=2.0):
+    """Poll the health endpoint until it answers 200, backing off exponentially.
+
+    Returns False if the service is not ready within `timeout` seconds.
+    """
+    deadline = time.monotonic() + timeout
+    delay = initial_delay
+    while True:
+        try:
+            response = http().request("GET", url, retries=False)
+            if response.status == 200:
+                return True
+        except urllib3.exceptions.HTTPError as e:
+            print(f"HTTPError: {e}")
+
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        print(f"Service not ready, retrying in {delay:.2f} seconds...")
+        time.sleep(min(delay, remaining))
+        delay = min(delay * 2, max_delay)
+
+
+def make_request(url, method="GET", payload=None, **kwargs):
+    """Send a JSON request on the shared pool."""
+    return http().request(
+        method,
+        url,
+        body=json.dumps(payload),
+        headers={"Content-Type": "application/json"},
+        **kwargs,
+    )
@@ -0,0 +1,55 @@
+# Copyright AGNTCY Contributors (https://github.com/agntcy)
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+import time
+
+from autogen_core import DefaultSubscription, DefaultTopicId, SingleThreadedAgentRuntime
+from common._agents import WorkerAgent
+from common._llm import FakeChatBackend
+from common._semantic_router_components import UserProxyMessage
+from common._session_history import SessionHistoryStore
+
+
+def ask(token_delay: float, deadline: float) -> list[dict[str, str]]:
+    history = SessionHistoryStore(system_prompt="You are an HR assistant.")
+
+    def worker() -> WorkerAgent:
+        agent = WorkerAgent("hr", history=history)
+        agent.llm = FakeChatBackend("Ten days a year.", token_delay=token_delay)
+        return agent
+
+    async def run():
+        runtime = SingleThreadedAgentRuntime()
+        await WorkerAgent.register(runtime, "hr", worker)
+        await runtime.add_subscription(
+            DefaultSubscription(topic_type="hr", agent_type="hr")
+        )
+        runtime.start()
+        await runtime.publish_message(
+            UserProxyMessage(
+                content="How many days off do I get?",
+                intent="hr_intent",
+                source="router",
+                deadline=deadline,
+            ),
+            topic_id=DefaultTopicId(type="hr", source="session-1"),
+        )
+        await runtime.stop_when_idle()
+
+    asyncio.run(run())
+    return history.messages("session-1")
+
+
+def test_answered_turns_join_the_history():
+    assert ask(token_delay=0, deadline=0) == [
+        {"role": "system", "content": "You are an HR assistant."},
+        {"role": "user", "content": "How many days off do I get?"},
+        {"role": "assistant", "content": "Ten days a year."},
+    ]
+
+
+def test_aborted_turns_leave_no_trace():
+    assert ask(token_delay=1, deadline=time.time() + 0.05) == [
+        {"role": "system", "content": "You are an HR assistant."},
+    ]
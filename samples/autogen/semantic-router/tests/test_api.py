@@ -4,60 +4,24 @@
 import json
 import time
 
-import urllib3
+from tests._http_client import make_request, wait_for_service
 
 payloads = []
 response_data_array = []
 
 
-def wait_for_service(url, retries=5, delay=2):
-    """Wait for the service to be available by polling the health endpoint."""
-    http = urllib3.PoolManager()
-
-    for attempt in range(retries):
-        try:
-            response = http.request("GET", url)
-            if response.status == 200:
-                return True
-        except urllib3.exceptions.HTTPError as e:
-            print(f"HTTPError: {e}")
-
-        print(f"Attempt {attempt + 1} failed, retrying in {delay} seconds...")
-        time.sleep(delay)
-
-    return False
-
-
-def make_request(url, method="GET", payload=None):
-    # Create a PoolManager instance to make requests
-    http = urllib3.PoolManager()
-
-    # Make a request to the API
-    response = http.request(
-        method,
-        url,
-        body=json.dumps(payload),
-        headers={"Content-Type": "application/json"},
-    )
-
-    return response
-
-
 def test_api_post_request():
     # Define the health check URL of the API
     health_url = "http://localhost:8000/healthz"
 
     # Wait for the service to be ready
-    assert wait_for_service(health_url, retries=10), (
+    assert wait_for_service(health_url, timeout=20), (
         "Service did not become ready in time."
     )
 
     # Sleep for a few seconds to ensure that the service is ready
     time.sleep(2)
 
-    # Create a PoolManager instance to make requests
-    http = urllib3.PoolManager()
-
     # Define the URL of the API endpoint for POST requests
     post_url = "http://localhost:8000/message"
 
@@ -70,12 +34,7 @@ def test_api_post_request():
     payloads.append(payload)
 
     # Make a POST request to the API
-    response = http.request(
-        "POST",
-        post_url,
-        body=json.dumps(payload),
-        headers={"Content-Type": "application/json"},
-    )
+    response = make_request(post_url, "POST", payload)
 
     # Assert that the status code is 404 (OK)
     # as there is no agent to handle the request for the given intent
@@ -89,12 +48,7 @@ def test_api_post_request():
     payloads.append(payload)
 
     # Make a POST request to the API
-    response = http.request(
-        "POST",
-        post_url,
-        body=json.dumps(payload),
-        headers={"Content-Type": "application/json"},
-    )
+    response = make_request(post_url, "POST", payload)
 
     # Assert that the status code is 200 (OK)
     assert response.status == 200, (
@@ -116,12 +70,7 @@ def test_api_post_request():
     payloads.append(payload)
 
     # Make a POST request to the API
-    response = http.request(
-        "POST",
-        post_url,
-        body=json.dumps(payload),
-        headers={"Content-Type": "application/json"},
-    )
+    response = make_request(post_url, "POST", payload)
 
     # Assert that the status code is 200 (OK)
     assert response.status == 200, (
@@ -142,3 +91,46 @@ def test_api_post_request():
 
     # Optionally, release the connection back to the pool
     response.release_conn()
+
+
+def test_api_stream_request():
+    # Wait for the service to be ready
+    assert wait_for_service("http://localhost:8000/healthz", timeout=20), (
+        "Service did not become ready in time."
+    )
+
+    # Ask for the answer as Server-Sent Events
+    payload = {
+        "message": "My name is Python",
+        "context": "ctx-stream",
+        "intent": "hr",
+        "stream": True,
+    }
+    response = make_request(
+        "http://localhost:8000/message", "POST", payload, preload_content=False
+    )
+
+    assert response.status == 200, (
+        f"Expected status code 200, but got {response.status}"
+    )
+    assert response.headers["Content-Type"].startswith("text/event-stream")
+
+    # Collect the events of the stream
+    events = []
+    for block in response.data.decode("utf-8").split("\n\n"):
+        if not block:
+            continue
+        event, data = block.split("\n", 1)
+        events.append(
+            (event.removeprefix("event: "), json.loads(data.removeprefix("data: ")))
+        )
+
+    # The answer is streamed in chunks and then returned in full
+    kinds = [event for event, _ in events]
+    assert kinds[-1] == "result", f"Stream did not end with a result: {kinds}"
+    assert "chunk" in kinds, "Stream does not contain any chunk"
+
+    chunks = "".join(data["delta"] for event, data in events if event == "chunk")
+    assert chunks == events[-1][1]["answer"], "Chunks do not add up to the answer"
+
+    response.release_conn()
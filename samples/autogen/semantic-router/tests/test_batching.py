@@ -0,0 +1,63 @@
+# Copyright AGNTCY Contributors (https://github.com/agntcy)
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+
+import pytest
+from common._batching import MicroBatcher
+
+
+def test_flushes_when_batch_is_full():
+    batches = []
+
+    async def process(items):
+        batches.append(items)
+        return [item * 2 for item in items]
+
+    async def run():
+        batcher = MicroBatcher(process, max_batch_size=3, max_delay=10)
+        return await asyncio.gather(*(batcher.submit(i) for i in range(6)))
+
+    assert asyncio.run(run()) == [0, 2, 4, 6, 8, 10]
+    assert batches == [[0, 1, 2], [3, 4, 5]]
+
+
+def test_flushes_after_window():
+    batches = []
+
+    async def process(items):
+        batches.append(items)
+        return items
+
+    async def run():
+        batcher = MicroBatcher(process, max_batch_size=100, max_delay=0.001)
+        return await asyncio.gather(batcher.submit("a"), batcher.submit("b"))
+
+    assert asyncio.run(run()) == ["a", "b"]
+    assert batches == [["a", "b"]]
+
+
+def test_propagates_errors_to_every_submitter():
+    async def process(items):
+        raise RuntimeError("boom")
+
+    async def run():
+        batcher = MicroBatcher(process, max_batch_size=2)
+        return await asyncio.gather(
+            batcher.submit(1), batcher.submit(2), return_exceptions=True
+        )
+
+    results = asyncio.run(run())
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+def test_rejects_short_results():
+    async def process(items):
+        return items[:1]
+
+    async def run():
+        batcher = MicroBatcher(process, max_batch_size=2)
+        await asyncio.gather(batcher.submit(1), batcher.submit(2))
+
+    with pytest.raises(ValueError):
+        asyncio.run(run())
@@ -0,0 +1,84 @@
+# Copyright AGNTCY Contributors (https://github.com/agntcy)
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+
+import pytest
+from common._cache import LRUCache
+from common._cached_registry import CachingAgentRegistry
+from common._semantic_router_components import AgentRegistryBase
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class CountingRegistry(AgentRegistryBase):
+    def __init__(self, agents):
+        self.agents = agents
+        self.calls = 0
+
+    async def get_agent(self, intent: str) -> str:
+        self.calls += 1
+        await asyncio.sleep(0)
+        return self.agents[intent]
+
+
+def test_lru_evicts_least_recently_used():
+    cache = LRUCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats.evictions == 1
+
+
+def test_lru_expires_entries():
+    clock = FakeClock()
+    cache = LRUCache(10, ttl=5, clock=clock)
+    cache.put("a", 1)
+    cache.put("b", 2, ttl=None)
+
+    clock.now = 6
+    assert cache.get("a", "gone") == "gone"
+    assert cache.get("b") == 2
+    assert cache.stats.expirations == 1
+
+
+def test_registry_caches_hits_and_misses():
+    inner = CountingRegistry({"hr_intent": "hr"})
+    registry = CachingAgentRegistry(inner)
+
+    async def run():
+        assert await registry.get_agent("hr_intent") == "hr"
+        assert await registry.get_agent("hr_intent") == "hr"
+        for _ in range(2):
+            with pytest.raises(KeyError):
+                await registry.get_agent("general")
+
+    asyncio.run(run())
+    assert inner.calls == 2
+    assert registry.stats()["hits"] == 1
+    assert registry.stats()["negative_hits"] == 1
+
+
+def test_registry_coalesces_concurrent_misses():
+    inner = CountingRegistry({"hr_intent": "hr"})
+    registry = CachingAgentRegistry(inner)
+
+    async def run():
+        return await asyncio.gather(
+            *(registry.get_agent("hr_intent") for _ in range(5))
+        )
+
+    assert asyncio.run(run()) == ["hr"] * 5
+    assert inner.calls == 1
+    assert registry.stats()["coalesced"] == 4
@@ -0,0 +1,104 @@
+# Copyright AGNTCY Contributors (https://github.com/agntcy)
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+
+import pytest
+from common._correlation import CorrelationTable, CorrelationTableFull
+
+
+def test_resolves_and_forgets_requests():
+    async def run():
+        table = CorrelationTable()
+        table.register("a")
+        table.register("b")
+        assert table.resolve("b", "reply b")
+        assert await table.wait("b", timeout=1) == "reply b"
+        return table
+
+    table = asyncio.run(run())
+    assert "b" not in table
+    assert table.stats()["in_flight"] == 1
+    assert table.completed == 1
+
+
+def test_timed_out_requests_are_removed():
+    async def run():
+        table = CorrelationTable()
+        table.register("a")
+        with pytest.raises(asyncio.TimeoutError):
+            await table.wait("a", timeout=0.001)
+        assert not table.resolve("a", "late reply")
+        return table
+
+    table = asyncio.run(run())
+    assert len(table) == 0
+    assert table.timed_out == 1
+    assert table.orphaned == 1
+
+
+def test_rejects_requests_over_the_limit():
+    async def run():
+        table = CorrelationTable(max_in_flight=1)
+        table.register("a")
+        with pytest.raises(CorrelationTableFull):
+            table.register("b")
+        with pytest.raises(ValueError):
+            table.register("a")
+        table.discard("a")
+        table.register("b")
+        return table
+
+    table = asyncio.run(run())
+    assert table.rejected == 1
+    assert table.peak_in_flight == 1
+
+
+def test_streams_partial_replies_until_the_final_one():
+    async def run():
+        table = CorrelationTable()
+        table.register("a", stream=True)
+        table.push("a", 0, "chunk 1")
+        table.push("a", 1, "chunk 2")
+        table.resolve("a", "final", chunks=2)
+        table.push("a", 2, "late chunk")
+        return table, [item async for item in table.stream("a", timeout=1)]
+
+    table, items = asyncio.run(run())
+    assert items == ["chunk 1", "chunk 2", "final"]
+    assert len(table) == 0
+    assert table.orphaned == 1
+
+
+def test_streams_reordered_chunks_in_order():
+    async def run():
+        table = CorrelationTable()
+        table.register("a", stream=True)
+        table.push("a", 1, "chunk 2")
+        table.push("a", 0, "chunk 1")
+        # The final reply overtakes the last chunk
+        table.resolve("a", "final", chunks=3)
+        assert not table.push("a", 1, "duplicate")
+        table.push("a", 2, "chunk 3")
+        return table, [item async for item in table.stream("a", timeout=1)]
+
+    table, items = asyncio.run(run())
+    assert items == ["chunk 1", "chunk 2", "chunk 3", "final"]
+    assert table.orphaned == 1
+    assert table.completed == 1
+
+
+def test_stream_waits_for_the_chunks_counted_by_the_final_reply():
+    async def run():
+        table = CorrelationTable()
+        table.register("a", stream=True)
+        table.resolve("a", "final", chunks=1)
+        items = []
+        with pytest.raises(asyncio.TimeoutError):
+            async for item in table.stream("a", timeout=0.01):
+                items.append(item)
+        return table, items
+
+    table, items = asyncio.run(run())
+    assert items == []
+    assert table.timed_out == 1
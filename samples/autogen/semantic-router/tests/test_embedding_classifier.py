@@ -0,0 +1,56 @@
+# Copyright AGNTCY Contributors (https://github.com/agntcy)
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+
+import numpy as np
+import pytest
+from agents.router import MOCK_ROUTING_TABLE, intent_classifier_builder
+from common._embedding_classifier import EmbeddingIntentClassifier, HashingEmbedder
+
+EXEMPLARS = {
+    "finance_intent": ["check my budget", "how much money is left", "finance report"],
+    "hr_intent": ["talk to human resources", "employee holidays", "hr policy"],
+}
+
+
+def test_hashing_embedder_is_deterministic_and_normalized():
+    embed = HashingEmbedder(dim=64)
+
+    first = embed(["check my budget", ""])
+    second = embed(["check my budget", ""])
+
+    assert first.shape == (2, 64)
+    assert np.array_equal(first, second)
+    assert np.isclose(np.linalg.norm(first[0]), 1.0)
+    assert not first[1].any()
+
+
+def test_classifies_nearest_centroid():
+    classifier = EmbeddingIntentClassifier(EXEMPLARS)
+
+    assert (
+        asyncio.run(classifier.classify_intent("what is my budget")) == "finance_intent"
+    )
+    assert asyncio.run(classifier.classify_intent("employee policy")) == "hr_intent"
+
+
+def test_falls_back_to_general_below_threshold():
+    classifier = EmbeddingIntentClassifier(EXEMPLARS, threshold=0.99)
+
+    assert asyncio.run(classifier.classify_intent("zzz qqq")) == "general"
+    assert asyncio.run(EmbeddingIntentClassifier({}).classify_intent("hr")) == "general"
+
+
+def test_router_builds_the_selected_classifier(monkeypatch):
+    monkeypatch.setenv("INTENT_CLASSIFIER", "embedding")
+    monkeypatch.setenv("INTENT_EMBEDDING_THRESHOLD", "0.2")
+    classifier = intent_classifier_builder()(MOCK_ROUTING_TABLE)
+
+    assert isinstance(classifier, EmbeddingIntentClassifier)
+    assert classifier.threshold == 0.2
+    assert asyncio.run(classifier.classify_intent("my employee badge")) == "hr_intent"
+
+    monkeypatch.setenv("INTENT_CLASSIFIER", "regex")
+    with pytest.raises(ValueError, match="Unknown INTENT_CLASSIFIER"):
+        intent_classifier_builder()
@@ -0,0 +1,67 @@
+# Copyright AGNTCY Contributors (https://github.com/agntcy)
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+
+from common._intent_memo import MemoizingIntentClassifier, normalize_message
+from common._keyword_classifier import KeywordIntentClassifier
+from common._semantic_router_components import IntentClassifierBase
+
+
+class CountingClassifier(IntentClassifierBase):
+    def __init__(self):
+        self.seen = []
+
+    async def classify_intent(self, message: str) -> str:
+        self.seen.append(message)
+        return "finance_intent" if "budget" in message.lower() else "general"
+
+
+def test_normalize_message():
+    assert normalize_message("  Check   my\tBUDGET \n") == "check my budget"
+
+
+def test_memoizes_normalized_messages():
+    inner = CountingClassifier()
+    memo = MemoizingIntentClassifier(inner, capacity=10)
+
+    async def run():
+        return [
+            await memo.classify_intent("check my budget"),
+            await memo.classify_intent("Check  my BUDGET"),
+            *(await memo.classify_intents(["check my budget", "hello"])),
+        ]
+
+    assert asyncio.run(run()) == ["finance_intent"] * 3 + ["general"]
+    assert inner.seen == ["check my budget", "hello"]
+    assert memo.stats.hits == 2
+
+
+def test_invalidate_forgets_everything():
+    inner = CountingClassifier()
+    memo = MemoizingIntentClassifier(inner, capacity=1)
+
+    async def run():
+        await memo.classify_intent("budget")
+        await memo.classify_intent("hello")
+        memo.invalidate()
+        await memo.classify_intent("hello")
+
+    asyncio.run(run())
+    assert inner.seen == ["budget", "hello", "hello"]
+    assert memo.stats.evictions == 1
+    assert len(memo) == 1
+
+
+def test_classifies_the_normalized_message():
+    memo = MemoizingIntentClassifier(
+        KeywordIntentClassifier({"hr_intent": ["human resources"]}), capacity=10
+    )
+
+    async def run():
+        return [
+            await memo.classify_intent("ask  human  resources"),
+            await memo.classify_intent("ask human resources"),
+        ]
+
+    assert asyncio.run(run()) == ["hr_intent", "hr_intent"]
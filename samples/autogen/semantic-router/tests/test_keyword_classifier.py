@@ -0,0 +1,84 @@
+# Copyright AGNTCY Contributors (https://github.com/agntcy)
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+
+import pytest
+from common import _keyword_classifier
+from common._keyword_classifier import KeywordIntentClassifier, KeywordMatcher
+
+INTENTS = {
+    "finance_intent": ["finance", "money", "budget"],
+    "hr_intent": ["hr", "human resources", "employee"],
+}
+
+
+@pytest.fixture(params=["regex", "automaton"], autouse=True)
+def matcher_mode(request, monkeypatch):
+    if request.param == "automaton":
+        monkeypatch.setattr(_keyword_classifier, "REGEX_MAX_KEYWORDS", 0)
+    return request.param
+
+
+def test_matches_first_intent_like_the_loop():
+    matcher = KeywordMatcher(INTENTS, ignore_case=False)
+
+    assert matcher.match("employee budget") == "finance_intent"
+    assert matcher.match("human resources") == "hr_intent"
+    assert matcher.match("Budget") is None
+    assert matcher.match("nothing here") is None
+
+
+def test_case_folding_and_word_boundaries():
+    matcher = KeywordMatcher(INTENTS, ignore_case=True, whole_words=True)
+
+    assert matcher.match("Talk to HR please") == "hr_intent"
+    assert matcher.match("walk through") is None
+    assert matcher.match("the_budget") is None
+    assert matcher.match("budget!") == "finance_intent"
+
+
+def test_case_sensitive_by_default():
+    matcher = KeywordMatcher({"hr_intent": ["HR"]})
+
+    assert matcher.match("Talk to HR") == "hr_intent"
+    assert matcher.match("Talk to hr") is None
+
+
+def test_explicit_priorities():
+    matcher = KeywordMatcher(INTENTS, priorities={"hr_intent": 0})
+
+    assert matcher.match("employee budget") == "hr_intent"
+
+
+def test_overlapping_keywords():
+    matcher = KeywordMatcher({"a": ["shears"], "b": ["he"], "c": ["hers"]})
+
+    assert matcher.match("ushers") == "b"
+    assert matcher.match("shears") == "a"
+
+
+def test_many_keywords_use_the_automaton():
+    intents = {
+        "a": [f"alpha{i}" for i in range(100)],
+        "b": [f"beta{i}" for i in range(100)],
+    }
+    matcher = KeywordMatcher(intents)
+
+    assert matcher._patterns is None
+    assert matcher.match("about beta42 and alpha7") == "a"
+
+
+def test_cleared_matcher_matches_nothing():
+    matcher = KeywordMatcher(INTENTS)
+    matcher.clear(chunk=3)
+
+    assert len(matcher) == 0
+    assert matcher.match("human resources budget") is None
+
+
+def test_classifier_falls_back_to_general():
+    classifier = KeywordIntentClassifier(INTENTS)
+
+    assert asyncio.run(classifier.classify_intent("hr")) == "hr_intent"
+    assert asyncio.run(classifier.classify_intent("asd")) == "general"
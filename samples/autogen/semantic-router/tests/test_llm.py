@@ -0,0 +1,137 @@
+# Copyright AGNTCY Contributors (https://github.com/agntcy)
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from common._llm import (
+    AzureChatBackend,
+    chat_backend,
+    shared_azure_client,
+    shared_llm_slots,
+)
+
+
+@pytest.fixture(autouse=True)
+def fresh_shared_state():
+    # The slots bind to the event loop of their first contended use
+    shared_azure_client.cache_clear()
+    shared_llm_slots.cache_clear()
+    yield
+    shared_azure_client.cache_clear()
+    shared_llm_slots.cache_clear()
+
+
+def chunk(content):
+    return SimpleNamespace(
+        choices=[SimpleNamespace(delta=SimpleNamespace(content=content))]
+    )
+
+
+class FakeStream:
+    def __init__(self, deltas):
+        self.deltas = deltas
+        self.closed = False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        self.closed = True
+
+    async def __aiter__(self):
+        for delta in self.deltas:
+            await asyncio.sleep(0)
+            yield chunk(delta)
+
+
+class FakeClient:
+    """Stands in for AsyncAzureOpenAI, counting the calls in flight."""
+
+    def __init__(self, deltas=("Hello", " world"), error=None):
+        self.deltas = deltas
+        self.error = error
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.streams = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    async def create(self, model, messages, stream=False):
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.001)
+            if self.error is not None:
+                raise self.error
+        finally:
+            self.in_flight -= 1
+        if stream:
+            self.streams.append(FakeStream(self.deltas))
+            return self.streams[-1]
+        return SimpleNamespace(
+            choices=[
+                SimpleNamespace(message=SimpleNamespace(content="".join(self.deltas)))
+            ]
+        )
+
+
+def test_agents_share_the_client_and_the_slots(monkeypatch):
+    monkeypatch.setenv("AZURE_OPENAI_API_KEY", "key")
+    monkeypatch.setenv("AZURE_OPENAI_API_VERSION", "2024-10-21")
+    monkeypatch.setenv("AZURE_OPENAI_ENDPOINT", "https://example.openai.azure.com")
+
+    hr, finance = chat_backend("hr"), chat_backend("finance")
+    assert isinstance(hr, AzureChatBackend)
+    assert hr.client is finance.client is shared_azure_client()
+    assert hr.slots is finance.slots is shared_llm_slots()
+
+
+def test_backends_default_to_the_shared_slots():
+    backend = AzureChatBackend(FakeClient(), deployment=None)
+    assert backend.slots is shared_llm_slots()
+
+
+def test_slots_bound_the_calls_in_flight():
+    client = FakeClient()
+    backend = AzureChatBackend(client, deployment=None, slots=asyncio.Semaphore(2))
+
+    async def run():
+        return await asyncio.gather(*(backend.complete([]) for _ in range(6)))
+
+    assert asyncio.run(run()) == ["Hello world"] * 6
+    assert client.peak_in_flight == 2
+
+
+def test_unconsumed_stream_gives_back_its_slot():
+    client = FakeClient(deltas=("a", "b", "c"))
+    slots = asyncio.Semaphore(1)
+    backend = AzureChatBackend(client, deployment=None, slots=slots)
+
+    async def run():
+        deltas = backend.stream([])
+        first = await anext(deltas)
+        # The answer is not consumed further, yet the slot comes back once
+        # the model is done
+        await asyncio.sleep(0.01)
+        assert not slots.locked()
+        assert client.streams[0].closed
+        rest = [delta async for delta in deltas]
+        return [first, *rest]
+
+    assert asyncio.run(run()) == ["a", "b", "c"]
+
+
+def test_stream_raises_the_error_of_the_call():
+    slots = asyncio.Semaphore(1)
+    backend = AzureChatBackend(
+        FakeClient(error=RuntimeError("unavailable")), deployment=None, slots=slots
+    )
+
+    async def run():
+        with pytest.raises(RuntimeError, match="unavailable"):
+            async for _ in backend.stream([]):
+                pass
+        assert not slots.locked()
+
+    asyncio.run(run())
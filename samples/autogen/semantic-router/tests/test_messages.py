@@ -0,0 +1,26 @@
+# Copyright AGNTCY Contributors (https://github.com/agntcy)
+# SPDX-License-Identifier: Apache-2.0
+
+from dataclasses import FrozenInstanceError, asdict
+
+import pytest
+from common._semantic_router_components import TerminationMessage, WorkerAgentChunk
+
+
+def test_to_dict_matches_asdict():
+    message = TerminationMessage(
+        reason=TerminationMessage.REASON_NO_AGENT_FOUND,
+        content="hello",
+        intent="weather",
+        source="router",
+        request_id="1",
+    )
+    assert message.to_dict() == asdict(message)
+    assert list(message.to_dict()) == list(asdict(message))
+
+
+def test_messages_are_slotted_and_frozen():
+    chunk = WorkerAgentChunk(agent_type="hr", index=0, delta="Hi", source="hr")
+    assert not hasattr(chunk, "__dict__")
+    with pytest.raises(FrozenInstanceError):
+        chunk.delta = "Bye"
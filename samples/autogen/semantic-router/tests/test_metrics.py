@@ -0,0 +1,104 @@
+# Copyright AGNTCY Contributors (https://github.com/agntcy)
+# SPDX-License-Identifier: Apache-2.0
+
+import random
+
+import numpy as np
+import pytest
+from common._metrics import Histogram, MetricsRegistry
+
+
+def test_percentiles_within_precision():
+    rng = random.Random(1)
+    values = [rng.expovariate(100) for _ in range(20_000)]
+    histogram = Histogram()
+    for value in values:
+        histogram.record(value)
+
+    assert histogram.count == len(values)
+    assert histogram.sum == pytest.approx(sum(values))
+    assert histogram.max == max(values)
+    for q in (50, 90, 99, 99.9):
+        assert histogram.percentile(q) == pytest.approx(
+            np.percentile(values, q), rel=0.02
+        )
+
+
+def test_cumulative_counts_and_large_values():
+    histogram = Histogram(highest=1.0)
+    for value in (0.0005, 0.002, 0.002, 0.5, 10.0):
+        histogram.record(value)
+
+    # Values above the highest trackable value are counted as the highest
+    assert histogram.cumulative_counts((0.001, 0.01, 0.9, 2.0)) == [1, 3, 4, 5]
+    assert histogram.max == 10.0
+
+
+def test_render_labels_remote_snapshots_by_process():
+    router = MetricsRegistry()
+    router.histogram("stage_seconds", "Stage latency.", stage="find").record(0.002)
+    proxy = MetricsRegistry()
+    proxy.histogram("stage_seconds", "Stage latency.", stage="find").record(0.02)
+    proxy.gauges("requests", "Requests.", lambda: {"in_flight": 3})
+
+    proxy.merge("router-1", router.snapshot())
+    proxy.merge("router-2", router.snapshot())
+    # A newer snapshot of the same process replaces the previous one
+    proxy.merge("router-1", router.snapshot())
+    text = proxy.render()
+
+    assert text.count("# TYPE stage_seconds histogram") == 1
+    assert text.count("# HELP stage_seconds Stage latency.") == 1
+    assert 'stage_seconds_bucket{le="0.005",stage="find"} 0' in text
+    assert 'stage_seconds_count{stage="find"} 1' in text
+    for process in ("router-1", "router-2"):
+        assert (
+            f'stage_seconds_bucket{{le="0.005",process="{process}",stage="find"}} 1'
+            in text
+        )
+        assert f'stage_seconds_count{{process="{process}",stage="find"}} 1' in text
+    assert "requests_in_flight 3" in text
+
+
+def test_counters_carry_the_total_suffix():
+    registry = MetricsRegistry()
+    registry.counters("requests", "Requests.", lambda: {"completed": 7})
+    text = registry.render()
+
+    assert "# TYPE requests_completed_total counter" in text
+    assert "requests_completed_total 7" in text
+
+
+def test_stale_remote_snapshots_are_dropped():
+    now = [0.0]
+    router = MetricsRegistry()
+    router.histogram("stage_seconds", "Stage latency.", stage="find").record(0.002)
+    proxy = MetricsRegistry(remote_ttl=30, clock=lambda: now[0])
+
+    proxy.merge("router-1", router.snapshot())
+    now[0] = 20.0
+    proxy.merge("router-2", router.snapshot())
+    assert 'process="router-1"' in proxy.render()
+
+    # router-1 stopped pushing its histograms, its series go away
+    now[0] = 40.0
+    text = proxy.render()
+    assert 'process="router-1"' not in text
+    assert 'stage_seconds_count{process="router-2",stage="find"} 1' in text
+
+
+def test_remote_counters_and_gauges_are_labelled_by_process():
+    router = MetricsRegistry()
+    router.counters("cache", "Lookups.", lambda: {"hits": 5})
+    router.gauges("cache", "Cached.", lambda: {"size": 2})
+    proxy = MetricsRegistry()
+    proxy.counters("cache", "Lookups.", lambda: {"hits": 1})
+
+    proxy.merge("router-1", router.snapshot())
+    text = proxy.render()
+
+    assert text.count("# TYPE cache_hits_total counter") == 1
+    assert "\ncache_hits_total 1\n" in text
+    assert 'cache_hits_total{process="router-1"} 5' in text
+    assert "# TYPE cache_size gauge" in text
+    assert 'cache_size{process="router-1"} 2' in text
@@ -0,0 +1,55 @@
+# Copyright AGNTCY Contributors (https://github.com/agntcy)
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+import contextlib
+import json
+
+from agents.proxy import Proxy
+
+
+class PublishingRuntime:
+    def __init__(self):
+        self.published = []
+
+    async def publish_message(self, message, topic_id):
+        self.published.append(message)
+
+
+def test_stream_of_a_client_gone_before_the_first_read_is_forgotten():
+    proxy = Proxy()
+    proxy.agent_runtime = PublishingRuntime()
+    body = json.dumps(
+        {"intent": "hr", "message": "hi", "context": "ctx", "stream": True}
+    ).encode()
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0", "spec_version": "2.4"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": "/message",
+        "raw_path": b"/message",
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"content-type", b"application/json")],
+        "client": ("127.0.0.1", 1234),
+        "server": ("127.0.0.1", 8000),
+    }
+    received = [{"type": "http.request", "body": body, "more_body": False}]
+
+    async def receive():
+        return received.pop(0) if received else {"type": "http.disconnect"}
+
+    async def send(message):
+        # The client is gone when the response starts
+        raise OSError("connection reset")
+
+    async def run():
+        # The server reports the disconnection
+        with contextlib.suppress(Exception):
+            await proxy.app(scope, receive, send)
+
+    asyncio.run(run())
+    assert len(proxy.agent_runtime.published) == 1
+    assert len(proxy.requests) == 0
@@ -0,0 +1,145 @@
+# Copyright AGNTCY Contributors (https://github.com/agntcy)
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+import gc
+import json
+
+import pytest
+from common._keyword_classifier import KeywordIntentClassifier
+from common._routing_table import (
+    ReloadableAgentRegistry,
+    ReloadableIntentClassifier,
+    RoutingTableWatcher,
+    load_routing_table,
+    parse_routing_table,
+)
+
+
+def write_table(path, intents):
+    path.write_text(json.dumps({"intents": intents}))
+
+
+def test_parse_routing_table():
+    table = parse_routing_table(
+        {
+            "intents": {
+                "hr_intent": {"agent": "hr", "keywords": ["hr"], "priority": 0},
+                "finance_intent": {"agent": "finance", "keywords": ["money"]},
+            }
+        }
+    )
+    assert table.intents == {"hr_intent": ["hr"], "finance_intent": ["money"]}
+    assert table.priorities == {"hr_intent": 0}
+    assert table.agents == {"hr_intent": "hr", "finance_intent": "finance"}
+
+    with pytest.raises(ValueError):
+        parse_routing_table({"intents": {"hr_intent": {"keywords": ["hr"]}}})
+    with pytest.raises(ValueError):
+        parse_routing_table(
+            {"intents": {"hr_intent": {"agent": "hr", "keywords": "hr"}}}
+        )
+
+
+def test_load_yaml(tmp_path):
+    path = tmp_path / "table.yaml"
+    path.write_text(
+        "intents:\n  hr_intent:\n    agent: hr\n    keywords: [hr, employee]\n"
+    )
+    assert load_routing_table(path).intents == {"hr_intent": ["hr", "employee"]}
+
+
+def test_watcher_applies_changes_and_keeps_table_on_errors(tmp_path):
+    path = tmp_path / "table.json"
+    write_table(path, {"hr_intent": {"agent": "hr", "keywords": ["hr"]}})
+    reloaded = []
+    watcher = RoutingTableWatcher(path, lambda table, _: reloaded.append(table))
+
+    assert not watcher.check()
+
+    write_table(path, {"hr_intent": {"agent": "people", "keywords": ["hr", "staff"]}})
+    assert watcher.check()
+    assert reloaded[-1].agents == {"hr_intent": "people"}
+
+    path.write_text("{not json")
+    assert not watcher.check()
+    assert (watcher.reloads, watcher.failures, len(reloaded)) == (1, 1, 1)
+
+
+def test_watcher_builds_with_the_collector_paused(tmp_path):
+    path = tmp_path / "table.json"
+    write_table(path, {"hr_intent": {"agent": "hr", "keywords": ["hr"]}})
+    collecting = []
+
+    def build(table):
+        collecting.append(gc.isenabled())
+        if table.agents["hr_intent"] == "broken":
+            raise ValueError("broken")
+        return KeywordIntentClassifier(table.intents)
+
+    watcher = RoutingTableWatcher(path, lambda *_: None, build=build)
+    for agent in ("people", "broken"):
+        write_table(path, {"hr_intent": {"agent": agent, "keywords": ["hr"]}})
+        watcher.check()
+        assert gc.isenabled()
+
+    gc.disable()
+    try:
+        write_table(path, {"hr_intent": {"agent": "staff", "keywords": ["hr"]}})
+        watcher.check()
+        assert not gc.isenabled()
+    finally:
+        gc.enable()
+    assert collecting == [False, False, False]
+
+
+def test_swap_on_the_event_loop(tmp_path):
+    path = tmp_path / "table.json"
+    write_table(path, {"hr_intent": {"agent": "hr", "keywords": ["hr"]}})
+    table = load_routing_table(path)
+
+    async def main():
+        classifier = ReloadableIntentClassifier(KeywordIntentClassifier(table.intents))
+        registry = ReloadableAgentRegistry(table.agents)
+        swapped = asyncio.Event()
+
+        def install(new_table, new_classifier):
+            classifier.swap(new_classifier)
+            registry.swap(new_table.agents)
+            swapped.set()
+
+        watcher = RoutingTableWatcher(path, install, interval=0.01)
+        watcher.start()
+        try:
+            assert await classifier.classify_intent("ask finance") == "general"
+            write_table(
+                path, {"finance_intent": {"agent": "finance", "keywords": ["finance"]}}
+            )
+            await asyncio.wait_for(swapped.wait(), timeout=5)
+        finally:
+            watcher.stop()
+
+        intent = await classifier.classify_intent("ask finance")
+        return intent, await registry.get_agents([intent, "hr_intent"])
+
+    assert asyncio.run(main()) == ("finance_intent", ["finance", None])
+
+
+def test_watcher_releases_replaced_classifier(tmp_path):
+    path = tmp_path / "table.json"
+    write_table(path, {"hr_intent": {"agent": "hr", "keywords": ["hr"]}})
+    classifier = ReloadableIntentClassifier(KeywordIntentClassifier({"a": ["x"]}))
+    watcher = RoutingTableWatcher(path, lambda _, new: classifier.swap(new))
+
+    kept = classifier.classifier
+    write_table(path, {"hr_intent": {"agent": "hr", "keywords": ["staff"]}})
+    assert watcher.check()
+    replaced = classifier.classifier.matcher
+    write_table(path, {"hr_intent": {"agent": "hr", "keywords": ["people"]}})
+    assert watcher.check()
+    watcher._release_retired()
+
+    # Emptied once nothing refers to it, left intact while still referenced
+    assert len(replaced) == 0
+    assert len(kept.matcher) == 1
+    assert asyncio.run(classifier.classify_intent("people")) == "hr_intent"
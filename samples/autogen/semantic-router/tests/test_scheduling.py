@@ -0,0 +1,102 @@
+# Copyright AGNTCY Contributors (https://github.com/agntcy)
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+
+import pytest
+from common._scheduling import DeadlineExceeded, PriorityScheduler
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_queued_work_runs_by_priority_then_deadline():
+    async def main():
+        scheduler = PriorityScheduler(max_concurrency=1, clock=FakeClock())
+        order = []
+        release = asyncio.Event()
+
+        async def work(name, priority, deadline=0.0):
+            async with scheduler.slot(priority, deadline):
+                order.append(name)
+                if name == "first":
+                    await release.wait()
+
+        tasks = [asyncio.create_task(work("first", 1))]
+        await asyncio.sleep(0)
+        tasks += [
+            asyncio.create_task(work("low", 2)),
+            asyncio.create_task(work("normal-late", 1, 300.0)),
+            asyncio.create_task(work("normal-soon", 1, 200.0)),
+            asyncio.create_task(work("high", 0)),
+        ]
+        await asyncio.sleep(0)
+        assert len(scheduler) == 4
+        release.set()
+        await asyncio.gather(*tasks)
+        return order
+
+    assert asyncio.run(main()) == ["first", "high", "normal-soon", "normal-late", "low"]
+
+
+def test_expired_work_is_dropped():
+    async def main():
+        clock = FakeClock()
+        scheduler = PriorityScheduler(max_concurrency=1, clock=clock)
+        release = asyncio.Event()
+
+        async def hold():
+            async with scheduler.slot(0):
+                await release.wait()
+
+        async def queued():
+            async with scheduler.slot(1, deadline=110.0):
+                pass
+
+        holder = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(queued())
+        await asyncio.sleep(0)
+        clock.now = 120.0
+        release.set()
+        await holder
+        with pytest.raises(DeadlineExceeded):
+            await waiter
+
+        # Already expired when it arrives
+        with pytest.raises(DeadlineExceeded):
+            async with scheduler.slot(1, deadline=110.0):
+                pass
+        return scheduler.stats()
+
+    assert asyncio.run(main()) == {"running": 0, "queued": 0, "dropped": 2}
+
+
+def test_cancelled_waiter_frees_its_place():
+    async def main():
+        scheduler = PriorityScheduler(max_concurrency=1, clock=FakeClock())
+        release = asyncio.Event()
+
+        async def hold():
+            async with scheduler.slot(0):
+                await release.wait()
+
+        holder = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        release.set()
+        await holder
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+        async with scheduler.slot(1):
+            return scheduler.stats()["running"]
+
+    assert asyncio.run(main()) == 1
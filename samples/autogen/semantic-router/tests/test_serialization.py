@@ -0,0 +1,108 @@
+# Copyright AGNTCY Contributors (https://github.com/agntcy)
+# SPDX-License-Identifier: Apache-2.0
+
+import msgpack
+import pytest
+from autogen_core import try_get_known_serializers_for_type
+from common._semantic_router_components import (
+    TerminationMessage,
+    UserProxyMessage,
+    WorkerAgentMessage,
+)
+from common._serialization import (
+    FIELD_IDS,
+    MESSAGE_TYPES,
+    PACKED,
+    PACKED_ZSTD,
+    CompactMessageSerializer,
+)
+
+
+def worker_message(answer: str) -> WorkerAgentMessage:
+    return WorkerAgentMessage(
+        agent_type="hr",
+        agent_id="ctx",
+        agent_instance="0x1",
+        question="How many vacation days do I have?",
+        answer=answer,
+        source="hr",
+        request_id="42",
+    )
+
+
+def test_round_trip_and_registration_key():
+    serializer = CompactMessageSerializer(UserProxyMessage)
+    json_serializer = try_get_known_serializers_for_type(UserProxyMessage)[0]
+    message = UserProxyMessage(
+        content="hello", intent="hr", source="user", request_id="1", stream=True
+    )
+
+    payload = serializer.serialize(message)
+    assert payload[:1] == PACKED
+    assert len(payload) < len(json_serializer.serialize(message))
+    assert serializer.deserialize(payload) == message
+    assert serializer.type_name == json_serializer.type_name
+    assert serializer.data_content_type == json_serializer.data_content_type
+
+
+@pytest.mark.parametrize("threshold, header", [(64, PACKED_ZSTD), (0, PACKED)])
+def test_compression_threshold(threshold, header):
+    serializer = CompactMessageSerializer(
+        WorkerAgentMessage, compress_threshold=threshold
+    )
+    message = worker_message("Ask your manager. " * 50)
+
+    payload = serializer.serialize(message)
+    assert payload[:1] == header
+    assert serializer.deserialize(payload) == message
+
+
+def test_accepts_json_payloads():
+    serializer = CompactMessageSerializer(TerminationMessage)
+    message = TerminationMessage(
+        reason="done", content="END", intent="hr", source="hr", request_id="7"
+    )
+    payload = try_get_known_serializers_for_type(TerminationMessage)[0].serialize(
+        message
+    )
+
+    assert serializer.deserialize(payload) == message
+
+
+def test_unknown_field_ids_are_skipped():
+    serializer = CompactMessageSerializer(UserProxyMessage)
+    # A newer sender knows a field this process does not, an older one does
+    # not know the priority and deadline fields
+    newer = PACKED + msgpack.packb(
+        {
+            FIELD_IDS["source"]: "user",
+            FIELD_IDS["content"]: "hi",
+            FIELD_IDS["intent"]: "hr",
+            1000: "acme",
+            FIELD_IDS["priority"]: UserProxyMessage.PRIORITY_HIGH,
+        }
+    )
+    older = PACKED + msgpack.packb(
+        {
+            FIELD_IDS["source"]: "user",
+            FIELD_IDS["content"]: "hi",
+            FIELD_IDS["intent"]: "hr",
+            FIELD_IDS["request_id"]: "3",
+        }
+    )
+
+    assert serializer.deserialize(newer) == UserProxyMessage(
+        content="hi",
+        intent="hr",
+        source="user",
+        priority=UserProxyMessage.PRIORITY_HIGH,
+    )
+    assert serializer.deserialize(older) == UserProxyMessage(
+        content="hi", intent="hr", source="user", request_id="3"
+    )
+
+
+def test_every_message_field_has_a_unique_id():
+    assert len(set(FIELD_IDS.values())) == len(FIELD_IDS)
+    for message_type in MESSAGE_TYPES:
+        CompactMessageSerializer(message_type)
@@ -0,0 +1,87 @@
+# Copyright AGNTCY Contributors (https://github.com/agntcy)
+# SPDX-License-Identifier: Apache-2.0
+
+from common._session_history import (
+    SessionHistoryStore,
+    estimate_tokens,
+    excerpt_summarizer,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def contents(messages):
+    return [message["content"] for message in messages]
+
+
+def test_sessions_are_kept_apart():
+    store = SessionHistoryStore("system")
+    store.append("a", "user", "hello from a")
+    store.append("b", "user", "hello from b")
+
+    assert contents(store.messages("a")) == ["system", "hello from a"]
+    assert contents(store.messages("b")) == ["system", "hello from b"]
+
+    store.reset("a")
+    assert contents(store.messages("a")) == ["system"]
+
+
+def test_window_stays_within_token_budget():
+    store = SessionHistoryStore("sys", token_budget=12)
+    for i in range(10):
+        store.append("a", "user", f"message {i:02}")
+
+    # Each message is about 3 tokens, the system prompt 1
+    assert contents(store.messages("a")) == [
+        "sys",
+        "message 07",
+        "message 08",
+        "message 09",
+    ]
+
+
+def test_dropped_turns_are_summarized():
+    def summarize(summary, dropped):
+        return (summary + " " + " ".join(m["content"][-1] for m in dropped)).strip()
+
+    store = SessionHistoryStore("sys", token_budget=40, summarizer=summarize)
+    for i in range(8):
+        store.append("a", "user", f"this is message number {i}")
+
+    messages = contents(store.messages("a"))
+    assert messages[1].endswith(": 0 1 2 3 4")
+    assert messages[2:] == [f"this is message number {i}" for i in (5, 6, 7)]
+
+
+def test_summary_counts_against_the_budget():
+    store = SessionHistoryStore(
+        "sys", token_budget=100, summarizer=excerpt_summarizer, summary_budget=30
+    )
+    for i in range(200):
+        store.append("a", "user", f"this is message number {i}")
+
+    messages = store.messages("a")
+    summary = messages[1]["content"]
+    assert summary.endswith("user: this is message number 191")
+    assert estimate_tokens(summary) <= 40
+    assert sum(estimate_tokens(m["content"]) for m in messages) <= 100
+
+
+def test_idle_and_least_recently_used_sessions_are_evicted():
+    clock = FakeClock()
+    store = SessionHistoryStore("sys", max_sessions=2, idle_ttl=10, clock=clock)
+    store.append("a", "user", "a")
+    clock.now = 5
+    store.append("b", "user", "b")
+    clock.now = 12
+    store.append("c", "user", "c")
+
+    assert len(store) == 2
+    assert contents(store.messages("a")) == ["sys"]
+    assert store.stats.expirations == 1
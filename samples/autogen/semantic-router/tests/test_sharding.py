@@ -0,0 +1,80 @@
+# Copyright AGNTCY Contributors (https://github.com/agntcy)
+# SPDX-License-Identifier: Apache-2.0
+
+import pytest
+from common._sharding import (
+    DISPATCH_LEAST_LOADED,
+    ConsistentHashRing,
+    ShardDispatcher,
+    parse_shards,
+    shard_agent_type,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_parse_shards():
+    assert parse_shards("hr=2, finance=3,") == {"hr": 2, "finance": 3}
+    assert parse_shards("") == {}
+
+
+def test_ring_spreads_keys_and_moves_few_on_resize():
+    keys = [f"session-{i}" for i in range(2000)]
+    ring = ConsistentHashRing(["a", "b", "c"])
+    before = {key: ring.node_for(key) for key in keys}
+
+    counts = {node: list(before.values()).count(node) for node in "abc"}
+    assert all(400 < count < 900 for count in counts.values())
+
+    grown = ConsistentHashRing(["a", "b", "c", "d"])
+    moved = [key for key in keys if grown.node_for(key) != before[key]]
+    # Only keys taken over by the new node move
+    assert all(grown.node_for(key) == "d" for key in moved)
+    assert len(moved) < len(keys) / 2
+
+
+def test_ring_needs_nodes():
+    with pytest.raises(ValueError):
+        ConsistentHashRing([])
+
+
+def test_hash_dispatch_is_sticky_and_leaves_unsharded_types():
+    dispatcher = ShardDispatcher({"hr": 4})
+    topic = dispatcher.topic_type("hr", "session-1")
+    assert topic in [shard_agent_type("hr", i) for i in range(4)]
+    assert dispatcher.topic_type("hr", "session-1") == topic
+    assert dispatcher.topic_type("finance", "session-1") == "finance"
+
+
+def test_least_loaded_dispatch():
+    clock = FakeClock()
+    dispatcher = ShardDispatcher(
+        {"hr": 2}, mode=DISPATCH_LEAST_LOADED, report_ttl=5, clock=clock
+    )
+    dispatcher.report_load("hr-0", 10)
+    dispatcher.report_load("hr-1", 1)
+
+    assert dispatcher.topic_type("hr", "a") == "hr-1"
+    # New sessions count towards the load until the next report
+    assert dispatcher.topic_type("hr", "b") == "hr-1"
+    assert dispatcher.queue_depth("hr-1") == 3
+
+    # Sessions stick to their shard
+    dispatcher.report_load("hr-1", 20)
+    assert dispatcher.topic_type("hr", "a") == "hr-1"
+    assert dispatcher.topic_type("hr", "c") == "hr-0"
+
+    # Stale reports are ignored
+    clock.now = 10
+    assert dispatcher.queue_depth("hr-1") == 1
+
+
+def test_unknown_dispatch_mode():
+    with pytest.raises(ValueError):
+        ShardDispatcher({"hr": 2}, mode="random")